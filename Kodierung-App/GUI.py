@@ -1,34 +1,22 @@
 import tkinter as tk
 from tkinter import ttk
 import tkinter.messagebox as mbox
-import json
-import os
 import re
-from decode import parse_input_hex
-from encode import encode_main, encode_sils_full
+from decode import to_bytes, token_wert, decode_main, split_frames, strip_prefix, format_bytes
+from encode import (encode_segmente, encode_sils_full_segmente, encode_telegramm_bytes, encode_sils_feld,
+                    SILS_OHNE_BEI_STOERUNG)
+from livedecode import LiveDecoder
+from codec_cache import cached_encode_main, cached_encode_sils_full, cached_decode_main
+import mapping_registry
+from mapping_registry import get_mapping, get_compiled
 import logging
+import queue
+import threading
 import traceback
 from datetime import datetime
 
-class DebugLogger:
-    def __init__(self):
-        self.logger = logging.getLogger('debug_logger')
-        self.logger.setLevel(logging.DEBUG)
-        handler = logging.FileHandler('debug.log')
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        if not self.logger.hasHandlers():
-            self.logger.addHandler(handler)
-
-debug_logger = DebugLogger().logger
-
-script_dir = os.path.dirname(os.path.abspath(__file__))
-mapping_path = os.path.join(script_dir, "mapping.json")
-with open(mapping_path, "r", encoding="utf-8") as f:
-    alle_elemente = json.load(f)
-
-from encode import encode_main
-from decode import decode_main
+# Handler kommen erst nach dem ersten Zeichnen dazu (siehe lade_mapping)
+debug_logger = logging.getLogger("kodierung")
 
 class ToolTip:
     def __init__(self, widget, text, delay=520):
@@ -60,6 +48,266 @@ class ToolTip:
             self.tipwindow.destroy()
             self.tipwindow = None
 
+DECODE_ANSICHTEN = ["Einzeln", "Je Zeile", "Header-getrennt"]
+# Oberkante der Telegramm-Eingabemasken im Encode-Tab
+FORM_Y = 185
+VORSCHAU_MS = 150  # Pause nach der letzten Eingabe, bevor die Live-Vorschau kodiert
+LIVE_DECODE_MS = 250  # dito für die Live-Dekodierung
+
+def iter_text_bloecke(text, groesse=65536):
+    # (Ende, Block) mit Blöcken von etwa groesse Zeichen, nur an Leerraum getrennt,
+    # damit kein Hex-Token zerschnitten wird
+    start = 0
+    while start < len(text):
+        ende = start + groesse
+        if ende < len(text):
+            trenner = max(text.rfind(" ", start, ende), text.rfind("\n", start, ende))
+            if trenner > start:
+                ende = trenner
+            else:
+                # Kein Leerraum im Block: bis zum nächsten weiterlesen
+                weiter = [i for i in (text.find(" ", ende), text.find("\n", ende)) if i >= 0]
+                ende = min(weiter) if weiter else len(text)
+        yield min(ende, len(text)), text[start:ende]
+        start = ende
+
+def block_zu_bytes(block, ungueltig):
+    # Wie to_bytes, aber ungültige Token werden wie früher übersprungen statt abzubrechen;
+    # sie landen als Text in ungueltig, damit die Ausgabe sie melden kann
+    try:
+        return to_bytes(block)
+    except ValueError:
+        pass
+    daten = bytearray()
+    for token in block.split():
+        try:
+            daten.append(token_wert(token))
+        except ValueError:
+            ungueltig.append(token)
+    return bytes(daten)
+
+def ungueltig_zeile(ungueltig, anzeigen=20):
+    # Hinweiszeile für übersprungene Token, bei sehr vielen nur die ersten
+    liste = ", ".join(ungueltig[:anzeigen])
+    if len(ungueltig) > anzeigen:
+        liste += ", ..."
+    return f"Ungültige Token übersprungen ({len(ungueltig)}): {liste}"
+
+class BackgroundTask:
+    """
+    Führt work(task) in einem Hintergrund-Thread aus, damit die Tk-Hauptschleife frei bleibt.
+    Der Worker meldet Teilergebnisse mit task.emit(...) und Fortschritt mit task.progress(...);
+    die Callbacks laufen per after() wieder im Tk-Thread.
+    """
+    def __init__(self, widget, work, on_items=None, on_done=None, on_error=None, on_progress=None,
+                 poll_ms=40, max_items_per_poll=500):
+        self.widget = widget
+        self.work = work
+        self.on_items = on_items
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.poll_ms = poll_ms
+        self.max_items_per_poll = max_items_per_poll
+        self.cancel_event = threading.Event()
+        self.running = False
+        self._queue = queue.Queue()
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+        self.widget.after(self.poll_ms, self._poll)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    # --- Aufrufe aus dem Worker-Thread ---
+    def emit(self, item):
+        self._queue.put(("item", item))
+
+    def progress(self, done, total):
+        self._queue.put(("progress", (done, total)))
+
+    def _run(self):
+        try:
+            ergebnis = self.work(self)
+        except Exception as e:
+            self._queue.put(("error", (e, traceback.format_exc())))
+        else:
+            self._queue.put(("done", ergebnis))
+
+    # --- im Tk-Thread ---
+    def _poll(self):
+        items = []
+        fortschritt = None
+        ende = None
+        try:
+            while len(items) < self.max_items_per_poll:
+                art, wert = self._queue.get_nowait()
+                if art == "item":
+                    items.append(wert)
+                elif art == "progress":
+                    fortschritt = wert
+                else:
+                    ende = (art, wert)
+                    break
+        except queue.Empty:
+            pass
+        if items and self.on_items:
+            self.on_items(items)
+        if fortschritt and self.on_progress:
+            self.on_progress(*fortschritt)
+        if ende is None:
+            self.widget.after(self.poll_ms, self._poll)
+            return
+        self.running = False
+        art, wert = ende
+        if art == "done" and self.on_done:
+            self.on_done(wert)
+        elif art == "error" and self.on_error:
+            self.on_error(*wert)
+
+class VirtualTable(ttk.Frame):
+    """
+    Tabelle für sehr viele Zeilen: der Treeview hat nur so viele Einträge wie sichtbar sind,
+    beim Scrollen werden nur deren Werte aus self.rows neu gesetzt.
+    """
+    def __init__(self, master, columns, widths, height=8):
+        super().__init__(master)
+        self.columns = columns
+        self.height = height
+        self.rows = []
+        self.offset = 0
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=height, selectmode="browse")
+        for col, width in zip(columns, widths):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, stretch=(col == columns[-1]))
+        for i in range(height):
+            self.tree.insert("", "end", iid=str(i), values=("",) * len(columns))
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scroll)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_to(self.offset - e.delta // 120 * 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 3))
+        self.refresh()
+
+    def clear(self):
+        self.rows = []
+        self.offset = 0
+        self.refresh()
+
+    def append_rows(self, rows):
+        self.rows.extend(rows)
+        self.refresh()
+
+    def set_rows(self, rows):
+        # Alle Zeilen ersetzen und die Scrollposition möglichst halten
+        self.rows = rows
+        self.offset = max(0, min(self.offset, len(rows) - self.height))
+        self.refresh()
+
+    def selected_index(self):
+        auswahl = self.tree.selection()
+        if not auswahl:
+            return None
+        index = self.offset + int(auswahl[0])
+        return index if index < len(self.rows) else None
+
+    def on_scroll(self, aktion, wert, einheit=None):
+        if aktion == "moveto":
+            self.scroll_to(int(float(wert) * len(self.rows)))
+        else:
+            schritt = int(wert) * (self.height if einheit == "pages" else 1)
+            self.scroll_to(self.offset + schritt)
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.rows) - self.height))
+        if offset != self.offset:
+            self.offset = offset
+            self.tree.selection_set(())
+            self.refresh()
+        return "break"
+
+    def refresh(self):
+        leer = ("",) * len(self.columns)
+        for i in range(self.height):
+            index = self.offset + i
+            self.tree.item(str(i), values=self.rows[index] if index < len(self.rows) else leer)
+        if self.rows:
+            self.scrollbar.set(self.offset / len(self.rows), min(1.0, (self.offset + self.height) / len(self.rows)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+class EncodeVorschau:
+    """
+    Ergebnis der Live-Vorschau als Segmente [name, bytes] (Header, je Telegramm bzw.
+    SILS-Feld). ersetzen() schreibt nur den Zeichenbereich des geänderten Segments
+    neu, statt das ganze Text-Widget zu füllen.
+    """
+    def __init__(self, text):
+        self.text = text
+        self.segmente = []
+        self.hex_format = "NNH"
+        self.prefix = ""
+        self.laenge = None  # erwartete Zeichenzahl im Widget, None = ungültig
+
+    def verwerfen(self):
+        self.segmente = []
+        self.laenge = None
+
+    def enthaelt(self, name):
+        return any(segment[0] == name for segment in self.segmente)
+
+    def setzen(self, segmente, hex_format, prefix=""):
+        self.segmente = [[name, bytes(daten)] for name, daten in segmente]
+        self.hex_format = hex_format
+        self.prefix = prefix
+        inhalt = prefix + " ".join(format_bytes(b"".join(daten for _, daten in self.segmente), hex_format))
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", inhalt)
+        self.laenge = len(inhalt)
+
+    def ersetzen(self, name, neu):
+        # False, wenn das Widget nicht mehr zum Stand passt (dann neu setzen)
+        if self.laenge is None or self.text.index("end-1c") != f"1.{self.laenge}":
+            return False
+        start = 0
+        for segment in self.segmente:
+            if segment[0] == name:
+                break
+            start += len(segment[1])
+        else:
+            return False
+        alt, neu = segment[1], bytes(neu)
+        if alt == neu:
+            return True
+        gesamt = sum(len(daten) for _, daten in self.segmente)
+        breite = len(format_bytes(b"\x00", self.hex_format)[0]) + 1  # Token + Leerzeichen
+        tokens = format_bytes(neu, self.hex_format)
+        von = len(self.prefix) + start * breite
+        if start + len(alt) < gesamt:
+            # Danach folgen noch Bytes: Tokens jeweils mit folgendem Leerzeichen
+            bis = von + len(alt) * breite
+            einfuegen = "".join(t + " " for t in tokens)
+        elif start > 0:
+            # Letztes Segment: Leerzeichen davor statt danach
+            von -= 1
+            bis = self.laenge
+            einfuegen = "".join(" " + t for t in tokens)
+        else:
+            bis = self.laenge
+            einfuegen = " ".join(tokens)
+        self.text.delete(f"1.0 + {von} chars", f"1.0 + {bis} chars")
+        self.text.insert(f"1.0 + {von} chars", einfuegen)
+        self.laenge += len(einfuegen) - (bis - von)
+        segment[1] = neu
+        return True
+
 class EncodeDecodeGUI(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -77,8 +325,51 @@ class EncodeDecodeGUI(tk.Tk):
             "scrollbar": None,
             "scrollable_frame": None,
         }
+        self.encode_task = None
+        self.decode_task = None
+        self.encode_forms = {}
+        self.encode_forms_generation = None
+        self.aktive_form = None
+        self.mapping_task = None
+        self.mapping_bereit = False
+        self.vorschau_job = None
+        self.vorschau_offen = set()
+        self.vorschau_voll = False
+        self.live_decoder = None
+        self.live_decoder_generation = None
+        self.live_decode_job = None
+        self.live_decode_task = None
+        self.live_decode_offen = False
         self.create_widgets()
         self.add_keyboard_shortcuts()
+        # Fenster zuerst zeichnen, Mapping und Logging danach im Hintergrund laden
+        self.after_idle(self.lade_mapping)
+
+    def lade_mapping(self):
+        def work(task):
+            from logsetup import setup_logging
+            setup_logging()
+            mapping_registry.preload()
+        self.mapping_task = BackgroundTask(self, work, on_done=self.mapping_geladen, on_error=self.mapping_fehler)
+        self.mapping_task.start()
+
+    def mapping_geladen(self, _=None):
+        elemente = list(get_mapping().keys())
+        self.element_dropdown["values"] = elemente
+        self.decode_element_dropdown["values"] = elemente
+        if self.element_var.get() not in elemente:
+            self.element_var.set(elemente[0])
+        if self.decode_element_var.get() not in elemente:
+            self.decode_element_var.set(elemente[0])
+        self.mapping_bereit = True
+        self.encode_button.config(state="normal")
+        self.decode_button.config(state="normal")
+        self.show_telegramme_for_element()
+        self.update_ls_ui()
+
+    def mapping_fehler(self, e, tb):
+        debug_logger.error("Mapping konnte nicht geladen werden: %s", e, extra={"traceback_text": tb})
+        mbox.showerror("Mapping", f"mapping.json konnte nicht geladen werden:\n{type(e).__name__}: {e}")
 
     def create_widgets(self):
         tabs = ttk.Notebook(self)
@@ -109,13 +400,19 @@ class EncodeDecodeGUI(tk.Tk):
             values=["NNH", "0xNN"], state="readonly", width=8)
         self.hex_format_dropdown.place(x=630, y=10)
         ToolTip(self.hex_format_dropdown, "Wähle das gewünschte Hex-Ausgabeformat (z.B. 01H oder 0x01)")
+        self.live_vorschau_var = tk.BooleanVar(value=False)
+        self.live_vorschau_check = ttk.Checkbutton(
+            self.encode_tab, text="Live-Vorschau", variable=self.live_vorschau_var,
+            command=self.toggle_live_vorschau)
+        self.live_vorschau_check.place(x=565, y=35)
+        ToolTip(self.live_vorschau_check, "Kodiert während der Eingabe; neu geschrieben wird nur das geänderte Telegramm")
 
         vertical_shift += 36
         ttk.Label(self.encode_tab, text="Element:").place(x=10, y=vertical_shift)
-        self.element_var = tk.StringVar(value=list(alle_elemente.keys())[0])
+        self.element_var = tk.StringVar()
         self.element_dropdown = ttk.Combobox(
             self.encode_tab, textvariable=self.element_var,
-            values=list(alle_elemente.keys()), state="readonly", width=12
+            values=[], state="readonly", width=12
         )
         self.element_dropdown.place(x=75, y=vertical_shift)
         self.element_dropdown.bind("<<ComboboxSelected>>", self.show_telegramme_for_element)
@@ -170,7 +467,8 @@ class EncodeDecodeGUI(tk.Tk):
         self.full_sils_check.place(x=320, y=35) 
 
         ttk.Label(self.encode_tab, text="Leuchtmittel Z.B.(N91)").place(x=490, y=60)
-        self.sils_name_entry = ttk.Entry(self.encode_tab, width=6)
+        self.sils_name_var = tk.StringVar()
+        self.sils_name_entry = ttk.Entry(self.encode_tab, width=6, textvariable=self.sils_name_var)
         self.sils_name_entry.place(x=450, y=60)
         self.sils_name_entry.config(state="disabled")
         self.stoerung_var = tk.BooleanVar(value=False)
@@ -196,16 +494,21 @@ class EncodeDecodeGUI(tk.Tk):
         self.encode_result_label.place(x=250, y=430)
         self.encode_result = tk.Text(self.encode_tab, height=3)
         self.encode_result.place(x=120, y=450, width=550, height=100)
+        self.vorschau = EncodeVorschau(self.encode_result)
         self.copy_result_button = ttk.Button(self.encode_tab, text="Ergebnis kopieren", command=self.copy_encode_result)
         self.copy_result_button.place(x=10, y=493)
-        self.encode_button = ttk.Button(self.encode_tab, text="Encode", command=self.kodieren)
+        self.encode_button = ttk.Button(self.encode_tab, text="Encode", command=self.kodieren, state="disabled")
         self.encode_button.place(x=20, y=465)
         self.telegrammwidgets = []
         self.entry_fields = {}
         self.paramlines = {}
         self.sils_widgets = []
-        self.show_telegramme_for_element()
         self.update_ls_ui()
+        # Optionen, die das ganze Ergebnis verändern: Live-Vorschau komplett neu
+        for var in (self.hex_format_var, self.header_var, self.pea_modus_var, self.io_prefix_var, self.ls_prefix_var,
+                    self.only_param_var, self.full_sils_var, self.stoerung_var, self.ls_sender_var, self.sils_name_var):
+            var.trace_add("write", lambda *_: self.vorschau_geaendert())
+        self.stoerung_dropdown.bind("<<ComboboxSelected>>", lambda e: self.vorschau_geaendert())
 
     def toggle_full_sils_entry(self):
         if self.full_sils_var.get():
@@ -249,24 +552,20 @@ class EncodeDecodeGUI(tk.Tk):
         self.rb_geschw.config(state="normal")
         self.rb_richt.config(state="normal")
 
-    def destroy_sils_ui(self):
+    def hide_sils_ui(self):
+        # Die SILS-Maske bleibt erhalten (samt Eingaben) und wird nur ausgeblendet
         if self.sils_extra["container"]:
-            self.sils_extra["container"].destroy()
-        for w in getattr(self, "sils_widgets", []):
-            try:
-                w.destroy()
-            except Exception:
-                pass
-        self.sils_widgets = []
-        self.sils_entries = {}
-        self.sils_extra = {"container": None, "canvas": None, "scrollbar": None, "scrollable_frame": None}
+            self.sils_extra["container"].place_forget()
+
+    def show_sils_ui(self):
+        if self.sils_extra["container"] is None:
+            self.create_sils_ui()
+        self.sils_extra["container"].place(x=15, y=120, width=960, height=300)
 
     def create_sils_ui(self):
         LABEL_WIDTH = 20  # Das ist die Breite, die alle ComboBox-Labels haben!
         COMBO_PADX = 10   # Das Padding der Combobox!
-        self.destroy_sils_ui()
         container = ttk.Frame(self.encode_tab)
-        container.place(x=15, y=120, width=960, height=300)
         canvas = tk.Canvas(container)
         scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
@@ -282,7 +581,7 @@ class EncodeDecodeGUI(tk.Tk):
             "scrollable_frame": scrollable_frame,
         }
         self.sils_entries = {}
-        sils_fields = alle_elemente["SILS"]["byteorder"]
+        sils_fields = get_mapping()["SILS"]["byteorder"]
         for idx, field in enumerate(sils_fields):
             frame = ttk.Frame(scrollable_frame)
             frame.grid(row=idx, column=0, sticky="w", pady=5, padx=10)
@@ -326,10 +625,17 @@ class EncodeDecodeGUI(tk.Tk):
                 lbl.pack(side="left")
                 cb = ttk.Combobox(frame, state="readonly", width=20)
                 cb.pack(side="left", padx=COMBO_PADX)
-                cb["values"] = list(alle_elemente["SILS"]["Meldung"]["telegramme"][field].keys())
+                cb["values"] = list(get_mapping()["SILS"]["Meldung"]["telegramme"][field].keys())
                 cb.set(list(cb["values"])[0])
                 entry = None
-            self.sils_entries[field] = {"combobox": cb, "entry": entry}
+            var = None
+            if entry is not None:
+                var = tk.StringVar()
+                entry.configure(textvariable=var)
+                var.trace_add("write", lambda *_, f=field: self.vorschau_geaendert(f))
+            if cb is not None:
+                cb.bind("<<ComboboxSelected>>", lambda e, f=field: self.vorschau_geaendert(f), add="+")
+            self.sils_entries[field] = {"combobox": cb, "entry": entry, "var": var}
         self.sils_widgets.append(container)
 
     def validate_char_input(self, new_val):
@@ -353,18 +659,40 @@ class EncodeDecodeGUI(tk.Tk):
             entry.delete(0, tk.END)
 
     def clear_encode_gui(self):
-        for widget in self.telegrammwidgets:
-            try:
-                widget.destroy()
-            except Exception:
-                pass
+        # Aktives Formular nur ausblenden; Widgets und Eingaben bleiben für den nächsten Wechsel
+        if self.aktive_form:
+            self.aktive_form["frame"].place_forget()
+            self.aktive_form = None
         self.telegrammwidgets = []
         self.entry_fields = {}
         self.paramlines = {}
         self.hide_pea_modus()
-        self.destroy_sils_ui()
+        self.hide_sils_ui()
+
+    def check_encode_forms(self):
+        # Formulare werden je (Element, Typ) einmal gebaut; nach Neuladen des Mappings neu
+        if self.encode_forms_generation != mapping_registry.generation():
+            for form in self.encode_forms.values():
+                form["frame"].destroy()
+            self.encode_forms = {}
+            if self.sils_extra["container"]:
+                self.sils_extra["container"].destroy()
+                self.sils_extra = {"container": None, "canvas": None, "scrollbar": None, "scrollable_frame": None}
+                self.sils_entries = {}
+                self.sils_widgets = []
+            self.encode_forms_generation = mapping_registry.generation()
+
+    def get_encode_form(self, element, typ):
+        self.check_encode_forms()
+        form = self.encode_forms.get((element, typ))
+        if form is None:
+            form = self.build_encode_form(element, typ)
+            self.encode_forms[(element, typ)] = form
+        return form
 
     def show_telegramme_for_element(self, event=None):
+        if not self.mapping_bereit:
+            return
         self.clear_encode_gui()
         element = self.element_var.get()
 
@@ -384,7 +712,9 @@ class EncodeDecodeGUI(tk.Tk):
             self.typ_var.set("Meldung")
             for widget in [self.typ_dropdown, self.header_dropdown, self.only_param_check, self.io_prefix_check]:
                 widget.config(state="disabled")
-            self.create_sils_ui()
+            self.check_encode_forms()
+            self.show_sils_ui()
+            self.vorschau_geaendert()
             return
 
         # ----------- ALLE ANDEREN ELEMENTE --------------------- #
@@ -407,7 +737,7 @@ class EncodeDecodeGUI(tk.Tk):
             widget.config(state="normal")
 
         typ = self.typ_var.get()
-        header_keys = list(alle_elemente[element]["header"].keys())
+        header_keys = list(get_mapping()[element]["header"].keys())
         self.header_dropdown["values"] = header_keys
         self.header_var.set(header_keys[0])
 
@@ -416,52 +746,79 @@ class EncodeDecodeGUI(tk.Tk):
         else:
             self.hide_pea_modus()
 
-        tgrams = alle_elemente[element].get(typ, {}).get("telegramme", {})
-        curr_y = 185
+        form = self.get_encode_form(element, typ)
+        form["frame"].place(x=0, y=FORM_Y, width=750, height=form["hoehe"])
+        self.aktive_form = form
+        self.telegrammwidgets = form["widgets"]
+        self.entry_fields = form["entry_fields"]
+        self.paramlines = form["paramlines"]
+        if self.typ_var.get() == "Kommando":
+            self.only_param_var.set(True)
+            self.only_param_check["state"] = "disabled"
+        else:
+            self.only_param_check["state"] = "normal"
+            self.only_param_var.set(False)
+        self.vorschau_geaendert()
+
+    def build_encode_form(self, element, typ):
+        # Eingabemaske für ein Element/Typ in einem eigenen Frame (Koordinaten relativ zu FORM_Y)
+        frame = ttk.Frame(self.encode_tab)
+        widgets = []
+        entry_fields = {}
+        paramlines = {}
+        variablen = []  # Tk-Variablen der Eingaben, lösen die Live-Vorschau des Telegramms aus
+        tgrams = get_mapping()[element].get(typ, {}).get("telegramme", {})
+        curr_y = 0
         label_font = ("Arial", 10, "underline")
-        l = ttk.Label(self.encode_tab, text="Einzel-Eingabe je Telegramm", font=label_font)
+        l = ttk.Label(frame, text="Einzel-Eingabe je Telegramm", font=label_font)
         l.place(x=15, y=curr_y)
-        self.telegrammwidgets.append(l)
+        widgets.append(l)
         curr_y += 34
         paramlabel_font = ("Arial", 10, "bold")
         for tg_name, param_dict in tgrams.items():
-            tg_label = ttk.Label(self.encode_tab, text=f"{tg_name}:", font=paramlabel_font)
+            tg_label = ttk.Label(frame, text=f"{tg_name}:", font=paramlabel_font)
             tg_label.place(x=15, y=curr_y)
-            self.telegrammwidgets.append(tg_label)
+            widgets.append(tg_label)
             x = 65
             entry_width = 3 if typ == "Meldung" else 6
             for param in param_dict.keys():
-                param_label = ttk.Label(self.encode_tab, text=f"{param}:", font=("Arial", 9))
+                param_label = ttk.Label(frame, text=f"{param}:", font=("Arial", 9))
                 param_label.place(x=x, y=curr_y+1)
-                entry = ttk.Entry(self.encode_tab, width=entry_width)
+                var = tk.StringVar()
+                var.trace_add("write", lambda *_, tg=tg_name: self.vorschau_geaendert(tg))
+                variablen.append(var)
+                entry = ttk.Entry(frame, width=entry_width, textvariable=var)
                 entry.place(x=x+28, y=curr_y)
-                self.entry_fields[(tg_name, param)] = entry
-                self.telegrammwidgets.extend([param_label, entry])
+                entry_fields[(tg_name, param)] = entry
+                widgets.extend([param_label, entry])
                 x += 70 if typ == "Kommando" else 48
             curr_y += 25
         curr_y += 14
         hinweis = "Als Zeile eingeben (z.B. " + ("X0=0A X1=0B ...)" if typ == "Meldung" else "W0=0A W1=0B ...)")
-        l2 = ttk.Label(self.encode_tab, text=hinweis, font=label_font)
+        l2 = ttk.Label(frame, text=hinweis, font=label_font)
         l2.place(x=15, y=curr_y)
-        self.telegrammwidgets.append(l2)
+        widgets.append(l2)
         curr_y += 34
         for tg_name in tgrams.keys():
-            zeilen_label = ttk.Label(self.encode_tab, text=f"{tg_name}:", font=paramlabel_font)
+            zeilen_label = ttk.Label(frame, text=f"{tg_name}:", font=paramlabel_font)
             zeilen_label.place(x=15, y=curr_y)
-            zeilen_entry = tk.Entry(self.encode_tab, width=74)
+            var = tk.StringVar()
+            var.trace_add("write", lambda *_, tg=tg_name: self.vorschau_geaendert(tg))
+            variablen.append(var)
+            zeilen_entry = tk.Entry(frame, width=74, textvariable=var)
             zeilen_entry.place(x=65, y=curr_y)
-            self.paramlines[tg_name] = zeilen_entry
-            self.telegrammwidgets.extend([zeilen_label, zeilen_entry])
+            paramlines[tg_name] = zeilen_entry
+            widgets.extend([zeilen_label, zeilen_entry])
             curr_y += 28
-        if self.typ_var.get() == "Kommando":
-            self.only_param_var.set(True)
-            self.only_param_check["state"] = "disabled"
-        else:
-            self.only_param_check["state"] = "normal"
-            self.only_param_var.set(False)
+        return {"frame": frame, "hoehe": curr_y, "widgets": widgets,
+                "entry_fields": entry_fields, "paramlines": paramlines, "variablen": variablen}
 
     def kodieren(self):
+        if not self.mapping_bereit or (self.encode_task and self.encode_task.running):
+            return
         hex_format = self.hex_format_var.get()
+        element = typ = pea_modus = None
+        param_inputdict = {}
         try:
             element = self.element_var.get()
             typ = self.typ_var.get()
@@ -469,100 +826,201 @@ class EncodeDecodeGUI(tk.Tk):
             param_inputdict = {}
             hex_format = self.hex_format_var.get()
             if element == "SILS":
-                param_inputdict = {}
-                for field, widgets in self.sils_entries.items():
-                    cb = widgets.get("combobox")
-                    entry = widgets.get("entry")
-                    cb_val = cb.get() if cb else ""
-                    entry_val = entry.get().strip() if entry else ""
-                    if field in ["ZS2", "ZS2V"]:
-                        if cb_val == "Kennbuchstabe" and entry_val:
-                            param_inputdict[field] = f"Kennbuchstabe {entry_val.upper()}"
-                        else:
-                            param_inputdict[field] = "Aus"
-                    elif field == "Fahrweginformation":
-                        if cb_val == "Fahrweginformation" and entry_val:
-                            param_inputdict[field] = f"Fahrweginformation {entry_val}"
-                        else:
-                            param_inputdict[field] = cb_val
-                    elif field in ["ZS3", "ZS3V"]:
-                        # Endgültige Gültigkeitsprüfung erst HIER:
-                        if entry_val and entry_val.isdigit():
-                            val10 = int(entry_val)
-                            if 10 <= val10 <= 150 and val10 % 10 == 0:
-                                param_inputdict[field] = entry_val
-                            else:
-                                param_inputdict[field] = "Aus"
-                        else:
-                            param_inputdict[field] = "Aus"
-                    else:
-                        param_inputdict[field] = cb_val if cb_val else "Aus"
-                for field in ["ZS2", "ZS2V", "Fahrweginformation"]:
-                    if field in param_inputdict and "Kennbuchstabe" in str(param_inputdict[field]):
-                        char = str(param_inputdict[field])[-1]
-                        if not char.isalpha():
-                            raise ValueError(f"Ungültiger Buchstabe in {field}: {char}")
-                    elif field in param_inputdict and "Fahrweginformation" in str(param_inputdict[field]):
-                        num = int(str(param_inputdict[field]).split()[-1])
-                        if not (1 <= num <= 253):
-                            raise ValueError(f"Ungültige Fahrweg-Nummer: {num}")
+                param_inputdict = self.sils_eingaben()
                 if self.full_sils_var.get():
                     # Name holen und andere Parameter vorbereiten
                     name_input = self.sils_name_entry.get().strip()
-                    is_stoerung = False
-                    stoerung_art = None
-                    if self.stoerung_var.get():
-                        is_stoerung = True
-                        stoerung_art = "05" if self.stoerung_dropdown.get() == "Störung" else "06"
-                    ls_sender_byte = self.ls_sender_var.get()[:2] # z.B. "01"
-                    from encode import encode_sils_full
-                    bitleiste = encode_sils_full(
+                    optionen = self.sils_full_optionen()
+                    kodierung = lambda: cached_encode_sils_full(
                         param_inputdict,
                         name_input,
-                        is_stoerung=is_stoerung,
-                        stoerung_art=stoerung_art,
-                        sender_byte=ls_sender_byte,
-                        hex_format=hex_format
+                        hex_format=hex_format,
+                        **optionen
                     )
                 else:
-                    bitleiste = encode_main(element, typ, pea_modus, param_inputdict, hex_format=hex_format)
+                    kodierung = lambda: cached_encode_main(element, typ, pea_modus, param_inputdict, hex_format=hex_format)
             else:
                 only_param = self.only_param_var.get() or typ == "Kommando"
-                tgrams = alle_elemente[element].get(typ, {}).get("telegramme", {})
                 header_key = self.header_var.get()
-                for tg_name, param_dict in tgrams.items():
-                    paramline = self.paramlines.get(tg_name, tk.StringVar()).get().strip()
-                    if paramline:
-                        param_inputdict[tg_name] = paramline
-                    else:
-                        field_dict = {}
-                        for param in param_dict.keys():
-                            v = self.entry_fields[(tg_name, param)].get().strip().upper()
-                            if v:
-                                field_dict[param] = v
-                        if field_dict:
-                            param_inputdict[tg_name] = field_dict
-                bitleiste = encode_main(element, typ, pea_modus, param_inputdict, only_param=only_param, header_key=header_key, hex_format=hex_format)
-            text_result = " ".join(bitleiste)
-            if self.io_prefix_var.get() and element != "SILS":
+                param_inputdict = self.telegramm_eingaben(element, typ)
+                kodierung = lambda: cached_encode_main(element, typ, pea_modus, param_inputdict, only_param=only_param, header_key=header_key, hex_format=hex_format)
+        except Exception as e:
+            self.encode_fehler(e, traceback.format_exc(), element, typ, pea_modus, param_inputdict)
+            return
+
+        # Prefixe jetzt lesen, die eigentliche Kodierung läuft im Hintergrund
+        io_prefix = self.io_prefix_var.get() and element != "SILS"
+        ls_prefix = self.ls_prefix_var.get()
+
+        def work(task):
+            text_result = " ".join(kodierung())
+            if io_prefix:
                 text_result = "$IO: " + text_result
-            if self.ls_prefix_var.get():
+            if ls_prefix:
                 text_result = "$LS: " + text_result
+            return text_result
+
+        def fertig(text_result):
+            self.encode_button.config(state="normal")
+            self.vorschau.verwerfen()
             self.encode_result.delete(1.0, tk.END)
             self.encode_result.insert(tk.END, text_result)
+
+        def fehler(e, tb):
+            self.encode_button.config(state="normal")
+            self.encode_fehler(e, tb, element, typ, pea_modus, param_inputdict)
+
+        self.encode_button.config(state="disabled")
+        self.encode_task = BackgroundTask(self, work, on_done=fertig, on_error=fehler)
+        self.encode_task.start()
+
+    # --- Eingaben einsammeln (Kodieren und Live-Vorschau) ---
+    def sils_feld_eingabe(self, field):
+        widgets = self.sils_entries[field]
+        cb = widgets.get("combobox")
+        entry = widgets.get("entry")
+        cb_val = cb.get() if cb else ""
+        entry_val = entry.get().strip() if entry else ""
+        if field in ["ZS2", "ZS2V"]:
+            if cb_val == "Kennbuchstabe" and entry_val:
+                wert = f"Kennbuchstabe {entry_val.upper()}"
+                if not wert[-1].isalpha():
+                    raise ValueError(f"Ungültiger Buchstabe in {field}: {wert[-1]}")
+                return wert
+            return "Aus"
+        if field == "Fahrweginformation":
+            wert = f"Fahrweginformation {entry_val}" if cb_val == "Fahrweginformation" and entry_val else cb_val
+            if "Fahrweginformation" in wert:
+                num = int(wert.split()[-1])
+                if not (1 <= num <= 253):
+                    raise ValueError(f"Ungültige Fahrweg-Nummer: {num}")
+            return wert
+        if field in ["ZS3", "ZS3V"]:
+            # Endgültige Gültigkeitsprüfung erst HIER:
+            if entry_val and entry_val.isdigit():
+                val10 = int(entry_val)
+                if 10 <= val10 <= 150 and val10 % 10 == 0:
+                    return entry_val
+            return "Aus"
+        return cb_val if cb_val else "Aus"
+
+    def sils_eingaben(self):
+        return {field: self.sils_feld_eingabe(field) for field in self.sils_entries}
+
+    def sils_full_optionen(self):
+        is_stoerung = self.stoerung_var.get()
+        stoerung_art = None
+        if is_stoerung:
+            stoerung_art = "05" if self.stoerung_dropdown.get() == "Störung" else "06"
+        return {"is_stoerung": is_stoerung, "stoerung_art": stoerung_art,
+                "sender_byte": self.ls_sender_var.get()[:2]}  # z.B. "01"
+
+    def telegramm_eingabe(self, tg_name, params):
+        # Eingabezeile hat Vorrang vor den Einzelfeldern; None = nichts eingegeben
+        paramline = self.paramlines.get(tg_name, tk.StringVar()).get().strip()
+        if paramline:
+            return paramline
+        field_dict = {}
+        for param in params:
+            v = self.entry_fields[(tg_name, param)].get().strip().upper()
+            if v:
+                field_dict[param] = v
+        return field_dict or None
+
+    def telegramm_eingaben(self, element, typ):
+        param_inputdict = {}
+        for tg_name, param_dict in get_mapping()[element].get(typ, {}).get("telegramme", {}).items():
+            eingabe = self.telegramm_eingabe(tg_name, param_dict.keys())
+            if eingabe:
+                param_inputdict[tg_name] = eingabe
+        return param_inputdict
+
+    # --- Live-Vorschau ---
+    def toggle_live_vorschau(self):
+        if self.live_vorschau_var.get():
+            self.vorschau_geaendert()
+        else:
+            if self.vorschau_job:
+                self.after_cancel(self.vorschau_job)
+                self.vorschau_job = None
+            self.vorschau_offen = set()
+            self.vorschau.verwerfen()
+            self.encode_result_label.config(text="Kodierungsergebnis")
+
+    def vorschau_geaendert(self, segment=None):
+        # Merkt das geänderte Telegramm bzw. SILS-Feld (None = alles) und kodiert erst nach einer Pause
+        if not self.mapping_bereit or not self.live_vorschau_var.get():
+            return
+        if segment is None:
+            self.vorschau_voll = True
+        else:
+            self.vorschau_offen.add(segment)
+        if self.vorschau_job:
+            self.after_cancel(self.vorschau_job)
+        self.vorschau_job = self.after(VORSCHAU_MS, self.vorschau_aktualisieren)
+
+    def vorschau_aktualisieren(self):
+        self.vorschau_job = None
+        offen, self.vorschau_offen = self.vorschau_offen, set()
+        try:
+            if not self.vorschau_voll:
+                for segment in offen:
+                    if not self.vorschau.enthaelt(segment) or \
+                            not self.vorschau.ersetzen(segment, self.vorschau_segment(segment)):
+                        self.vorschau_voll = True
+                        break
+            if self.vorschau_voll:
+                self.vorschau.setzen(self.vorschau_segmente(), self.hex_format_var.get(), self.vorschau_prefix())
+                self.vorschau_voll = False
+            self.encode_result_label.config(text="Kodierungsergebnis (Live)")
         except Exception as e:
-            error_info = {
-                "element": element,
-                "type": typ,
-                "mode": pea_modus,
-                "params": param_inputdict,
-                "traceback": traceback.format_exc(),
-                "timestamp": datetime.now().isoformat(),
-                "error_type": type(e).__name__,
-                "error_message": str(e)
-            }
-            debug_logger.error("Critical error occurred: %s", str(e), exc_info=True)
-            self.show_error_details(error_info)
+            # Kein Fehlerdialog je Tastendruck, nur ein Hinweis; die nächste Änderung kodiert alles neu
+            self.vorschau_voll = True
+            self.encode_result_label.config(text=f"Kodierungsergebnis (Live): {type(e).__name__}: {e}")
+
+    def vorschau_prefix(self):
+        prefix = "$LS: " if self.ls_prefix_var.get() else ""
+        if self.io_prefix_var.get() and self.element_var.get() != "SILS":
+            prefix += "$IO: "
+        return prefix
+
+    def vorschau_segmente(self):
+        element = self.element_var.get()
+        typ = self.typ_var.get()
+        if element == "SILS":
+            if self.full_sils_var.get():
+                return encode_sils_full_segmente(self.sils_eingaben(), self.sils_name_entry.get().strip(),
+                                                 **self.sils_full_optionen())
+            return encode_segmente(element, typ, self.pea_modus_var.get(), self.sils_eingaben())
+        return encode_segmente(element, typ, self.pea_modus_var.get(), self.telegramm_eingaben(element, typ),
+                               only_param=self.only_param_var.get() or typ == "Kommando",
+                               header_key=self.header_var.get())
+
+    def vorschau_segment(self, segment):
+        # Nur ein Telegramm bzw. SILS-Feld neu kodieren
+        element = self.element_var.get()
+        if element == "SILS":
+            if self.full_sils_var.get() and self.stoerung_var.get() and segment in SILS_OHNE_BEI_STOERUNG:
+                return encode_sils_feld(segment, "Aus")
+            return encode_sils_feld(segment, self.sils_feld_eingabe(segment))
+        tgram_mapping = get_compiled("encode_index")["telegramme"][(element, self.typ_var.get())][segment]
+        eingabe = self.telegramm_eingabe(segment, tgram_mapping.keys())
+        return encode_telegramm_bytes(tgram_mapping, eingabe) if eingabe else b""
+
+    def encode_fehler(self, e, tb, element, typ, pea_modus, param_inputdict):
+        error_info = {
+            "element": element,
+            "type": typ,
+            "mode": pea_modus,
+            "params": param_inputdict,
+            "traceback": tb,
+            "timestamp": datetime.now().isoformat(),
+            "error_type": type(e).__name__,
+            "error_message": str(e)
+        }
+        debug_logger.error("Critical error occurred: %s", str(e), exc_info=(type(e), e, e.__traceback__),
+                           extra={"fehler_info": {k: v for k, v in error_info.items() if k != "traceback"}})
+        self.show_error_details(error_info)
 
     def copy_encode_result(self):
         result = self.encode_result.get(1.0, tk.END).strip()
@@ -587,16 +1045,20 @@ class EncodeDecodeGUI(tk.Tk):
             values=["Meldung", "Kommando"], state="disabled", width=11)
         self.decode_typ_dropdown.place(x=225, y=18)
         ttk.Label(self.decode_tab, text="Element:").place(x=345, y=18)
-        self.decode_element_var = tk.StringVar(value=list(alle_elemente.keys())[0])
+        self.decode_element_var = tk.StringVar()
         self.decode_element_dropdown = ttk.Combobox(
             self.decode_tab, textvariable=self.decode_element_var,
-            values=list(alle_elemente.keys()), state="disabled", width=15
+            values=[], state="disabled", width=15
         )
         self.decode_element_dropdown.place(x=400, y=18)
         self.input_text = tk.Text(self.decode_tab, width=250, height=3)
         self.input_text.place(x=10, y=45, width=600, height=56)
-        self.decode_button = ttk.Button(self.decode_tab, text="Dekodieren", command=self.do_decode)
+        self.decode_button = ttk.Button(self.decode_tab, text="Dekodieren", command=self.do_decode, state="disabled")
         self.decode_button.place(x=10, y=110)
+        self.decode_progress = ttk.Progressbar(self.decode_tab, mode="determinate", maximum=1)
+        self.decode_progress.place(x=110, y=113, width=300)
+        self.decode_cancel_button = ttk.Button(self.decode_tab, text="Abbrechen", command=self.cancel_decode, state="disabled")
+        self.decode_cancel_button.place(x=420, y=110)
         ttk.Label(self.decode_tab, text="Dekodierungsergebnis:").place(x=10, y=150)
         self.result_text = tk.Text(self.decode_tab, width=90, height=5)
         self.result_text.place(x=10, y=175, width=650, height=165)
@@ -604,6 +1066,29 @@ class EncodeDecodeGUI(tk.Tk):
         self.copy_decode_result_button.place(x=10, y=345)
         self.update_decode_mode_widgets()
 
+        # Mehrere Telegramme: je Zeile oder anhand der Header im Bytestrom getrennt
+        self.decode_ansicht_var = tk.StringVar(value=DECODE_ANSICHTEN[0])
+        self.decode_ansicht_dropdown = ttk.Combobox(
+            self.decode_tab, textvariable=self.decode_ansicht_var,
+            values=DECODE_ANSICHTEN, state="readonly", width=15)
+        self.decode_ansicht_dropdown.place(x=520, y=112)
+        self.decode_ansicht_dropdown.bind("<<ComboboxSelected>>", lambda e: self.update_decode_ansicht())
+        ToolTip(self.decode_ansicht_dropdown, "Einzeln = ganze Eingabe ist ein Telegramm; "
+                                              "Je Zeile / Header-getrennt = viele Telegramme als Tabelle")
+        self.live_decode_var = tk.BooleanVar(value=False)
+        self.live_decode_check = ttk.Checkbutton(
+            self.decode_tab, text="Live", variable=self.live_decode_var, command=self.toggle_live_decode)
+        self.live_decode_check.place(x=655, y=112)
+        ToolTip(self.live_decode_check, "Dekodiert beim Tippen/Einfügen; neu dekodiert werden nur geänderte Telegramme")
+        self.input_text.bind("<<Modified>>", self.input_geaendert)
+        for var in (self.decode_header_ticker_var, self.decode_typ_var, self.decode_element_var, self.decode_ansicht_var):
+            var.trace_add("write", lambda *_: self.live_decode_geaendert())
+        self.decode_table = VirtualTable(
+            self.decode_tab, columns=("Nr", "Quelle", "Element", "Modus", "Inhalt"),
+            widths=(50, 90, 60, 100, 330))
+        self.decode_table.tree.bind("<<TreeviewSelect>>", lambda e: self.show_decode_details())
+        self.decode_ergebnisse = []
+
         ttk.Label(self.decode_tab, text="Hex-Form:").place(x=540, y=15)
         self.decode_hex_format_var = tk.StringVar(value="NNH")
         self.decode_hex_format_dropdown = ttk.Combobox(
@@ -621,49 +1106,287 @@ class EncodeDecodeGUI(tk.Tk):
             self.decode_typ_dropdown["state"] = "readonly"
             self.decode_element_dropdown["state"] = "readonly"
 
+    def update_decode_ansicht(self):
+        if self.decode_ansicht_var.get() == DECODE_ANSICHTEN[0]:
+            self.decode_table.place_forget()
+            self.result_text.place(x=10, y=175, width=650, height=165)
+            self.copy_decode_result_button.place(x=10, y=345)
+        else:
+            self.decode_table.place(x=10, y=175, width=650)
+            self.result_text.place(x=10, y=375, width=650, height=90)
+            self.copy_decode_result_button.place(x=10, y=470)
+
     def do_decode(self):
-        try:
-            input_format = self.decode_hex_format_var.get()
-            bitleiste_str = self.input_text.get(1.0, tk.END).replace('\n', ' ').strip()
-            bitleiste_raw = bitleiste_str.split() if bitleiste_str else []
+        if not self.mapping_bereit or (self.decode_task and self.decode_task.running):
+            return
+        ansicht = self.decode_ansicht_var.get()
+        if ansicht != DECODE_ANSICHTEN[0]:
+            return self.do_decode_multi(ansicht)
+        text = self.input_text.get(1.0, tk.END)
+        mode = self.decode_header_ticker_var.get()
+        typ = None if mode else self.decode_typ_var.get()
+        element = None if mode else self.decode_element_var.get()
+
+        def work(task):
+            # Teuer ist bei großen Eingaben das Umwandeln des Hex-Texts (05H, 0x05, 05) in bytes,
+            # das eigentliche Dekodieren liest nur den Header und die Telegramme des Elements.
+            # Deshalb blockweise umwandeln und dabei Fortschritt melden und Abbruch prüfen.
+            # Ungültige Token brechen nicht ab, sie werden übersprungen und oben gemeldet.
+            daten = bytearray()
+            ungueltig = []
+            for ende, block in iter_text_bloecke(text):
+                if task.cancelled:
+                    return 0
+                daten += block_zu_bytes(block, ungueltig)
+                task.progress(ende, len(text) + 1)
+            if task.cancelled:
+                return 0
+            ergebnis = decode_main(bytes(daten), typ=typ, element_for_param=element)
+            task.progress(len(text) + 1, len(text) + 1)
+            lines = self.format_decode_lines(ergebnis)
+            if ungueltig:
+                lines = [ungueltig_zeile(ungueltig), ""] + list(lines)
+            for line in lines:
+                if task.cancelled:
+                    break
+                task.emit(line)
+            return len(lines)
+
+        self.result_text.delete(1.0, tk.END)
+        self.start_decode_task(work, self.insert_decode_lines)
+
+    def do_decode_multi(self, ansicht):
+        text = self.input_text.get(1.0, tk.END)
+        mode = self.decode_header_ticker_var.get()
+        typ = None if mode else self.decode_typ_var.get()
+        element = None if mode else self.decode_element_var.get()
+
+        def work(task):
+            anzahl = 0
+            for anzahl, (quelle, ergebnis) in enumerate(self.iter_multi_decode(text, ansicht, typ, element, task), 1):
+                if task.cancelled:
+                    break
+                task.emit((anzahl, quelle, ergebnis))
+            return anzahl
+
+        self.decode_table.clear()
+        self.decode_ergebnisse = []
+        self.result_text.delete(1.0, tk.END)
+        self.start_decode_task(work, self.append_decode_rows, max_items_per_poll=5000)
 
-            # Wandelt beliebige Hex-Formate in "NNH" um:
-            bitleiste_liste = []
-            for b in bitleiste_raw:
+    @staticmethod
+    def iter_multi_decode(text, ansicht, typ, element, task):
+        # Liefert (quelle, ergebnis) je Telegramm; läuft im Worker-Thread
+        if ansicht == "Je Zeile":
+            zeilen = text.splitlines()
+            for nummer, zeile in enumerate(zeilen, 1):
+                zeile = strip_prefix(zeile.strip())
+                if not zeile:
+                    continue
                 try:
-                    val = parse_input_hex(b)
-                    bitleiste_liste.append(f"{val:02X}H")
-                except Exception:
-                    bitleiste_liste.append(b.upper())
-            mode = self.decode_header_ticker_var.get()
-            if not mode:
-                typ = self.decode_typ_var.get()
-                element = self.decode_element_var.get()
-                ergebnis = decode_main(bitleiste_liste, typ=typ, element_for_param=element)
-            else:
-                ergebnis = decode_main(bitleiste_liste)
-            lines = []
-            if ergebnis.get("Element"):
-                lines.append(f"Element: {ergebnis['Element']}")
-            if ergebnis.get("Modus"):
-                lines.append(f"Modus: {ergebnis['Modus']}")
-            if "Telegramme" in ergebnis:
-                if ergebnis["Element"] == "SILS":
-                    for k, v in ergebnis["Telegramme"]["SILS"].items():
-                        lines.append(f"- {k}={v}")
+                    ergebnis = cached_decode_main(zeile, typ=typ, element_for_param=element)
+                except Exception as e:
+                    ergebnis = {"Element": None, "Fehler": f"{type(e).__name__}: {e}"}
+                if nummer % 500 == 0:
+                    task.progress(nummer, len(zeilen))
+                yield f"Zeile {nummer}", ergebnis
+            task.progress(len(zeilen), len(zeilen))
+        else:
+            zeilen = [strip_prefix(z.strip()) for z in text.splitlines()]
+            daten = to_bytes(" ".join(z for z in zeilen if z))
+            for i, (offset, stueck, erkannt) in enumerate(split_frames(daten)):
+                if erkannt:
+                    ergebnis = cached_decode_main(stueck)
                 else:
-                    for tg, params in ergebnis["Telegramme"].items():
-                        paramstr = " ".join([f"{k}={v}" for k, v in params.items()])
-                        lines.append(f"{tg}: {paramstr}")
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, "\n".join(lines) if lines else "[Keine dekodierten Werte]")
-        except Exception as e:
+                    ergebnis = {"Element": None, "Fehler": f"Nicht zugeordnet: {len(stueck)} Bytes"}
+                if i % 500 == 0:
+                    task.progress(offset, len(daten))
+                yield f"Offset {offset}", ergebnis
+            task.progress(len(daten), len(daten))
+
+    def start_decode_task(self, work, on_items, max_items_per_poll=500):
+        self.decode_progress.config(value=0, maximum=1)
+        self.decode_button.config(state="disabled")
+        self.decode_cancel_button.config(state="normal")
+        self.decode_task = BackgroundTask(
+            self, work,
+            on_items=on_items,
+            on_progress=self.update_decode_progress,
+            on_done=self.decode_fertig,
+            on_error=self.decode_fehler,
+            max_items_per_poll=max_items_per_poll,
+        )
+        self.decode_task.start()
+
+    def append_decode_rows(self, items):
+        rows = []
+        for nummer, quelle, ergebnis in items:
+            self.decode_ergebnisse.append(ergebnis)
+            rows.append((nummer, quelle, *self.decode_zeile(ergebnis)))
+        self.decode_table.append_rows(rows)
+
+    @classmethod
+    def decode_zeile(cls, ergebnis):
+        # (Element, Modus, Inhalt) für die Tabelle
+        if ergebnis.get("Fehler") and "Telegramme" not in ergebnis:
+            inhalt = ergebnis["Fehler"]
+        else:
+            inhalt = " | ".join(cls.format_telegramm_lines(ergebnis))
+        return ergebnis.get("Element") or "-", ergebnis.get("Modus") or "", inhalt
+
+    def show_decode_details(self):
+        index = self.decode_table.selected_index()
+        if index is None:
+            return
+        ergebnis = self.decode_ergebnisse[index]
+        lines = self.format_decode_lines(ergebnis)
+        if ergebnis.get("Fehler"):
+            lines.append(f"Fehler: {ergebnis['Fehler']}")
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, "\n".join(lines))
+
+    @classmethod
+    def format_decode_lines(cls, ergebnis):
+        lines = []
+        if ergebnis.get("Element"):
+            lines.append(f"Element: {ergebnis['Element']}")
+        if ergebnis.get("Modus"):
+            lines.append(f"Modus: {ergebnis['Modus']}")
+        return lines + cls.format_telegramm_lines(ergebnis)
+
+    @staticmethod
+    def format_telegramm_lines(ergebnis):
+        lines = []
+        if "Telegramme" in ergebnis:
+            if ergebnis["Element"] == "SILS":
+                for k, v in ergebnis["Telegramme"]["SILS"].items():
+                    lines.append(f"- {k}={v}")
+            else:
+                for tg, params in ergebnis["Telegramme"].items():
+                    paramstr = " ".join([f"{k}={v}" for k, v in params.items()])
+                    lines.append(f"{tg}: {paramstr}")
+        return lines
+
+    def insert_decode_lines(self, lines):
+        # Zeilen stückweise anhängen, statt am Ende alles auf einmal einzufügen
+        if self.result_text.compare("end-1c", "!=", "1.0"):
+            self.result_text.insert(tk.END, "\n")
+        self.result_text.insert(tk.END, "\n".join(lines))
+
+    # --- Live-Dekodierung ---
+    def input_geaendert(self, event=None):
+        # <<Modified>> kommt auch beim Zurücksetzen des Flags, daher nur bei gesetztem Flag reagieren
+        if self.input_text.edit_modified():
+            self.input_text.edit_modified(False)
+            self.live_decode_geaendert()
+
+    def toggle_live_decode(self):
+        if self.live_decode_var.get():
+            self.live_decode_geaendert()
+        else:
+            if self.live_decode_job:
+                self.after_cancel(self.live_decode_job)
+                self.live_decode_job = None
+            self.live_decoder = None
+
+    def live_decode_geaendert(self):
+        if not self.mapping_bereit or not self.live_decode_var.get():
+            return
+        if self.live_decode_job:
+            self.after_cancel(self.live_decode_job)
+        self.live_decode_job = self.after(LIVE_DECODE_MS, self.live_decode_starten)
+
+    def live_decode_starten(self):
+        self.live_decode_job = None
+        if self.live_decode_task and self.live_decode_task.running:
+            # Erst das laufende Update abwarten, dann mit dem neuesten Text weitermachen
+            self.live_decode_offen = True
+            return
+        if self.decode_task and self.decode_task.running:
+            self.live_decode_geaendert()
+            return
+        mode = self.decode_header_ticker_var.get()
+        optionen = (self.decode_ansicht_var.get(),
+                    None if mode else self.decode_typ_var.get(),
+                    None if mode else self.decode_element_var.get())
+        generation = mapping_registry.generation()
+        if (self.live_decoder is None or self.live_decoder.optionen() != optionen
+                or self.live_decoder_generation != generation):
+            # Andere Optionen oder neues Mapping: nichts von vorher wiederverwenden
+            self.live_decoder = LiveDecoder(*optionen, extra=self.decode_zeile)
+            self.live_decoder_generation = generation
+        decoder = self.live_decoder
+        text = self.input_text.get(1.0, tk.END)
+        self.live_decode_offen = False
+        self.live_decode_task = BackgroundTask(
+            self, lambda task: decoder.update(text),
+            on_done=lambda ergebnisse: self.live_decode_anzeigen(decoder, ergebnisse),
+            on_error=self.live_decode_fehler)
+        self.live_decode_task.start()
+
+    def live_decode_anzeigen(self, decoder, ergebnisse):
+        if decoder is self.live_decoder and self.live_decode_var.get():
+            if decoder.ansicht == DECODE_ANSICHTEN[0]:
+                lines = []
+                for _, ergebnis, _ in ergebnisse:
+                    lines = self.format_decode_lines(ergebnis)
+                    if ergebnis.get("Fehler"):
+                        lines.append(f"Fehler: {ergebnis['Fehler']}")
+                self.live_text_setzen("\n".join(lines))
+            else:
+                self.decode_ergebnisse = [ergebnis for _, ergebnis, _ in ergebnisse]
+                self.decode_table.set_rows([(nummer, quelle, *zeile)
+                                            for nummer, (quelle, _, zeile) in enumerate(ergebnisse, 1)])
+                self.live_text_setzen(f"{len(ergebnisse)} Telegramme dekodiert (live, "
+                                      f"{decoder.neu_dekodiert} neu), Zeile auswählen für Details")
+        if self.live_decode_offen:
+            self.live_decode_geaendert()
+
+    def live_text_setzen(self, text):
+        # Nur schreiben, wenn sich etwas geändert hat (kein Flackern beim Tippen)
+        if self.result_text.get(1.0, "end-1c") != text:
             self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, f"[FEHLER beim Dekodieren]\n{e}")
-            mbox.showerror("Fehler beim Dekodieren", str(e))
+            self.result_text.insert(tk.END, text)
+
+    def live_decode_fehler(self, e, tb):
+        self.live_decoder = None
+        self.live_text_setzen(f"[FEHLER beim Dekodieren]\n{type(e).__name__}: {e}")
+        debug_logger.error("Live-Dekodierung fehlgeschlagen: %s", e, extra={"traceback_text": tb})
+        if self.live_decode_offen:
+            self.live_decode_geaendert()
+
+    def update_decode_progress(self, done, total):
+        self.decode_progress.config(maximum=max(total, 1), value=done)
+
+    def decode_controls_idle(self):
+        self.decode_button.config(state="normal")
+        self.decode_cancel_button.config(state="disabled")
+
+    def decode_fertig(self, anzahl):
+        self.decode_controls_idle()
+        if self.decode_task.cancelled:
+            self.result_text.insert(tk.END, "\n[Abgebrochen]")
+        elif not anzahl:
+            self.result_text.insert(tk.END, "[Keine dekodierten Werte]")
+        elif self.decode_ansicht_var.get() != DECODE_ANSICHTEN[0]:
+            self.result_text.insert(tk.END, f"{anzahl} Telegramme dekodiert, Zeile auswählen für Details")
+
+    def decode_fehler(self, e, tb):
+        self.decode_controls_idle()
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, f"[FEHLER beim Dekodieren]\n{e}")
+        mbox.showerror("Fehler beim Dekodieren", str(e))
+
+    def cancel_decode(self):
+        if self.decode_task:
+            self.decode_task.cancel()
 
     def copy_decode_result(self):
-        result = self.result_text.get(1.0, tk.END).strip()
+        if self.decode_ansicht_var.get() != DECODE_ANSICHTEN[0]:
+            # Ganze Tabelle tabgetrennt, z.B. zum Einfügen in Excel
+            result = "\n".join("\t".join(str(v) for v in row) for row in self.decode_table.rows)
+        else:
+            result = self.result_text.get(1.0, tk.END).strip()
         self.clipboard_clear()
         self.clipboard_append(result)
 
@@ -685,6 +1408,9 @@ class EncodeDecodeGUI(tk.Tk):
         self.encode_result.bind("<Control-c>", lambda e: self.copy_encode_result())
         self.result_text.bind("<Control-c>", lambda e: self.copy_decode_result())
 
-if __name__ == "__main__":
+def main():
     app = EncodeDecodeGUI()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
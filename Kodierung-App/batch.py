@@ -0,0 +1,33 @@
+"""
+Hilfsfunktionen für die Stapelverarbeitung großer Eingaben in mehreren Prozessen.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+def iter_chunks(iterable, chunk_size):
+    # Teilt einen (beliebig langen) Iterator in Listen zu je chunk_size Elementen
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def parallel_map_ordered(func, chunks, jobs=None, initializer=None, initargs=(), max_pending=None):
+    """
+    Verteilt die Chunks auf einen ProcessPoolExecutor und liefert die Ergebnisse
+    in Eingabereihenfolge. Es sind höchstens max_pending Chunks gleichzeitig
+    unterwegs, damit der Speicherbedarf auch bei riesigen Dateien begrenzt bleibt.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    max_pending = max_pending or jobs * 2
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
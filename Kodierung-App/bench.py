@@ -0,0 +1,330 @@
+"""
+Benchmarks für die Encode/Decode-Hotpaths.
+
+Die Testdaten werden aus mapping.json selbst erzeugt (zufällige, aber per Seed
+reproduzierbare Parameterkombinationen). Zusätzlich kann das Mapping künstlich
+vergrößert werden (--scales 1,10,100 = 10x/100x mehr Werte je Parameter), um zu
+sehen, ob die Laufzeit mit der Mapping-Größe wächst.
+
+    python bench.py                                  # alle Benchmarks, Maßstab 1
+    python bench.py --scales 1,10,100 --save-baseline baseline.json
+    python bench.py --scales 1,10,100 --compare baseline.json --tolerance 0.25
+
+Gemessen werden Durchsatz (Aufrufe/s) und die Spitzen-Allokation je Aufruf
+(tracemalloc). Mit --compare endet das Skript mit Exit-Code 1, wenn ein
+Benchmark mehr als --tolerance langsamer ist als in der Baseline.
+
+    python bench.py --startup --import-budget 150 --paint-budget 500
+
+--startup misst stattdessen den Start der GUI in frischen Prozessen: Importzeit
+von GUI.py, Zeit bis zum ersten Zeichnen des Fensters und bis das Mapping im
+Hintergrund geladen ist. Exit-Code 1, wenn ein Budget überschritten ist oder
+der Import das Mapping oder eines der SPAETE_MODULE (numpy, openpyxl, ...) bereits
+lädt. Ohne Display wird nur der Import gemessen. test_startup.py prüft dasselbe
+unter pytest (python -m pytest test_startup.py).
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import mapping_registry
+from mapping_registry import get_mapping
+from decode import decode_main, decode_other, decode_sils, parse_input_hex, to_bytes
+from encode import encode_main, encode_sils_full
+
+def scale_mapping(elemente, faktor, seed=0):
+    """
+    Kopie des Mappings mit faktor-mal so vielen Werten je Parameter. Die neuen
+    Werte haben eigene, noch unbenutzte Bytefolgen gleicher Länge (soweit es
+    bei 1-Byte-Parametern genug freie Bytewerte gibt).
+    """
+    if faktor <= 1:
+        return elemente
+    rnd = random.Random(seed)
+    skaliert = copy.deepcopy(elemente)
+    for element, eintrag in skaliert.items():
+        for typ, typ_eintrag in eintrag.items():
+            if element == "SILS" or not isinstance(typ_eintrag, dict) or "telegramme" not in typ_eintrag:
+                continue
+            for tg_map in typ_eintrag["telegramme"].values():
+                for val_map in tg_map.values():
+                    _erweitern(val_map, faktor, rnd)
+    sils_map = skaliert["SILS"]["Meldung"]["telegramme"]
+    for feld, werte in sils_map.items():
+        belegt = {parse_input_hex(h) for hex_arr in werte.values() for h in hex_arr}
+        frei = [b for b in range(256) if b not in belegt and b != 0x30]
+        for i, b in enumerate(frei[:len(werte) * (faktor - 1)]):
+            werte[f"Synthetisch {feld} {i}"] = [f"{b:02X}H"]
+    return skaliert
+
+def _erweitern(val_map, faktor, rnd):
+    laenge = len(next(iter(val_map.values())))
+    belegt = {tuple(seq) for seq in val_map.values()}
+    ziel = len(val_map) * faktor
+    neu_wert = max(int(v) for v in val_map) + 1
+    versuche = 0
+    while len(val_map) < ziel and len(belegt) < 256 ** laenge and versuche < ziel * 20:
+        versuche += 1
+        seq = tuple(f"{rnd.randrange(256):02X}H" for _ in range(laenge))
+        if seq in belegt:
+            continue
+        belegt.add(seq)
+        val_map[str(neu_wert)] = list(seq)
+        neu_wert += 1
+
+def random_params(elemente, element, typ, rnd):
+    # Eine zufällige gültige Parameterkombination für alle Telegramme von element/typ
+    params = {}
+    for tg_name, tg_map in elemente[element][typ]["telegramme"].items():
+        params[tg_name] = {param: f"{int(rnd.choice(list(val_map))):X}H" for param, val_map in tg_map.items()}
+    return params
+
+def random_sils_params(elemente, rnd):
+    params = {}
+    for feld in elemente["SILS"]["byteorder"]:
+        if feld in ("ZS2", "ZS2V"):
+            params[feld] = f"Kennbuchstabe {chr(rnd.randint(65, 90))}"
+        elif feld in ("ZS3", "ZS3V"):
+            params[feld] = str(rnd.randint(1, 15) * 10)
+        elif feld == "Fahrweginformation":
+            params[feld] = f"Fahrweginformation {rnd.randint(1, 253)}"
+        else:
+            params[feld] = rnd.choice(list(elemente["SILS"]["Meldung"]["telegramme"][feld]))
+    return params
+
+def build_cases(elemente, anzahl, seed=0):
+    """
+    Liefert {name: (funktion, [argumente, ...])} mit anzahl synthetischen Eingaben je Benchmark.
+    """
+    rnd = random.Random(seed)
+    cases = {}
+    meldungen = []
+    for element, eintrag in elemente.items():
+        if element == "SILS":
+            continue
+        for typ in ("Meldung", "Kommando"):
+            if typ not in eintrag:
+                continue
+            header_keys = list(eintrag["header"])
+            args = []
+            for _ in range(anzahl):
+                params = random_params(elemente, element, typ, rnd)
+                pea_modus = rnd.choice("GR")
+                args.append(((element, typ, pea_modus, params), {"header_key": rnd.choice(header_keys)}))
+            cases[f"encode_main[{element}/{typ}]"] = (encode_main, args)
+            if typ == "Meldung":
+                for (a, kw) in args:
+                    meldungen.append((a, encode_main(*a, **kw)))
+
+    sils_args = [((random_sils_params(elemente, rnd), "N91"), {"sender_byte": rnd.choice(["01", "02", "03"])})
+                 for _ in range(anzahl)]
+    cases["encode_sils_full"] = (encode_sils_full, sils_args)
+    sils_telegramme = [to_bytes(encode_sils_full(*a, **kw)) for a, kw in sils_args]
+    cases["decode_sils"] = (decode_sils, [((t,), {}) for t in sils_telegramme])
+
+    rnd.shuffle(meldungen)
+    meldungen = meldungen[:anzahl]
+    cases["decode_other[Header]"] = (decode_other, [((to_bytes(b),), {}) for _, b in meldungen])
+    ohne_header = []
+    for (element, typ, pea_modus, params), _ in meldungen:
+        b = encode_main(element, typ, pea_modus, params, only_param=True)
+        ohne_header.append(((to_bytes(b),), {"typ": typ, "element_for_param": element}))
+    cases["decode_other[ohne Header]"] = (decode_other, ohne_header)
+    cases["decode_main[Text]"] = (decode_main, [((" ".join(b),), {}) for _, b in meldungen])
+
+    tokens = [t for _, b in meldungen for t in b][:anzahl] or ["05H"]
+    tokens = [rnd.choice([t, t.lower(), f"0x{t[:2]}"]) for t in tokens]
+    cases["parse_input_hex"] = (parse_input_hex, [((t,), {}) for t in tokens])
+    return cases
+
+def measure(func, args, min_zeit=0.2):
+    # Durchsatz: so oft über alle Eingaben laufen, bis min_zeit erreicht ist
+    durchlaeufe = 0
+    start = time.perf_counter()
+    while True:
+        for a, kw in args:
+            func(*a, **kw)
+        durchlaeufe += 1
+        dauer = time.perf_counter() - start
+        if dauer >= min_zeit:
+            break
+    aufrufe = durchlaeufe * len(args)
+
+    # Allokation: Spitze je Einzelaufruf über eine Stichprobe
+    stichprobe = args[:50]
+    tracemalloc.start()
+    try:
+        spitzen = 0
+        for a, kw in stichprobe:
+            tracemalloc.reset_peak()
+            basis = tracemalloc.get_traced_memory()[0]
+            func(*a, **kw)
+            spitzen += tracemalloc.get_traced_memory()[1] - basis
+    finally:
+        tracemalloc.stop()
+    return {
+        "ops_per_s": aufrufe / dauer,
+        "us_per_op": dauer / aufrufe * 1e6,
+        "alloc_bytes_per_op": spitzen / max(len(stichprobe), 1),
+    }
+
+def run(scales=(1,), anzahl=200, seed=0, filter_name=None, min_zeit=0.2):
+    original = get_mapping()
+    ergebnisse = {}
+    try:
+        for faktor in scales:
+            elemente = scale_mapping(original, faktor, seed=seed)
+            mapping_registry.set_mapping(elemente)
+            mapping_registry.preload()
+            for name, (func, args) in build_cases(elemente, anzahl, seed=seed).items():
+                if filter_name and filter_name not in name:
+                    continue
+                ergebnisse[f"{name}@x{faktor}"] = measure(func, args, min_zeit=min_zeit)
+    finally:
+        mapping_registry.reset()
+    return ergebnisse
+
+def compare(ergebnisse, baseline, tolerance):
+    # Liste der Benchmarks, die mehr als tolerance langsamer geworden sind
+    regressionen = []
+    for name, werte in ergebnisse.items():
+        alt = baseline.get(name)
+        if alt and werte["ops_per_s"] < alt["ops_per_s"] * (1 - tolerance):
+            regressionen.append((name, alt["ops_per_s"], werte["ops_per_s"]))
+    return regressionen
+
+def print_table(ergebnisse, baseline=None, out=sys.stdout):
+    print(f"{'Benchmark':44} {'Aufrufe/s':>12} {'us/Aufruf':>10} {'Bytes/Aufruf':>13} {'vs. Baseline':>13}", file=out)
+    for name, werte in ergebnisse.items():
+        vergleich = ""
+        if baseline and name in baseline:
+            vergleich = f"{werte['ops_per_s'] / baseline[name]['ops_per_s'] - 1:+.1%}"
+        print(f"{name:44} {werte['ops_per_s']:12.0f} {werte['us_per_op']:10.2f} "
+              f"{werte['alloc_bytes_per_op']:13.0f} {vergleich:>13}", file=out)
+
+# Läuft in einem frischen Prozess, damit nichts aus dem Benchmark-Prozess schon importiert ist
+# Startzeit-Vorgaben in ms (auch für test_startup.py)
+IMPORT_BUDGET_MS = 150
+PAINT_BUDGET_MS = 500
+# Erst bei Bedarf zu laden, nie schon beim Import von GUI.py
+SPAETE_MODULE = ("numpy", "openpyxl", "argparse", "multiprocessing", "concurrent.futures", "pickle", "hashlib")
+
+STARTUP_SKRIPT = r"""
+import json, sys, time
+start = time.perf_counter()
+import GUI, mapping_registry
+ergebnis = {"import_ms": (time.perf_counter() - start) * 1000,
+            "mapping_beim_import": mapping_registry.is_loaded(),
+            "module_beim_import": sorted(m for m in sys.argv[1:] if m in sys.modules)}
+try:
+    app = GUI.EncodeDecodeGUI()
+except GUI.tk.TclError:
+    app = None  # kein Display
+if app is not None:
+    app.update()
+    ergebnis["paint_ms"] = (time.perf_counter() - start) * 1000
+    ergebnis["mapping_beim_paint"] = app.mapping_bereit
+    while not app.mapping_bereit and time.perf_counter() - start < 30:
+        app.update()
+        time.sleep(0.005)
+    ergebnis["bereit_ms"] = (time.perf_counter() - start) * 1000
+    app.destroy()
+print(json.dumps(ergebnis))
+"""
+
+def measure_startup(runs=5):
+    # Median je Kennzahl über mehrere Prozessstarts
+    laeufe = []
+    for _ in range(runs):
+        ausgabe = subprocess.run([sys.executable, "-c", STARTUP_SKRIPT, *SPAETE_MODULE], capture_output=True,
+                                 text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        laeufe.append(json.loads(ausgabe.stdout.strip().splitlines()[-1]))
+    ergebnis = {}
+    for key in laeufe[0]:
+        werte = [lauf[key] for lauf in laeufe]
+        if isinstance(werte[0], bool):
+            ergebnis[key] = any(werte)
+        elif isinstance(werte[0], list):
+            ergebnis[key] = sorted(set().union(*werte))
+        else:
+            ergebnis[key] = statistics.median(werte)
+    return ergebnis
+
+def check_startup(ergebnis, import_budget=IMPORT_BUDGET_MS, paint_budget=PAINT_BUDGET_MS):
+    # Liste der verletzten Startzeit-Vorgaben
+    fehler = []
+    if ergebnis["mapping_beim_import"]:
+        fehler.append("GUI.py lädt das Mapping schon beim Import")
+    if ergebnis.get("module_beim_import"):
+        fehler.append(f"GUI.py importiert sofort: {', '.join(ergebnis['module_beim_import'])}")
+    if ergebnis["import_ms"] > import_budget:
+        fehler.append(f"Import {ergebnis['import_ms']:.1f} ms > {import_budget:.0f} ms")
+    if "paint_ms" in ergebnis:
+        if ergebnis["mapping_beim_paint"]:
+            fehler.append("Mapping wird vor dem ersten Zeichnen geladen")
+        if ergebnis["paint_ms"] > paint_budget:
+            fehler.append(f"Erstes Zeichnen {ergebnis['paint_ms']:.1f} ms > {paint_budget:.0f} ms")
+    return fehler
+
+def main_startup(args):
+    ergebnis = measure_startup(args.startup_runs)
+    print(f"Import GUI.py:        {ergebnis['import_ms']:8.1f} ms (Budget {args.import_budget:.0f} ms)")
+    if "paint_ms" in ergebnis:
+        print(f"Erstes Zeichnen:      {ergebnis['paint_ms']:8.1f} ms (Budget {args.paint_budget:.0f} ms)")
+        print(f"Mapping geladen nach: {ergebnis['bereit_ms']:8.1f} ms")
+    else:
+        print("Kein Display: Zeit bis zum ersten Zeichnen nicht gemessen")
+    fehler = check_startup(ergebnis, args.import_budget, args.paint_budget)
+    for f in fehler:
+        print(f"BUDGET {f}", file=sys.stderr)
+    return 1 if fehler else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks für Encode/Decode")
+    parser.add_argument("--scales", default="1", help="Mapping-Maßstäbe, z.B. 1,10,100 (Standard: 1)")
+    parser.add_argument("--anzahl", type=int, default=200, help="Synthetische Eingaben je Benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-zeit", type=float, default=0.2, help="Mindestlaufzeit je Benchmark in Sekunden")
+    parser.add_argument("-k", "--filter", help="Nur Benchmarks, deren Name diesen Text enthält")
+    parser.add_argument("--save-baseline", metavar="DATEI", help="Ergebnisse als Baseline speichern")
+    parser.add_argument("--compare", metavar="DATEI", help="Mit gespeicherter Baseline vergleichen")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Erlaubter Durchsatzverlust gegenüber der Baseline (Standard: 0.2 = 20%%)")
+    parser.add_argument("--startup", action="store_true", help="Startzeit der GUI statt der Hotpaths messen")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Prozessstarts für --startup (Standard: 5)")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS, help="Höchstzeit für den Import von GUI.py in ms")
+    parser.add_argument("--paint-budget", type=float, default=PAINT_BUDGET_MS, help="Höchstzeit bis zum ersten Zeichnen in ms")
+    args = parser.parse_args(argv)
+    if args.startup:
+        return main_startup(args)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    ergebnisse = run(scales, anzahl=args.anzahl, seed=args.seed, filter_name=args.filter, min_zeit=args.min_zeit)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+    print_table(ergebnisse, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "benchmarks": ergebnisse}, f, indent=2)
+
+    if baseline:
+        regressionen = compare(ergebnisse, baseline, args.tolerance)
+        for name, alt, neu in regressionen:
+            print(f"REGRESSION {name}: {alt:.0f} -> {neu:.0f} Aufrufe/s", file=sys.stderr)
+        if regressionen:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
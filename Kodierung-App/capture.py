@@ -0,0 +1,66 @@
+"""
+Binäre Mitschnitte (rohe Telegramme hintereinander, kein "05H 00H ..."-Text) dekodieren.
+
+Die Datei wird per mmap eingeblendet und anhand der Header aus dem Mapping in
+Telegramme zerlegt (decode.split_frames). Der Decoder bekommt memoryview-Ausschnitte
+ohne Kopie, Hex-Strings entstehen erst in der Ausgabe. Auch mehrere GB große
+Mitschnitte belegen so kaum Arbeitsspeicher.
+
+    for offset, ergebnis in decode_capture("aufzeichnung.bin"):
+        ...
+    # Telegramme fester Länge ohne Header:
+    decode_capture("x05.bin", record_len=36, typ="Meldung", element="BLLE")
+"""
+import mmap
+import os
+from contextlib import contextmanager
+
+from decode import decode_main, split_frames
+
+@contextmanager
+def open_capture(path):
+    # Schreibgeschütztes memoryview auf die ganze Datei
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(b"")  # leere Dateien lassen sich nicht mappen
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                yield view
+            finally:
+                view.release()
+
+def iter_fixed(view, record_len):
+    # Zerlegung in Datensätze fester Länge, ein unvollständiger Rest wird als nicht erkannt gemeldet
+    ende = len(view) - len(view) % record_len
+    for offset in range(0, ende, record_len):
+        yield offset, view[offset:offset+record_len], True
+    if ende < len(view):
+        yield ende, view[ende:], False
+
+def iter_capture_frames(path, record_len=None):
+    """
+    Liefert (offset, frame, erkannt) für alle Telegramme der Datei. frame ist ein
+    memoryview in die Datei und nur bis zum nächsten Schritt gültig (bytes(frame) zum Aufheben).
+    """
+    with open_capture(path) as view:
+        frames = iter_fixed(view, record_len) if record_len else split_frames(view)
+        try:
+            for offset, frame, erkannt in frames:
+                try:
+                    yield offset, frame, erkannt
+                finally:
+                    # Ausschnitt freigeben, sonst lässt sich das mmap am Ende nicht schließen
+                    frame.release()
+        finally:
+            frames.close()
+
+def decode_capture(path, record_len=None, typ=None, element=None):
+    # Liefert (offset, ergebnis) je Telegramm; typ/element nur für Datensätze ohne Header (record_len)
+    for offset, frame, erkannt in iter_capture_frames(path, record_len=record_len):
+        if erkannt:
+            ergebnis = decode_main(frame, typ=typ, element_for_param=element)
+        else:
+            ergebnis = {"Element": None, "Fehler": f"Nicht zugeordnet: {len(frame)} Bytes"}
+        yield offset, ergebnis
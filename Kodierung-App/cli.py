@@ -0,0 +1,242 @@
+"""
+Kommandozeile für Encode/Decode ohne GUI.
+
+    python cli.py decode capture.txt > ergebnis.jsonl
+    python cli.py decode --element BLLE --typ Meldung < bitleisten.txt
+    python cli.py decode --jobs 8 nacht_trace.txt -o ergebnis.jsonl
+    python cli.py decode --cache 100000 --cache-stats zyklische_meldungen.txt
+    python cli.py encode --hex-format 0xNN parameter.jsonl
+    python cli.py capture aufzeichnung.bin -o ergebnis.jsonl
+    nc simulator 4000 | python cli.py stream
+    python cli.py --metrics stufen.prom decode --jobs 4 nacht_trace.txt > /dev/null
+
+Decode liest eine Bitleiste pro Zeile (05H 00H ..., 0x05 0x00 ... oder 05 00 ...),
+Encode einen JSON-Datensatz pro Zeile, z.B.
+    {"element": "BLLE", "typ": "Meldung", "header_key": "05", "params": {"X05": "X0=0A X1=0B"}}
+    {"element": "SILS", "sils_full": true, "name_4char": "N91", "params": {"Hauptbegriff": "Ks1"}}
+Capture liest binäre Mitschnitte (rohe Telegramme ohne Hex-Text) direkt per mmap,
+Stream dieselben Daten fortlaufend von stdin und gibt jedes Telegramm sofort aus.
+Die Ergebnisse werden zeilenweise als JSONL geschrieben, es wird nie die ganze Datei gehalten.
+"""
+import argparse
+import json
+import sys
+from functools import partial
+
+import instrument
+import mapping_registry
+from batch import iter_chunks, parallel_map_ordered
+from capture import decode_capture
+from stream import decode_stream, iter_chunks_from
+from decode import decode_main, strip_prefix
+from codec_cache import (cached_decode_main, cached_encode_main, cached_encode_sils_full,
+                         decode_cache, encode_cache, FrozenDict)
+
+def iter_lines(paths):
+    # Liefert (zeilennummer, zeile) für alle nicht-leeren Zeilen, "-" steht für stdin
+    nummer = 0
+    for path in paths or ["-"]:
+        if path == "-":
+            stream = sys.stdin
+        else:
+            stream = open(path, "r", encoding="utf-8")
+        try:
+            for line in stream:
+                nummer += 1
+                line = line.strip()
+                if line:
+                    yield nummer, line
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+def decode_line(line, typ=None, element=None, cache=False):
+    decoder = cached_decode_main if cache else decode_main
+    return decoder(strip_prefix(line), typ=typ, element_for_param=element)
+
+def encode_record(record, hex_format="NNH"):
+    params = record.get("params", {})
+    if record.get("sils_full"):
+        return cached_encode_sils_full(
+            params,
+            record.get("name_4char", ""),
+            is_stoerung=record.get("is_stoerung", False),
+            stoerung_art=record.get("stoerung_art", "05"),
+            sender_byte=record.get("sender_byte"),
+            hex_format=hex_format,
+        )
+    return cached_encode_main(
+        record["element"],
+        record.get("typ", "Meldung"),
+        record.get("pea_modus", "G"),
+        params,
+        only_param=record.get("only_param", False),
+        header_key=record.get("header_key", "05"),
+        hex_format=hex_format,
+    )
+
+def decode_results(lines, typ=None, element=None, cache=False):
+    for nummer, line in lines:
+        try:
+            ergebnis = decode_line(line, typ=typ, element=element, cache=cache)
+        except Exception as e:
+            ergebnis = {"Element": None, "Fehler": f"{type(e).__name__}: {e}"}
+        yield nummer, ergebnis
+
+def decode_records(lines, typ=None, element=None, cache=False):
+    for nummer, ergebnis in decode_results(lines, typ=typ, element=element, cache=cache):
+        yield {"Zeile": nummer, **ergebnis}
+
+def decode_jsonl(lines, typ=None, element=None, cache=False):
+    for nummer, ergebnis in decode_results(lines, typ=typ, element=element, cache=cache):
+        if isinstance(ergebnis, FrozenDict) and ergebnis:
+            # Gecachtes Ergebnis: JSON-Text wiederverwenden, nur die Zeilennummer voranstellen
+            yield f'{{"Zeile": {nummer}, {ergebnis.to_json()[1:]}\n'
+        else:
+            yield to_jsonl({"Zeile": nummer, **ergebnis})
+
+def encode_records(lines, hex_format="NNH"):
+    for nummer, line in lines:
+        try:
+            bitleiste = encode_record(json.loads(line), hex_format=hex_format)
+            yield {"Zeile": nummer, "Bitleiste": " ".join(bitleiste)}
+        except Exception as e:
+            yield {"Zeile": nummer, "Fehler": f"{type(e).__name__}: {e}"}
+
+def capture_records(paths, record_len=None, typ=None, element=None):
+    for path in paths:
+        for offset, ergebnis in decode_capture(path, record_len=record_len, typ=typ, element=element):
+            yield {"Datei": path, "Offset": offset, **ergebnis}
+
+def stream_records(stream, chunk_bytes=65536):
+    for offset, ergebnis in decode_stream(iter_chunks_from(stream.read1, chunk_bytes)):
+        yield {"Offset": offset, **ergebnis}
+
+def to_jsonl(record):
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+def write_jsonl(records, out):
+    for record in records:
+        out.write(to_jsonl(record))
+
+def init_worker(cache_size=0, metrics=False):
+    # Mapping und Indizes einmal je Worker laden, nicht erst beim ersten Telegramm
+    mapping_registry.preload()
+    decode_cache.maxsize = cache_size
+    if metrics:
+        instrument.enable()
+
+def decode_chunk(chunk, typ=None, element=None, cache=False):
+    # Läuft im Worker; liefert die fertigen JSONL-Zeilen, damit auch das
+    # Serialisieren parallel passiert, sowie die Cache-Treffer und Messwerte dieses Chunks
+    vorher = decode_cache.hits, decode_cache.misses
+    text = "".join(decode_jsonl(chunk, typ=typ, element=element, cache=cache))
+    stats = None
+    if instrument.is_enabled():
+        stats = instrument.snapshot()
+        instrument.reset()
+    return text, decode_cache.hits - vorher[0], decode_cache.misses - vorher[1], stats
+
+def decode_parallel(lines, out, typ=None, element=None, jobs=None, chunk_size=2000, cache_size=0):
+    # Liefert (hits, misses) des Decode-Caches über alle Worker
+    chunks = iter_chunks(lines, chunk_size)
+    func = partial(decode_chunk, typ=typ, element=element, cache=cache_size > 0)
+    hits = misses = 0
+    for text, h, m, stats in parallel_map_ordered(func, chunks, jobs=jobs, initializer=init_worker,
+                                                  initargs=(cache_size, instrument.is_enabled())):
+        out.write(text)
+        hits += h
+        misses += m
+        if stats:
+            instrument.merge(stats)
+    return hits, misses
+
+def print_cache_stats(name, hits, misses):
+    anfragen = hits + misses
+    quote = hits / anfragen if anfragen else 0.0
+    print(f"{name}: {hits} Treffer, {misses} Fehlschläge, Trefferquote {quote:.1%}", file=sys.stderr)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Encode/Decode von Bitleisten ohne GUI")
+    parser.add_argument("--metrics", metavar="DATEI",
+                        help="Laufzeit je Stufe messen und als JSON (bzw. Prometheus bei .prom) speichern")
+    sub = parser.add_subparsers(dest="befehl", required=True)
+
+    p_dec = sub.add_parser("decode", help="Bitleisten (eine pro Zeile) dekodieren")
+    p_dec.add_argument("dateien", nargs="*", help="Eingabedateien, '-' oder leer für stdin")
+    p_dec.add_argument("--element", help="Element ohne Header (BLLE, ALE, PEA)")
+    p_dec.add_argument("--typ", choices=["Meldung", "Kommando"], help="Typ ohne Header")
+    p_dec.add_argument("-o", "--output", help="Ausgabedatei (Standard: stdout)")
+    p_dec.add_argument("-j", "--jobs", type=int, default=1,
+                       help="Anzahl Worker-Prozesse (0 = alle Kerne, Standard: 1)")
+    p_dec.add_argument("--chunk-size", type=int, default=2000,
+                       help="Zeilen pro Arbeitspaket bei --jobs (Standard: 2000)")
+    p_dec.add_argument("--cache", type=int, default=0, metavar="GROESSE",
+                       help="Wiederholte Telegramme aus einem LRU-Cache dieser Größe beantworten (je Worker)")
+    p_dec.add_argument("--cache-stats", action="store_true",
+                       help="Trefferquote des Decode-Caches auf stderr ausgeben")
+
+    p_enc = sub.add_parser("encode", help="JSON-Parameter (einer pro Zeile) kodieren")
+    p_enc.add_argument("dateien", nargs="*", help="Eingabedateien, '-' oder leer für stdin")
+    p_enc.add_argument("--hex-format", choices=["NNH", "0xNN"], default="NNH")
+    p_enc.add_argument("-o", "--output", help="Ausgabedatei (Standard: stdout)")
+    p_enc.add_argument("--cache-stats", action="store_true",
+                       help="Trefferquote des Encode-Caches auf stderr ausgeben")
+
+    p_cap = sub.add_parser("capture", help="Binäre Mitschnitte (rohe Telegramme) dekodieren")
+    p_cap.add_argument("dateien", nargs="+", help="Binärdateien")
+    p_cap.add_argument("--record-len", type=int,
+                       help="Feste Telegrammlänge statt Erkennung über die Header")
+    p_cap.add_argument("--element", help="Element bei --record-len ohne Header (BLLE, ALE, PEA)")
+    p_cap.add_argument("--typ", choices=["Meldung", "Kommando"], help="Typ bei --record-len ohne Header")
+    p_cap.add_argument("-o", "--output", help="Ausgabedatei (Standard: stdout)")
+
+    p_str = sub.add_parser("stream", help="Fortlaufenden Binärstrom von stdin dekodieren")
+    p_str.add_argument("--chunk-bytes", type=int, default=65536, help="Höchstens so viele Bytes je Lesevorgang")
+    p_str.add_argument("-o", "--output", help="Ausgabedatei (Standard: stdout)")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.befehl in ("decode", "capture") and bool(args.element) != bool(args.typ):
+        parser.error("--element und --typ nur zusammen angeben")
+    if args.befehl == "capture" and args.element and not args.record_len:
+        parser.error("--element/--typ nur zusammen mit --record-len")
+    if args.metrics:
+        instrument.enable()
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.befehl == "capture":
+            write_jsonl(capture_records(args.dateien, record_len=args.record_len, typ=args.typ,
+                                        element=args.element), out)
+            return 0
+        if args.befehl == "stream":
+            for record in stream_records(sys.stdin.buffer, chunk_bytes=args.chunk_bytes):
+                out.write(to_jsonl(record))
+                out.flush()  # live: jedes Telegramm sofort weitergeben
+            return 0
+        lines = iter_lines(args.dateien)
+        if args.befehl == "decode" and args.jobs != 1:
+            hits, misses = decode_parallel(lines, out, typ=args.typ, element=args.element, jobs=args.jobs or None,
+                                           chunk_size=args.chunk_size, cache_size=args.cache)
+            if args.cache_stats:
+                print_cache_stats("Decode-Cache", hits, misses)
+        elif args.befehl == "decode":
+            decode_cache.maxsize = args.cache
+            out.writelines(decode_jsonl(lines, typ=args.typ, element=args.element, cache=args.cache > 0))
+            if args.cache_stats:
+                print_cache_stats("Decode-Cache", decode_cache.hits, decode_cache.misses)
+        else:
+            write_jsonl(encode_records(lines, hex_format=args.hex_format), out)
+            if args.cache_stats:
+                print_cache_stats("Encode-Cache", encode_cache.hits, encode_cache.misses)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if args.metrics:
+            instrument.dump(args.metrics)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Begrenzte LRU-Caches vor encode_main / encode_sils_full und decode_main.
+
+Die Funktionen hängen nur von ihren Argumenten und dem Mapping ab. Gleiche
+Parameterkombinationen (Regressionstests, wiederholtes Kodieren in der GUI)
+bzw. zyklisch wiederholte Meldetelegramme kosten damit nur noch einen
+Dictionary-Zugriff. Wird das Mapping neu geladen, werden die Caches geleert.
+"""
+import json
+import threading
+from collections import OrderedDict
+
+import mapping_registry
+from decode import decode_main, to_bytes
+from encode import encode_main, encode_sils_full
+
+class LRUCache:
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._daten = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._check_generation()
+            try:
+                wert = self._daten[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._daten.move_to_end(key)
+            self.hits += 1
+            return wert
+
+    def put(self, key, wert):
+        with self._lock:
+            self._check_generation()
+            self._daten[key] = wert
+            self._daten.move_to_end(key)
+            while len(self._daten) > self.maxsize:
+                self._daten.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._daten.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            anfragen = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._daten),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / anfragen if anfragen else 0.0,
+            }
+
+    def _check_generation(self):
+        # Bei neuem Mapping sind alle Einträge veraltet
+        generation = mapping_registry.generation()
+        if generation != self._generation:
+            self._daten.clear()
+            self._generation = generation
+
+def canonical_params(param_inputdict):
+    # Schlüssel der obersten Ebene (Telegramme bzw. SILS-Felder) sind reihenfolgeunabhängig,
+    # innerhalb eines Telegramms bestimmt die Reihenfolge der Parameter die Bytefolge
+    # und bleibt deshalb erhalten. Werte werden vom Encoder ohnehin gestrippt.
+    def wert(v):
+        if isinstance(v, dict):
+            return tuple((k, wert(x)) for k, x in v.items())
+        if isinstance(v, str):
+            return v.strip()
+        return v
+    return tuple(sorted((k, wert(v)) for k, v in param_inputdict.items()))
+
+encode_cache = LRUCache(maxsize=4096)
+
+def _cached(key, berechnen):
+    try:
+        hash(key)
+    except TypeError:
+        # z.B. Listen als Parameterwerte: nicht cachebar, direkt kodieren
+        return berechnen()
+    ergebnis = encode_cache.get(key)
+    if ergebnis is None:
+        ergebnis = tuple(berechnen())
+        encode_cache.put(key, ergebnis)
+    return list(ergebnis)
+
+def cached_encode_main(element, typ, pea_modus, param_inputdict, only_param=False, header_key="05", hex_format="NNH"):
+    key = ("main", element, typ, pea_modus, canonical_params(param_inputdict), bool(only_param), header_key, hex_format)
+    return _cached(key, lambda: encode_main(element, typ, pea_modus, param_inputdict, only_param=only_param,
+                                            header_key=header_key, hex_format=hex_format))
+
+def cached_encode_sils_full(param_inputdict, name_4char, is_stoerung=False, stoerung_art="05", sender_byte=None, hex_format="NNH"):
+    key = ("sils_full", canonical_params(param_inputdict), name_4char.strip(), bool(is_stoerung),
+           stoerung_art, sender_byte, hex_format)
+    return _cached(key, lambda: encode_sils_full(param_inputdict, name_4char, is_stoerung=is_stoerung,
+                                                 stoerung_art=stoerung_art, sender_byte=sender_byte,
+                                                 hex_format=hex_format))
+
+class FrozenDict(dict):
+    # Schreibgeschütztes dict: Dekodierergebnisse werden zwischen Aufrufern geteilt.
+    # Als dict-Unterklasse bleibt es direkt mit json.dumps serialisierbar.
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Gecachte Dekodierergebnisse sind schreibgeschützt")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def to_json(self):
+        # Der Inhalt ändert sich nicht mehr, also reicht es, einmal zu serialisieren
+        text = self.__dict__.get("_json")
+        if text is None:
+            text = self.__dict__["_json"] = json.dumps(self, ensure_ascii=False)
+        return text
+
+def freeze(wert):
+    if isinstance(wert, dict):
+        return FrozenDict({k: freeze(v) for k, v in wert.items()})
+    return wert
+
+def unfreeze(wert):
+    # Veränderbare Kopie, falls ein Aufrufer das Ergebnis weiterbearbeiten will
+    if isinstance(wert, dict):
+        return {k: unfreeze(v) for k, v in wert.items()}
+    return wert
+
+decode_cache = LRUCache(maxsize=65536)
+
+def cached_decode_main(bitleiste, typ=None, element_for_param=None):
+    # Als Schlüssel immer echte bytes, ein memoryview würde den Puffer (z.B. mmap) festhalten
+    bitleiste = bytes(to_bytes(bitleiste))
+    key = (bitleiste, typ, element_for_param)
+    ergebnis = decode_cache.get(key)
+    if ergebnis is None:
+        ergebnis = freeze(decode_main(bitleiste, typ=typ, element_for_param=element_for_param))
+        decode_cache.put(key, ergebnis)
+    return ergebnis
@@ -1,6 +1,24 @@
-import os
-import json
 import re
+import time
+
+import mapping_registry
+from mapping_registry import get_mapping, get_compiled
+
+# Schneller Weg für die üblichen Schreibweisen ("05H", "05h", "0x05", "05"),
+# damit nicht jedes Byte durch parse_input_hex muss
+_token_werte = {}
+for _i in range(256):
+    for _t in (f"{_i:02X}H", f"{_i:02x}h", f"{_i:02X}h", f"{_i:X}H", f"0x{_i:02X}", f"0x{_i:02x}", f"0X{_i:02X}", f"{_i:02X}", f"{_i:02x}"):
+        _token_werte[_t] = _i
+_nnh_tokens = tuple(f"{_i:02X}H" for _i in range(256))
+_0xnn_tokens = tuple(f"0x{_i:02X}" for _i in range(256))
+
+_hex2_pattern = re.compile(r'^[0-9A-Fa-f]{2}$')
+# Ganze Zeilen im üblichen Format ("05H 00H ...", "0x05 0x00 ...", "05 00 ...")
+# gehen ohne Token-Schleife direkt über bytes.fromhex
+_zeile_nnh = re.compile(r"[0-9A-Fa-f]{2}[Hh](?:[ \t\r\n\f\v]+[0-9A-Fa-f]{2}[Hh])*")
+_zeile_0xnn = re.compile(r"0[xX][0-9A-Fa-f]{2}(?:[ \t\r\n\f\v]+0[xX][0-9A-Fa-f]{2})*")
+_zeile_nn = re.compile(r"[0-9A-Fa-f]{2}(?:[ \t\r\n\f\v]+[0-9A-Fa-f]{2})*")
 
 def parse_input_hex(hex_str):
     # Erkenne 01H, 0x01, FFH, 0xFF etc.
@@ -9,11 +27,62 @@ def parse_input_hex(hex_str):
         return int(hex_str[:-1], 16)
     elif hex_str.lower().startswith('0x'):
         return int(hex_str, 16)
-    elif re.match(r'^[0-9A-Fa-f]{2}$', hex_str):
+    elif _hex2_pattern.match(hex_str):
         return int(hex_str, 16)
     else:
         raise ValueError(f"Unbekanntes Hex-Format: {hex_str}")
-        
+
+def to_bytes(bitleiste):
+    # Wandelt eine Bitleiste (bytes, "05H 00H ..." oder ["05H", "0x00", ...]) in bytes um.
+    # Intern wird nur noch mit bytes gearbeitet, die Hex-Schreibweise gibt es nur am Rand.
+    if isinstance(bitleiste, bytes):
+        return bitleiste
+    if isinstance(bitleiste, memoryview) and bitleiste.readonly and bitleiste.format == "B":
+        # Schreibgeschützte Ausschnitte (z.B. aus einem mmap) ohne Kopie weiterreichen
+        return bitleiste
+    if isinstance(bitleiste, (bytearray, memoryview)):
+        return bytes(bitleiste)
+    if not isinstance(bitleiste, str):
+        bitleiste = " ".join(bitleiste)
+    zeile = bitleiste.strip()
+    # Häufigster Fall: genau "NNH NNH ..." mit einem Leerzeichen, ohne Regex prüfbar
+    n = (len(zeile) + 1) // 4
+    try:
+        if zeile[2::4] == "H" * n and zeile[3::4] == " " * (n - 1) and len(zeile) == 4 * n - 1:
+            return bytes.fromhex(zeile.replace("H", ""))
+        if _zeile_nnh.fullmatch(zeile):
+            return bytes.fromhex(zeile.replace("H", "").replace("h", ""))
+        if _zeile_0xnn.fullmatch(zeile):
+            return bytes.fromhex(zeile.replace("0x", "").replace("0X", ""))
+        if _zeile_nn.fullmatch(zeile):
+            return bytes.fromhex(zeile)
+    except ValueError:
+        pass  # ungültige Zeichen: unten mit genauer Fehlermeldung
+    return bytes([token_wert(token) for token in zeile.split()])
+
+def token_wert(token):
+    # Ein einzelnes Token ("05H", "0x05", "05", ...) als Bytewert
+    wert = _token_werte.get(token)
+    if wert is None:
+        wert = parse_input_hex(token)
+        if not 0 <= wert <= 0xFF:
+            raise ValueError(f"Wert außerhalb eines Bytes: {token}")
+    return wert
+
+PREFIXE = ("$IO:", "$LS:")
+
+def strip_prefix(line):
+    # Ausgaben aus der GUI können mit $IO: / $LS: beginnen
+    for prefix in PREFIXE:
+        if line.startswith(prefix):
+            return line[len(prefix):].strip()
+    return line
+
+def format_bytes(data, hex_format="NNH"):
+    # Gegenstück zu to_bytes: bytes -> ["05H", ...] bzw. ["0x05", ...]
+    tokens = _0xnn_tokens if hex_format == "0xNN" else _nnh_tokens
+    return [tokens[b] for b in data]
+
 def hex_str(dec):
     return f"{int(dec):02X}"
 
@@ -27,13 +96,369 @@ def normalize_hex(byte):
 def normalize_label(label):
     return re.sub(r'\s+', '', label).lower()
 
-script_dir = os.path.dirname(os.path.abspath(__file__))
-mapping_path = os.path.join(script_dir, "mapping.json")
-with open(mapping_path, "r", encoding="utf-8") as f:
-    alle_elemente = json.load(f)
+def __getattr__(name):
+    # Kompatibilität: decode.alle_elemente liefert das aktuelle Mapping aus der Registry
+    if name == "alle_elemente":
+        return get_mapping()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def compile_param_index(val_map):
+    # Baut aus {val_dez: ["01H", ...]} eine Tabelle {bytes: (rang, wert_hex, laenge)}.
+    # Der Rang ist die Reihenfolge im Mapping, damit bei mehreren Treffern
+    # (unterschiedliche Längen) wie bisher der erste Eintrag gewinnt.
+    laengen = []
+    tabelle = {}
+    for rang, (val_dez, mapping_byte_seq) in enumerate(val_map.items()):
+        key = to_bytes(mapping_byte_seq)
+        if key not in tabelle:
+            tabelle[key] = (rang, hex_str(val_dez), len(key))
+        if len(key) not in laengen:
+            laengen.append(len(key))
+    return tuple(laengen), tabelle
+
+def build_decode_index(elemente):
+    # {(element, typ): [(tg_name, [(param, laengen, tabelle), ...]), ...]}
+    index = {}
+    for element, eintrag in elemente.items():
+        for typ, typ_eintrag in eintrag.items():
+            if not isinstance(typ_eintrag, dict) or "telegramme" not in typ_eintrag:
+                continue
+            if element == "SILS":
+                continue
+            telegramme = []
+            for tg_name, tg_map in typ_eintrag["telegramme"].items():
+                params = [(param, *compile_param_index(val_map)) for param, val_map in tg_map.items()]
+                telegramme.append((tg_name, params))
+            index[(element, typ)] = telegramme
+    return index
+
+def sils_label(name, val_int, param_labels):
+    # Liefert (anzeige, bekannt) für ein SILS-Nutzdatenbyte
+    # --- Speziallogik ZS2, ZS2V (Buchstabe A-Z) ---
+    if name in ("ZS2", "ZS2V") and 1 <= val_int <= 26:
+        return f"Kennbuchstabe {chr(64+val_int)}", True
+    # --- Speziallogik Fahrweginformation (1..253) ---
+    if name == "Fahrweginformation" and 1 <= val_int <= 253:
+        return f"Fahrweginformation {val_int}", True
+    # --- Normales Mapping falls oben nicht zutreffend
+    if val_int in param_labels:
+        return param_labels[val_int], True
+    return f"unbekannt ({val_int:X}H)", False
+
+def build_sils_luts(elemente):
+    # {feld: 256 Einträge (anzeige, bekannt)}, direkt über den Bytewert adressierbar
+    sils_map = elemente["SILS"]["Meldung"]["telegramme"]
+    luts = {}
+    for name in elemente["SILS"]["byteorder"]:
+        param_map = sils_map.get(name, {})
+        param_labels = {}
+        for param, hex_arr in param_map.items():
+            param_anzeigen = [k for k in param_map.keys() if normalize_label(k) == normalize_label(param)]
+            for h in hex_arr:
+                param_labels.setdefault(parse_input_hex(h), param_anzeigen[0] if param_anzeigen else param)
+        luts[name] = tuple(sils_label(name, val_int, param_labels) for val_int in range(256))
+    return luts
+
+PEA_MODUS_IDX = 14
+PEA_MODI = {0x47: "Geschwindigkeit", 0x52: "Richtung"}
+
+def build_header_index(elemente):
+    # {laenge: {header_bytes: (rang, element, header_key)}}, getrennt nach normalen Headern
+    # und PEA-Headern, bei denen das Modus-Byte (Index 14) ausmaskiert ist.
+    # Der Rang erhält die Reihenfolge im Mapping, falls mehrere Header passen.
+    normal = {}
+    pea = {}
+    rang = 0
+    for element, eintrag in elemente.items():
+        for hkey, headerval in eintrag.get("header", {}).items():
+            header = to_bytes(headerval[0])
+            if element == "PEA":
+                if len(header) <= PEA_MODUS_IDX:
+                    continue
+                header = mask_pea_modus(header)
+                pea.setdefault(len(header), {}).setdefault(header, (rang, element, hkey))
+            else:
+                normal.setdefault(len(header), {}).setdefault(header, (rang, element, hkey))
+            rang += 1
+    return {"normal": normal, "pea": pea}
+
+def mask_pea_modus(header):
+    # join statt +, damit auch memoryview-Ausschnitte funktionieren
+    return b"".join((header[:PEA_MODUS_IDX], b"\x00", header[PEA_MODUS_IDX+1:]))
+
+def match_header(bitleiste):
+    # Liefert (element, header_key, pea_modus, header_laenge) oder None
+    header_index = get_compiled("header_index")
+    best = None
+    for laenge, tabelle in header_index["normal"].items():
+        if len(bitleiste) >= laenge:
+            treffer = tabelle.get(bitleiste[:laenge])
+            if treffer and (best is None or treffer[0] < best[0][0]):
+                best = (treffer, None, laenge)
+    if len(bitleiste) > PEA_MODUS_IDX and bitleiste[PEA_MODUS_IDX] in PEA_MODI:
+        for laenge, tabelle in header_index["pea"].items():
+            if len(bitleiste) >= laenge:
+                treffer = tabelle.get(mask_pea_modus(bitleiste[:laenge]))
+                if treffer and (best is None or treffer[0] < best[0][0]):
+                    best = (treffer, PEA_MODI[bitleiste[PEA_MODUS_IDX]], laenge)
+    if best is None:
+        return None
+    (_, element, hkey), pea_modus, laenge = best
+    return element, hkey, pea_modus, laenge
+
+def build_frame_index(elemente):
+    # Telegrammlängen zum Zerlegen von Byteströmen: Header + Meldungs-Nutzdaten je Element
+    # (Obergrenze, alle Parameter in voller Länge), bei SILS die festen Header-Teile
+    # (Sender ohne Sender-/Störungsbyte, Empfänger)
+    nutzdaten = {}
+    erste_bytes = set()
+    max_header = 0
+    header_liste = []  # (header, pea) mit ausmaskiertem Modus-Byte bei PEA
+    for element, eintrag in elemente.items():
+        if element == "SILS":
+            continue
+        for headerval in eintrag.get("header", {}).values():
+            header = to_bytes(headerval[0])
+            erste_bytes.add(header[0])
+            max_header = max(max_header, len(header))
+            pea = element == "PEA" and len(header) > PEA_MODUS_IDX
+            header_liste.append((mask_pea_modus(header) if pea else header, pea))
+        if "Meldung" in eintrag:
+            nutzdaten[element] = sum(
+                max(compile_param_index(val_map)[0])
+                for tg_map in eintrag["Meldung"]["telegramme"].values()
+                for val_map in tg_map.values()
+            )
+    sils = None
+    sils_header = elemente.get("SILS", {}).get("Meldung", {}).get("header")
+    if sils_header:
+        sender = to_bytes(sils_header["Sender"][0])
+        empfaenger = to_bytes(sils_header["Empfänger"][0])
+        kopf = len(sender) + 4 + len(empfaenger)  # 4 Zeichen Name dazwischen
+        nutz = len(elemente["SILS"]["byteorder"])
+        sils = {
+            "sender": sender,
+            "empfaenger": empfaenger,
+            "empf_start": len(sender) + 4,
+            "kopf": kopf,
+            "laenge": kopf + nutz + len(to_bytes(sils_header["DB"][0])),
+            "laenge_stoerung": kopf + nutz,  # Störungsmeldungen ohne DB-Teil
+        }
+    # Mögliche Telegrammanfänge für frame_ende: die ersten drei Bytes eines Headers bzw. beim
+    # SILS-Kopf ein beliebiges Sender-Byte und danach die festen Bytes 1..2 (mit 30H an Index 2)
+    anfaenge = {header[:3] for header, _ in header_liste}
+    muster = [re.escape(anfang) for anfang in sorted(anfaenge)]
+    if sils:
+        muster.append(b"(?=." + re.escape(sils["sender"][1:3]) + b")")
+    anfang_re = re.compile(b"|".join(muster) or b"(?!)", re.DOTALL)
+    return {"nutzdaten": nutzdaten, "erste_bytes": frozenset(erste_bytes), "max_header": max_header,
+            "header": header_liste, "sils": sils, "anfang_re": anfang_re}
+
+def match_frame(data, pos=0):
+    """
+    Höchstlänge des Telegramms, das bei data[pos] beginnt (bekannter Header oder
+    SILS-Kennung 30H an Index 2), sonst None. Die Länge kann über das Ende von data
+    hinausreichen, wenn das Telegramm abgeschnitten ist. Wo es wirklich endet,
+    bestimmt frame_ende.
+    """
+    frames = get_compiled("frame_index")
+    sils = frames["sils"]
+    if sils and pos + 2 < len(data) and data[pos+2] == 0x30:
+        sender = sils["sender"]
+        kopf = data[pos:pos+sils["kopf"]]
+        if (len(kopf) == sils["kopf"] and kopf[1:3] == sender[1:3] and kopf[4:len(sender)] == sender[4:]
+                and kopf[sils["empf_start"]:] == sils["empfaenger"]):
+            return sils["laenge"] if kopf[3] == sender[3] else sils["laenge_stoerung"]
+    if pos < len(data) and data[pos] in frames["erste_bytes"]:
+        treffer = match_header(data[pos:pos+frames["max_header"]])
+        if treffer:
+            element, _, _, header_len = treffer
+            return header_len + frames["nutzdaten"].get(element, 0)
+    return None
+
+def frame_ende(data, pos, laenge, offen=False):
+    """
+    Ende des Telegramms, das bei data[pos] mit Höchstlänge laenge beginnt. Telegramme
+    ohne alle Parameter (z.B. von encode_main mit ausgelassenen Telegrammen) sind
+    kürzer: beginnt vor pos+laenge schon das nächste Telegramm (Header oder SILS-Anfang),
+    endet es dort. Mit offen=True können am Ende von data noch Bytes fehlen; dann
+    None, solange erst weitere Bytes zeigen, ob vor pos+laenge ein Telegramm beginnt.
+    """
+    frames = get_compiled("frame_index")
+    bis = min(pos + laenge, len(data))
+    ende = pos + laenge
+    # Kandidaten (erstes Header-Byte oder 30H zwei Bytes weiter) per Regex suchen, nur diese prüfen
+    q = pos + 1
+    while q < bis:
+        kandidat = frames["anfang_re"].search(data, q, min(bis + 2, len(data)))
+        if kandidat is None or kandidat.start() >= bis:
+            break
+        q = kandidat.start()
+        if match_frame(data, q) is not None:
+            ende = q
+            break
+        q += 1
+    if offen:
+        # Ab hier reichen die Bytes nicht mehr, um einen Header/SILS-Kopf ganz zu prüfen
+        unsicher_ab = len(data) - max(frames["max_header"], frames["sils"]["kopf"] if frames["sils"] else 3)
+        for q in range(max(pos + 1, unsicher_ab), min(ende, bis)):
+            if _anfang_moeglich(data, q, frames):
+                return None
+    return ende
+
+def frame_status(data, pos=0):
+    """
+    Wie match_frame, aber für Puffer, an deren Ende noch Daten fehlen können:
+    Länge bei erkanntem Telegrammanfang (nach frame_ende), 0 wenn die vorhandenen Bytes
+    noch nicht reichen, um Anfang oder Ende zu bestimmen (mehr Daten abwarten), sonst None.
+    """
+    laenge = match_frame(data, pos)
+    if laenge is not None:
+        ende = frame_ende(data, pos, laenge, offen=True)
+        return 0 if ende is None else ende - pos
+    return 0 if _anfang_moeglich(data, pos, get_compiled("frame_index")) else None
+
+def _anfang_moeglich(data, pos, frames):
+    # Können die Bytes ab pos (bis zum Pufferende) noch der Anfang eines Headers
+    # oder SILS-Kopfs sein, der erst mit weiteren Bytes erkannt wird?
+    rest = data[pos:]
+    sils = frames["sils"]
+    if sils and len(rest) < sils["kopf"] and _sils_prefix(rest, sils):
+        return True
+    if len(rest) < frames["max_header"] and len(rest) and rest[0] in frames["erste_bytes"]:
+        for header, pea in frames["header"]:
+            teil = rest[:len(header)]
+            if pea and len(teil) > PEA_MODUS_IDX:
+                if teil[PEA_MODUS_IDX] not in PEA_MODI:
+                    continue
+                teil = mask_pea_modus(teil)
+            if len(teil) < len(header) and header.startswith(teil):
+                return True
+    return False
+
+def _sils_prefix(rest, sils):
+    # Passen die vorhandenen Bytes zum festen Teil des SILS-Kopfs? Sender-Byte (0),
+    # Störungsart (3) und Name sind variabel.
+    sender = sils["sender"]
+    for i, b in enumerate(rest):
+        if i in (0, 3) or len(sender) <= i < sils["empf_start"]:
+            continue
+        soll = sender[i] if i < len(sender) else sils["empfaenger"][i - sils["empf_start"]]
+        if b != soll:
+            return False
+    return True
+
+def split_frames(data, start=0):
+    """
+    Zerlegt einen Bytestrom in einzelne Telegramme und liefert (offset, stueck, erkannt).
+    Ein Telegramm endet nach seiner Höchstlänge oder vorher am nächsten erkannten
+    Telegrammanfang (frame_ende). Bytes zwischen erkannten Telegrammen kommen
+    zusammengefasst mit erkannt=False. Mit start wird ab einer bekannten
+    Telegrammgrenze weitergesucht.
+    """
+    pos = start
+    rest_start = None
+    while pos < len(data):
+        laenge = match_frame(data, pos)
+        if laenge is None:
+            if rest_start is None:
+                rest_start = pos
+            pos += 1
+            continue
+        if rest_start is not None:
+            yield rest_start, data[rest_start:pos], False
+            rest_start = None
+        ende = frame_ende(data, pos, laenge)
+        yield pos, data[pos:ende], True
+        pos = ende
+    if rest_start is not None:
+        yield rest_start, data[rest_start:], False
+
+mapping_registry.register("decode_index", build_decode_index)
+mapping_registry.register("header_index", build_header_index)
+mapping_registry.register("sils_luts", build_sils_luts)
+mapping_registry.register("frame_index", build_frame_index)
 
+def lookup_param(bitleiste, idx, laengen, tabelle):
+    # Liefert (wert_hex, laenge) oder None; Aufwand unabhängig von der Anzahl Werte im Mapping
+    if len(laengen) == 1:
+        treffer = tabelle.get(bitleiste[idx:idx+laengen[0]])
+        return treffer[1:] if treffer else None
+    best = None
+    for mb_len in laengen:
+        treffer = tabelle.get(bitleiste[idx:idx+mb_len])
+        if treffer and (best is None or treffer[0] < best[0]):
+            best = treffer
+    return best[1:] if best else None
+
+def decode_telegramme(bitleiste, element, typ):
+    decoded_telegramme = {}
+    rest_idx = 0
+    for tg_name, params in get_compiled("decode_index")[(element, typ)]:
+        param_hex = {}
+        for param, laengen, tabelle in params:
+            treffer = lookup_param(bitleiste, rest_idx, laengen, tabelle)
+            if treffer:
+                param_hex[param] = treffer[0]
+                rest_idx += treffer[1]
+            else:
+                param_hex[param] = "?"
+        decoded_telegramme[tg_name] = param_hex
+    return decoded_telegramme
+
+def decode_telegramme_schritte(bitleiste, element, typ, alt=(), unveraendert_bis=0):
+    """
+    Wie decode_telegramme, aber als Liste [(tg_name, param_hex, ende, gelesen_bis)] je
+    Telegramm. Telegramme aus alt, die nur Bytes vor unveraendert_bis gelesen haben,
+    werden übernommen statt neu nachgeschlagen (Live-Dekodierung beim Tippen).
+    """
+    schritte = []
+    rest_idx = 0
+    for schritt in alt:
+        if schritt[3] > unveraendert_bis:
+            break
+        schritte.append(schritt)
+        rest_idx = schritt[2]
+    for tg_name, params in get_compiled("decode_index")[(element, typ)][len(schritte):]:
+        param_hex = {}
+        gelesen_bis = rest_idx
+        for param, laengen, tabelle in params:
+            gelesen_bis = max(gelesen_bis, rest_idx + max(laengen, default=0))
+            treffer = lookup_param(bitleiste, rest_idx, laengen, tabelle)
+            if treffer:
+                param_hex[param] = treffer[0]
+                rest_idx += treffer[1]
+            else:
+                param_hex[param] = "?"
+        schritte.append((tg_name, param_hex, rest_idx, gelesen_bis))
+    return schritte
+
+# Von instrument gesetzt: messung(feld, sekunden) je SILS-Feld, sonst None
+_feld_messung = None
+
+def decode_sils_felder(sils_bytes, errors):
+    # Die 9 Nutzdatenbytes über die 256er-Tabellen je Feld nachschlagen
+    order = get_mapping()["SILS"]["byteorder"]
+    sils_luts = get_compiled("sils_luts")
+    decoded = {}
+    messung = _feld_messung
+
+    for i, name in enumerate(order):
+        if messung:
+            start = time.perf_counter()
+        if i >= len(sils_bytes):
+            decoded[name] = "unbekannt (nicht vorhanden)"
+            errors.append(f"Byte für Feld {name} (Index {45+i}) fehlt.")
+        else:
+            decoded[name], bekannt = sils_luts[name][sils_bytes[i]]
+            if not bekannt:
+                errors.append(f"Feld {name}: Wert {sils_bytes[i]:X}H nicht im Mapping gefunden.")
+        if messung:
+            messung(name, time.perf_counter() - start)
+    return decoded
 
 def decode_sils(bitleiste):
+    bitleiste = to_bytes(bitleiste)
     errors = []
     if len(bitleiste) < 54:
         errors.append(f"Bitleiste zu kurz, mindestens 54 Bytes erforderlich, aktuell: {len(bitleiste)}")
@@ -43,60 +468,8 @@ def decode_sils(bitleiste):
         }
     sils_bytes = bitleiste[45:54]
     if len(sils_bytes) != 9:
-        errors.append(f"Für SILS werden 9 Nutzdatenbytes (Index 45 bis 53 inkl.) benötigt, erhalten: {len(sils_bytes)} [{sils_bytes}]")
-    sils_map = alle_elemente["SILS"]["Meldung"]["telegramme"]
-    order = alle_elemente["SILS"]["byteorder"]
-    decoded = {}
-
-    for i, name in enumerate(order):
-        if i >= len(sils_bytes):
-            decoded[name] = "unbekannt (nicht vorhanden)"
-            errors.append(f"Byte für Feld {name} (Index {45+i}) fehlt.")
-            continue
-
-        value = sils_bytes[i].upper()
-        value_norm = normalize_hex(value)
-        found = False
-
-        # --- Speziallogik ZS2, ZS2V (Buchstabe A-Z) ---
-        if name in ("ZS2", "ZS2V"):
-            try:
-                val_int = int(value_norm[:-1], 16)  # "01H" -> 1, "1AH" -> 26
-            except Exception as ex:
-                errors.append(f"ZS2/ZS2V [{name}] kann nicht als Hex erkannt werden: {value}")
-                val_int = None
-            if val_int is not None and 1 <= val_int <= 26:
-                decoded[name] = f"Kennbuchstabe {chr(64+val_int)}"
-                found = True
-
-        # --- Speziallogik Fahrweginformation (1..253) ---
-        elif name == "Fahrweginformation":
-            try:
-                val_int = int(value_norm[:-1], 16)
-            except Exception:
-                val_int = None
-            if val_int is not None and 1 <= val_int <= 253:
-                decoded[name] = f"Fahrweginformation {val_int}"
-                found = True
-
-        # --- Normales Mapping falls oben nicht zutreffend
-        if not found:
-            param_map = sils_map.get(name, {})
-            for param, hex_arr in param_map.items():
-                for h in hex_arr:
-                    h_norm = normalize_hex(h.upper())
-                    if value_norm == h_norm:
-                        param_anzeigen = [k for k in param_map.keys() if normalize_label(k) == normalize_label(param)]
-                        decoded[name] = param_anzeigen[0] if param_anzeigen else param
-                        found = True
-                        break
-                if found:
-                    break
-
-        if not found:
-            decoded[name] = f"unbekannt ({value_norm})"
-            errors.append(f"Feld {name}: Wert {value_norm} nicht im Mapping gefunden.")
-
+        errors.append(f"Für SILS werden 9 Nutzdatenbytes (Index 45 bis 53 inkl.) benötigt, erhalten: {len(sils_bytes)} [{' '.join(format_bytes(sils_bytes))}]")
+    decoded = decode_sils_felder(sils_bytes, errors)
     result = {
         "Element": "SILS",
         "Telegramme": {"SILS": decoded}
@@ -107,84 +480,23 @@ def decode_sils(bitleiste):
 
 def decode_other(bitleiste, typ=None, element_for_param=None):
     # Das ist exakt dein alter Main-Decoder für BLLE, ALE, PEA!
+    bitleiste = to_bytes(bitleiste)
     if typ and element_for_param:
-        telegramm_infos = alle_elemente[element_for_param][typ]["telegramme"]
-        decoded_telegramme = {}
-        rest_idx = 0
-        for tg_name, tg_map in telegramm_infos.items():
-            params = list(tg_map.keys())
-            param_hex = {}
-            for param in params:
-                found = False
-                for val_dez, mapping_byte_seq in tg_map[param].items():
-                    mb_len = len(mapping_byte_seq)
-                    check_slice = bitleiste[rest_idx:rest_idx+mb_len]
-                    if check_slice == mapping_byte_seq:
-                        param_hex[param] = hex_str(val_dez)
-                        rest_idx += mb_len
-                        found = True
-                        break
-                if not found:
-                    param_hex[param] = "?"
-            decoded_telegramm = param_hex
-            decoded_telegramme[tg_name] = decoded_telegramm
+        decoded_telegramme = decode_telegramme(bitleiste, element_for_param, typ)
         return {
             "Element": element_for_param,
             "Typ": typ,
             "Telegramme": decoded_telegramme
         }
     else:
-        # Mit Header: prüfe wie gehabt!
-        element = None
-        found_header_len = 0
-        pea_modus = None
-        for key, eintrag in alle_elemente.items():
-            header_dict = eintrag["header"]
-            for hkey, headerval in header_dict.items():
-                header_str = headerval[0]
-                header = header_str.split()
-                if key == "PEA":
-                    pea_idx = 14
-                    if len(bitleiste) >= len(header):
-                        if (bitleiste[:pea_idx] == header[:pea_idx] and
-                            len(header) > pea_idx and
-                            bitleiste[pea_idx+1:len(header)] == header[pea_idx+1:] and
-                            bitleiste[pea_idx] in {"47H", "52H"}):
-                            element = key
-                            found_header_len = len(header)
-                            pea_modus = "Geschwindigkeit" if bitleiste[pea_idx] == "47H" else "Richtung"
-                            break
-                else:
-                    if bitleiste[:len(header)] == header:
-                        element = key
-                        found_header_len = len(header)
-                        break
-            if element:
-                break
-        if not element:
+        # Mit Header: Element, Header und PEA-Modus über den Header-Index bestimmen
+        treffer = match_header(bitleiste)
+        if not treffer:
             return {"Element": None, "Fehler": "Kein passendes Element gefunden!"}
+        element, _, pea_modus, found_header_len = treffer
         rest_bytes = bitleiste[found_header_len:]
         typ = "Meldung"
-        telegramm_infos = alle_elemente[element][typ]["telegramme"]
-        decoded_telegramme = {}
-        rest_idx = 0
-        for tg_name, tg_map in telegramm_infos.items():
-            params = list(tg_map.keys())
-            param_hex = {}
-            for param in params:
-                found = False
-                for val_dez, mapping_byte_seq in tg_map[param].items():
-                    mb_len = len(mapping_byte_seq)
-                    check_slice = rest_bytes[rest_idx:rest_idx+mb_len]
-                    if check_slice == mapping_byte_seq:
-                        param_hex[param] = hex_str(val_dez)
-                        rest_idx += mb_len
-                        found = True
-                        break
-                if not found:
-                    param_hex[param] = "?"
-            decoded_telegramm = param_hex
-            decoded_telegramme[tg_name] = decoded_telegramm
+        decoded_telegramme = decode_telegramme(rest_bytes, element, typ)
         return {
             "Element": element,
             "Modus": pea_modus,
@@ -195,8 +507,9 @@ def decode_main(bitleiste, typ=None, element_for_param=None):
     """
     Entscheide automatisch anhand drittem Byte (Index 2), ob SILS oder eines der drei anderen Elemente!
     """
-    # bitleiste kann z.B. ["05H", "00H", "30H", ...] sein!
-    if len(bitleiste) > 2 and bitleiste[2].upper() == "30H":
+    # bitleiste kann z.B. ["05H", "00H", "30H", ...] oder direkt bytes sein!
+    bitleiste = to_bytes(bitleiste)
+    if len(bitleiste) > 2 and bitleiste[2] == 0x30:
         # Es handelt sich um ein SILS-Element
         return decode_sils(bitleiste)
     else:
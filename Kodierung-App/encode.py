@@ -1,7 +1,9 @@
-import os
-import json
 import re
-from decode import parse_input_hex
+from functools import partial
+
+import mapping_registry
+from mapping_registry import get_mapping, get_compiled
+from decode import parse_input_hex, to_bytes, format_bytes
 
 def format_hex_value(h, hex_format):
     num = parse_input_hex(h)
@@ -21,7 +23,6 @@ def parse_eingabe(eingabe, param_liste):
             parameter, wert = match.groups()
             if parameter not in param_liste:
                 continue
-            from decode import parse_input_hex
             try:
                 wert_dec = str(parse_input_hex(wert))
             except Exception:
@@ -30,173 +31,235 @@ def parse_eingabe(eingabe, param_liste):
     return param_wert
 
 def mapping_bytes(telegramm_map, param_wert):
-    byte_list = []
+    # telegramm_map: {param: {val_dez: bytes}} aus encode_index
+    byte_list = bytearray()
     for parameter, wert in param_wert.items():
         try:
-            byte_list.extend(telegramm_map[parameter][wert])
+            byte_list += telegramm_map[parameter][wert]
         except KeyError:
             pass
     return byte_list
 
-script_dir = os.path.dirname(os.path.abspath(__file__))
-mapping_path = os.path.join(script_dir, "mapping.json")
-with open(mapping_path, "r", encoding="utf-8") as f:
-    alle_elemente = json.load(f)
+def __getattr__(name):
+    # Kompatibilität: encode.alle_elemente liefert das aktuelle Mapping aus der Registry
+    if name == "alle_elemente":
+        return get_mapping()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def build_encode_index(elemente):
+    # {(element, typ): {tg_name: {param: {val_dez: bytes}}}} und Header als bytes
+    telegramme = {}
+    header = {}
+    for element, eintrag in elemente.items():
+        if element == "SILS":
+            continue
+        header[element] = {hkey: to_bytes(hval[0]) for hkey, hval in eintrag["header"].items()}
+        for typ, typ_eintrag in eintrag.items():
+            if not isinstance(typ_eintrag, dict) or "telegramme" not in typ_eintrag:
+                continue
+            telegramme[(element, typ)] = {
+                tg_name: {param: {val: to_bytes(seq) for val, seq in val_map.items()} for param, val_map in tg_map.items()}
+                for tg_name, tg_map in typ_eintrag["telegramme"].items()
+            }
+    sils_header = {name: to_bytes(hval[0]) for name, hval in elemente["SILS"]["Meldung"]["header"].items()}
+    return {"telegramme": telegramme, "header": header, "sils_header": sils_header}
+
+mapping_registry.register("encode_index", build_encode_index)
 
 def normalize_for_match(s):
     return re.sub(r"\s*([+])\s*", "+", s.strip().lower()).replace(" ", "")
-    
+
+# --- Vorkompilierte SILS-Feld-Encoder: jedes Feld bildet eine (bereits gestrippte) Eingabe auf ein Byte ab
+
+_kennbuchstabe_pattern = re.compile(r"(kennbuchstabe|kb)\s*([A-Za-z])", re.IGNORECASE)
+_fahrweg_pattern = re.compile(r"(fahrweg\s*information|fwinfo)\s*(\d+)", re.IGNORECASE)
+# Direkte Umrechnung: 10 Km/h → 01H, 20 → 02H, ... 150 → 0FH
+_zs3_werte = {str(kmh): kmh // 10 for kmh in range(10, 151, 10)}
+
+def encode_zs2(user_input):
+    # Kennbuchstaben A-Z → 01H..1AH, alles andere (auch "Aus") → FFH
+    match = _kennbuchstabe_pattern.match(user_input)
+    if match:
+        wert = ord(match.group(2).upper()) - 64
+        if 1 <= wert <= 26:
+            return wert
+    return 0xFF
+
+def encode_zs3(user_input):
+    wert = _zs3_werte.get(user_input)
+    if wert is not None:
+        return wert
+    if not user_input.isdigit():
+        return 0xFF
+    try:
+        val10 = int(user_input)
+    except ValueError:
+        return 0xFF
+    if 10 <= val10 <= 150 and val10 % 10 == 0:
+        return val10 // 10
+    return 0xFF
+
+def encode_fahrweginformation(user_input):
+    normalized_input = " ".join(user_input.split()).lower()
+    if normalized_input == "keine information":
+        return 0x00
+    if normalized_input == "aus":
+        return 0xFF
+    # Berücksichtigt verschiedene Schreibweisen
+    match = _fahrweg_pattern.match(user_input)
+    if match:
+        nummer = int(match.group(2))
+        if 1 <= nummer <= 253:
+            return nummer
+    return 0xFF
+
+def encode_mapping_feld(exakt, normalisiert, user_input):
+    # Erst die exakte Schreibweise, nur sonst normalisieren
+    wert = exakt.get(user_input)
+    if wert is None:
+        wert = normalisiert.get(normalize_for_match(user_input), 0xFF)
+    return wert
+
+_sils_sonder_encoder = {
+    "ZS2": encode_zs2,
+    "ZS2V": encode_zs2,
+    "ZS3": encode_zs3,
+    "ZS3V": encode_zs3,
+    "Fahrweginformation": encode_fahrweginformation,
+}
+
+def build_sils_encoders(elemente):
+    # [(feld, encoder)] in Byte-Reihenfolge; encoder sind modulweite Funktionen bzw.
+    # partials darauf, damit die Struktur picklebar bleibt
+    sils_map = elemente["SILS"]["Meldung"]["telegramme"]
+    encoders = []
+    for field in elemente["SILS"]["byteorder"]:
+        if field in _sils_sonder_encoder:
+            encoders.append((field, _sils_sonder_encoder[field]))
+            continue
+        exakt = {}
+        normalisiert = {}
+        for key, hex_arr in sils_map.get(field, {}).items():
+            if not key:
+                continue
+            norm = normalize_for_match(key)
+            normalisiert.setdefault(norm, parse_input_hex(hex_arr[0]))
+            exakt[key] = normalisiert[norm]
+        encoders.append((field, partial(encode_mapping_feld, exakt, normalisiert)))
+    return encoders
+
+mapping_registry.register("sils_encoders", build_sils_encoders)
+
+def encode_sils_bytes(param_inputdict):
+    return bytes([encoder(param_inputdict.get(field, "Aus").strip()) for field, encoder in get_compiled("sils_encoders")])
+
+def encode_sils_feld(field, eingabe):
+    # Ein einzelnes SILS-Feld als ein Byte, z.B. für die Live-Vorschau
+    for name, encoder in get_compiled("sils_encoders"):
+        if name == field:
+            return bytes([encoder(eingabe.strip())])
+    raise ValueError(f"Ungültiges Feld: {field}")
+
+def sils_eingabe_bekannt(field, eingabe):
+    # Kennt der Encoder die Eingabe? Unbekannte Texte würden sonst still als FFH ("Aus") kodiert
+    eingabe = eingabe.strip()
+    if normalize_for_match(eingabe) == "aus":
+        return True
+    if field in _sils_sonder_encoder:
+        return _sils_sonder_encoder[field](eingabe) != 0xFF
+    for name, encoder in get_compiled("sils_encoders"):
+        if name == field:
+            exakt, normalisiert = encoder.args
+            return eingabe in exakt or normalize_for_match(eingabe) in normalisiert
+    raise ValueError(f"Ungültiges Feld: {field}")
+
 def encode_sils(param_inputdict, hex_format):
-    sils_map = alle_elemente["SILS"]["Meldung"]["telegramme"]
-    byteorder = alle_elemente["SILS"]["byteorder"]
-    hex_bytes = []    
-    for idx, field in enumerate(byteorder):
-        try:
-            user_input = param_inputdict.get(field, "Aus").strip()
-        
-            # Normalisierung der Eingabe
-            normalized_input = re.sub(r'\s+', ' ', user_input).strip().lower()
-            
-            # Spezialbehandlung für ZS2/ZS2V (Kennbuchstaben)
-            if field in ["ZS2", "ZS2V"]:
-                if normalized_input == "aus":
-                    hex_val = "FFH"
-                else:
-                    # Flexibles Pattern für verschiedene Schreibweisen
-                    match = re.match(
-                        r"(kennbuchstabe|kb)\s*([A-Za-z])", 
-                        user_input, 
-                        re.IGNORECASE
-                    )
-                    if match:
-                        buchstabe = match.group(2).upper()
-                        hex_val = f"{ord(buchstabe) - 64:02X}H"
-                    else:
-                        hex_val = "FFH"
-            
-            # Spezialbehandlung Fahrweginformation
-            elif field == "Fahrweginformation":
-                if normalized_input == "keine information":
-                    hex_val = "00H"
-                elif normalized_input == "aus":
-                    hex_val = "FFH"
-                else:
-                    # Berücksichtigt verschiedene Schreibweisen
-                    match = re.match(
-                        r"(fahrweg\s*information|fwinfo)\s*(\d+)", 
-                        user_input, 
-                        re.IGNORECASE
-                    )
-                    if match:
-                        nummer = int(match.group(2))
-                        if 1 <= nummer <= 253:
-                            hex_val = f"{nummer:02X}H"
-                        else:
-                            hex_val = "FFH"
-                    else:
-                        hex_val = "FFH"
-            elif field in ["ZS3", "ZS3V"]:
-                # Direkte Umrechnung: 10 Km/h → 01H, 20 → 02H, ... 150 → 0FH
-                if user_input.lower() == "aus" or not user_input.isdigit():
-                    hex_val = "FFH"
-                else:
-                    val10 = int(user_input)
-                    if 10 <= val10 <= 150 and val10 % 10 == 0:
-                        hex_val = f"{val10 // 10:02X}H"
-                    else:
-                        hex_val = "FFH"
-            # Normales Mapping für andere Felder
-            else:
-                field_vals = sils_map.get(field, {})
-                matched_key = next(
-                    (key for key in field_vals 
-                    if normalize_for_match(key) == normalize_for_match(user_input)), 
-                    None
-                )
-                if matched_key:
-                    hex_val = field_vals[matched_key][0]
-                else:
-                    hex_val = "FFH"
-            
-            hex_bytes.append(hex_val)
-            
-        except Exception as e:
-            raise
-    return [format_hex_value(h, hex_format) for h in hex_bytes]
+    return format_bytes(encode_sils_bytes(param_inputdict), hex_format)
+
+def encode_telegramm_bytes(tgram_mapping, eingabe):
+    # Ein Telegramm aus Feldern ({param: hex}) oder einer Eingabezeile ("X0=0A X1=0B")
+    if isinstance(eingabe, dict):
+        param_wert = {}
+        for key, val in eingabe.items():
+            if key in tgram_mapping:
+                try:
+                    param_wert[key] = str(parse_input_hex(val))
+                except Exception:
+                    pass
+    else:
+        param_wert = parse_eingabe(eingabe, tgram_mapping)
+    if not param_wert:
+        return b""
+    return bytes(mapping_bytes(tgram_mapping, param_wert))
+
+def encode_segmente(element, typ, pea_modus, param_inputdict, only_param=False, header_key="05"):
+    """
+    Kodierung als Liste [(name, bytes)] in Telegramm-Reihenfolge: "header" und je
+    Telegramm bzw. bei SILS je Feld ein Eintrag. Aneinandergehängt ergibt sich
+    encode_bytes(); die Live-Vorschau ersetzt damit nur das geänderte Stück.
+    """
+    alle_elemente = get_mapping()
+    encode_index = get_compiled("encode_index")
+    if element == "SILS":
+        if typ != "Meldung":
+            raise ValueError("SILS unterstützt nur Meldungen!")
+        allowed_fields = alle_elemente["SILS"]["byteorder"]
+        for field in param_inputdict:
+            if field not in allowed_fields:
+                raise ValueError(f"Ungültiges Feld: {field}")
+        sils_bytes = encode_sils_bytes(param_inputdict)
+        return [(field, sils_bytes[i:i+1]) for i, field in enumerate(allowed_fields)]
+
+    if element not in alle_elemente:
+        raise ValueError(f"Element '{element}' nicht im Mapping!")
+    if typ not in alle_elemente[element]:
+        raise ValueError(f"Typ '{typ}' nicht in Element '{element}'!")
+
+    tgrams = encode_index["telegramme"][(element, typ)]
+    header_needed = (typ == "Meldung") and not only_param
+
+    if header_needed:
+        header_dict = encode_index["header"][element]
+        if header_key not in header_dict:
+            raise ValueError("Header-Auswahl ungültig!")
+        header_bytes = bytearray(header_dict[header_key])
+        if element == "PEA" and pea_modus in {"G", "R"}:
+            pea_idx = 14
+            if len(header_bytes) > pea_idx:
+                header_bytes[pea_idx] = 0x47 if pea_modus == "G" else 0x52
+    else:
+        header_bytes = b""
+
+    segmente = [("header", bytes(header_bytes))]
+    for tgram_name, tgram_mapping in tgrams.items():
+        eingabe = param_inputdict.get(tgram_name)
+        segmente.append((tgram_name, encode_telegramm_bytes(tgram_mapping, eingabe) if eingabe else b""))
+    return segmente
+
+def encode_bytes(element, typ, pea_modus, param_inputdict, only_param=False, header_key="05"):
+    segmente = encode_segmente(element, typ, pea_modus, param_inputdict, only_param=only_param, header_key=header_key)
+    return b"".join(seg for _, seg in segmente)
 
 def encode_main(element, typ, pea_modus, param_inputdict, only_param=False, header_key="05", hex_format="NNH"):
-    try:        
-        if element == "SILS":
-            if typ != "Meldung":
-                raise ValueError("SILS unterstützt nur Meldungen!")
-            allowed_fields = alle_elemente["SILS"]["byteorder"]
-            for field in param_inputdict:
-                if field not in allowed_fields:
-                    raise ValueError(f"Ungültiges Feld: {field}")
-            
-            return encode_sils(param_inputdict, hex_format)
-        
-        if element not in alle_elemente:
-            raise ValueError(f"Element '{element}' nicht im Mapping!")
-        if typ not in alle_elemente[element]:
-            raise ValueError(f"Typ '{typ}' nicht in Element '{element}'!")
-        
-        tgrams = alle_elemente[element][typ]["telegramme"]
-        header_needed = (typ == "Meldung") and not only_param
-        
-        if header_needed:
-            header_dict = alle_elemente[element]["header"]
-            if header_key not in header_dict:
-                raise ValueError("Header-Auswahl ungültig!")
-            header_str = header_dict[header_key][0]
-            header = header_str.split()
-            if element == "PEA" and pea_modus in {"G", "R"}:
-                pea_idx = 14
-                if len(header) > pea_idx:
-                    header[pea_idx] = "47H" if pea_modus == "G" else "52H"
-            gesamt_bytes = header.copy()
-        else:
-            gesamt_bytes = []
-        
-        for tgram_name, tgram_mapping in tgrams.items():
-            param_liste = list(tgram_mapping.keys())
-            param_wert = {}
-            if tgram_name in param_inputdict:
-                if isinstance(param_inputdict[tgram_name], dict):
-                    for key, val in param_inputdict[tgram_name].items():
-                        if key in param_liste:
-                            try:
-                                param_wert[key] = str(parse_input_hex(val))
-                            except Exception:
-                                pass
-                else:
-                    param_wert = parse_eingabe(param_inputdict[tgram_name], param_liste)
-            if not param_wert:
-                continue
-            tgram_bytes = mapping_bytes(tgram_mapping, param_wert)
-            gesamt_bytes.extend(tgram_bytes)
-        
-        return [format_hex_value(h, hex_format) for h in gesamt_bytes] 
-    
-    except Exception as e:
-        raise
+    return format_bytes(encode_bytes(element, typ, pea_modus, param_inputdict, only_param=only_param, header_key=header_key), hex_format)
 
-def encode_sils_full(param_inputdict, name_4char, is_stoerung=False, stoerung_art="05", sender_byte=None, hex_format="NNH"):
-    result = []
+# Felder, die im Störungstelegramm immer "Aus" sind
+SILS_OHNE_BEI_STOERUNG = ["Abwertungsinformation", "Fahrweginformation", "Signalbild dunkel"]
+
+def encode_sils_full_segmente(param_inputdict, name_4char, is_stoerung=False, stoerung_art="05", sender_byte=None):
+    # Wie encode_segmente für das Gesamt-SILS-Telegramm: Sender, Name, Empfänger, je Feld, DB
+    alle_elemente = get_mapping()
+    sils_header = get_compiled("encode_index")["sils_header"]
+    segmente = []
 
     # Sender
+    sender_bytes = bytearray(sils_header["Sender"])
     if sender_byte is not None:
         # Ersetze das erste Byte durch die Auswahl (z.B. "01")
-        sender_bytes = alle_elemente["SILS"]["Meldung"]["header"]["Sender"][0].split()
-        sender_bytes[0] = f"{sender_byte}H"
-        if is_stoerung and stoerung_art:
-            sender_bytes[3] = f"{stoerung_art}H"
-        result.extend(sender_bytes)
-    else:
-        sender_bytes = alle_elemente["SILS"]["Meldung"]["header"]["Sender"][0].split()
-        if is_stoerung and stoerung_art:
-            sender_bytes[3] = f"{stoerung_art}H"
-        result.extend(sender_bytes)
+        sender_bytes[0] = int(sender_byte, 16)
+    if is_stoerung and stoerung_art:
+        sender_bytes[3] = int(stoerung_art, 16)
+    segmente.append(("Sender", bytes(sender_bytes)))
 
     # Name (4 Zeichen als ASCII-Hex)
     name = name_4char.strip()
@@ -204,30 +267,39 @@ def encode_sils_full(param_inputdict, name_4char, is_stoerung=False, stoerung_ar
         name = name.ljust(4, "_")
     elif len(name) > 4:
         name = name[:4]
-    name_bytes = [f"{ord(c):02X}H" for c in name]
-    result.extend(name_bytes)
+    try:
+        segmente.append(("Name", name.encode("latin-1")))
+    except UnicodeEncodeError:
+        raise ValueError(f"Name '{name}' enthält Zeichen, die nicht in ein Byte passen!")
 
     # Empfänger
-    empfaenger_bytes = alle_elemente["SILS"]["Meldung"]["header"]["Empfänger"][0].split()
-    result.extend(empfaenger_bytes)
+    segmente.append(("Empfänger", bytes(sils_header["Empfänger"])))
 
     # Nutzdaten korrekt erzeugen!
     if is_stoerung:
         nutzdaten_fields = [
             f for f in alle_elemente["SILS"]["byteorder"]
-            if f not in ["Abwertungsinformation", "Fahrweginformation", "Signalbild dunkel"]
+            if f not in SILS_OHNE_BEI_STOERUNG
         ]
     else:
         nutzdaten_fields = alle_elemente["SILS"]["byteorder"]
 
     # --- KORREKT NUTZDATEN-BYTES HINZUFÜGEN ---
     nutze_input = {f: param_inputdict.get(f, "Aus") for f in nutzdaten_fields}
-    nutzdaten_bytes = encode_sils(nutze_input, hex_format)   
-    result.extend(nutzdaten_bytes)
+    nutzdaten_bytes = encode_sils_bytes(nutze_input)
+    # encode_sils_bytes liefert immer alle Felder (ausgelassene als "Aus")
+    segmente += [(f, nutzdaten_bytes[i:i+1]) for i, f in enumerate(alle_elemente["SILS"]["byteorder"])]
 
     # DB-Teil nur bei NICHT-Störung
     if not is_stoerung:
-        db_bytes = alle_elemente["SILS"]["Meldung"]["header"]["DB"][0].split()
-        result.extend(db_bytes)
+        segmente.append(("DB", bytes(sils_header["DB"])))
+
+    return segmente
 
-    return [format_hex_value(h, hex_format) for h in result]
\ No newline at end of file
+def encode_sils_full_bytes(param_inputdict, name_4char, is_stoerung=False, stoerung_art="05", sender_byte=None):
+    segmente = encode_sils_full_segmente(param_inputdict, name_4char, is_stoerung=is_stoerung,
+                                         stoerung_art=stoerung_art, sender_byte=sender_byte)
+    return b"".join(seg for _, seg in segmente)
+
+def encode_sils_full(param_inputdict, name_4char, is_stoerung=False, stoerung_art="05", sender_byte=None, hex_format="NNH"):
+    return format_bytes(encode_sils_full_bytes(param_inputdict, name_4char, is_stoerung=is_stoerung, stoerung_art=stoerung_art, sender_byte=sender_byte), hex_format)
@@ -0,0 +1,182 @@
+"""
+Optionale Laufzeitmessung der einzelnen Stufen von Encode/Decode.
+
+Ausgeschaltet kostet die Messung nichts: enable() ersetzt die Stufenfunktionen
+durch gemessene Varianten, und zwar überall, wo sie in den Modulen der App
+stehen (auch nach "from decode import to_bytes" in GUI, codec_cache, livedecode
+usw.); disable() stellt die Originale wieder her. Die SILS-Felder werden beim
+Dekodieren zusätzlich einzeln gemessen (Stufen "sils_feld:Hauptbegriff", ...).
+Je Stufe werden Aufrufe, Gesamtzeit und ein Histogramm der Einzelzeiten gesammelt.
+
+    import instrument
+    instrument.enable()
+    ...  # Batch laufen lassen
+    print(instrument.to_json())           # oder instrument.to_prometheus()
+
+Gemessen wird inklusive aufgerufener Stufen (format_bytes steckt z.B. in keiner
+anderen Stufe, header_match aber im Gesamt-Decode).
+"""
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+import decode
+import encode
+
+# Stufe -> Funktionen (Modul, Name), die dafür ersetzt werden
+STAGES = {
+    "to_bytes": [(decode, "to_bytes")],
+    "header_match": [(decode, "match_header")],
+    "decode_telegramme": [(decode, "decode_telegramme"), (decode, "decode_telegramme_schritte")],
+    "sils_felder": [(decode, "decode_sils_felder")],
+    "parse_eingabe": [(encode, "parse_eingabe")],
+    "mapping_bytes": [(encode, "mapping_bytes")],
+    "sils_encode": [(encode, "encode_sils_bytes")],
+    "format_bytes": [(decode, "format_bytes")],
+}
+# Präfix der Stufen je SILS-Feld (decode_sils_felder meldet sie über decode._feld_messung)
+SILS_FELD_STAGE = "sils_feld:"
+
+_app_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Obergrenzen der Histogramm-Klassen in Mikrosekunden, darüber +Inf
+BUCKETS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, 20000)
+
+_lock = threading.Lock()
+_stats = {}
+_originale = {}
+
+def _neue_stat():
+    return {"count": 0, "seconds": 0.0, "buckets": [0] * (len(BUCKETS_US) + 1)}
+
+def record(stage, sekunden):
+    us = sekunden * 1e6
+    with _lock:
+        stat = _stats.get(stage)
+        if stat is None:
+            stat = _stats[stage] = _neue_stat()
+        stat["count"] += 1
+        stat["seconds"] += sekunden
+        stat["buckets"][bisect_left(BUCKETS_US, us)] += 1
+
+def _gemessen(stage, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(stage, time.perf_counter() - start)
+    wrapper.__wrapped_stage__ = stage
+    return wrapper
+
+@contextmanager
+def timed(stage):
+    # Für eigene Stufen, z.B. with timed("batch_schreiben"): ...
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+def _app_module():
+    # Geladene Module aus dem Verzeichnis der App (nicht die Standardbibliothek)
+    for modul in list(sys.modules.values()):
+        datei = getattr(modul, "__file__", None)
+        if datei and datei.endswith(".py") and os.path.dirname(os.path.abspath(datei)) == _app_dir:
+            yield modul
+
+def _ersetzen(alt, neu):
+    # Jede Referenz auf alt in den App-Modulen durch neu ersetzen
+    for modul in _app_module():
+        for name, wert in list(vars(modul).items()):
+            if wert is alt:
+                setattr(modul, name, neu)
+
+def _sils_feld_messung(feld, sekunden):
+    record(SILS_FELD_STAGE + feld, sekunden)
+
+def enable(stages=None):
+    with _lock:
+        stages = list(stages or STAGES)
+        for stage in stages:
+            for modul, name in STAGES[stage]:
+                if (modul, name) in _originale:
+                    continue
+                func = getattr(modul, name)
+                _originale[(modul, name)] = func
+                _ersetzen(func, _gemessen(stage, func))
+        if "sils_felder" in stages:
+            decode._feld_messung = _sils_feld_messung
+
+def disable():
+    with _lock:
+        for func in _originale.values():
+            # Auch Module, die erst nach enable() importiert wurden, haben die gemessene Variante
+            for modul in _app_module():
+                for name, wert in list(vars(modul).items()):
+                    if getattr(wert, "__wrapped__", None) is func and hasattr(wert, "__wrapped_stage__"):
+                        setattr(modul, name, func)
+        _originale.clear()
+        decode._feld_messung = None
+
+def is_enabled():
+    return bool(_originale)
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+def snapshot():
+    # {stufe: {"count", "seconds", "buckets"}} als Kopie
+    with _lock:
+        return {stage: {**stat, "buckets": list(stat["buckets"])} for stage, stat in _stats.items()}
+
+def merge(stats):
+    # Ergebnisse anderer Prozesse (snapshot() aus einem Worker) dazuzählen
+    with _lock:
+        for stage, fremd in stats.items():
+            stat = _stats.get(stage)
+            if stat is None:
+                stat = _stats[stage] = _neue_stat()
+            stat["count"] += fremd["count"]
+            stat["seconds"] += fremd["seconds"]
+            stat["buckets"] = [a + b for a, b in zip(stat["buckets"], fremd["buckets"])]
+
+def to_json():
+    stufen = {}
+    for stage, stat in snapshot().items():
+        grenzen = [str(b) for b in BUCKETS_US] + ["inf"]
+        stufen[stage] = {
+            "count": stat["count"],
+            "seconds": stat["seconds"],
+            "us_per_call": stat["seconds"] / stat["count"] * 1e6 if stat["count"] else 0.0,
+            "histogram_us": dict(zip(grenzen, stat["buckets"])),
+        }
+    return json.dumps({"stages": stufen, "buckets_us": list(BUCKETS_US)}, indent=2)
+
+def to_prometheus(prefix="kodierung_stage"):
+    zeilen = [
+        f"# HELP {prefix}_seconds Laufzeit je Encode/Decode-Stufe",
+        f"# TYPE {prefix}_seconds histogram",
+    ]
+    for stage, stat in sorted(snapshot().items()):
+        kumuliert = 0
+        for grenze, anzahl in zip(list(BUCKETS_US) + [None], stat["buckets"]):
+            kumuliert += anzahl
+            le = "+Inf" if grenze is None else repr(grenze / 1e6)
+            zeilen.append(f'{prefix}_seconds_bucket{{stage="{stage}",le="{le}"}} {kumuliert}')
+        zeilen.append(f'{prefix}_seconds_sum{{stage="{stage}"}} {stat["seconds"]!r}')
+        zeilen.append(f'{prefix}_seconds_count{{stage="{stage}"}} {stat["count"]}')
+    return "\n".join(zeilen) + "\n"
+
+def dump(path):
+    # .prom/.txt -> Prometheus-Textformat, sonst JSON
+    text = to_prometheus() if path.endswith((".prom", ".txt")) else to_json()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
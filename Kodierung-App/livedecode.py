@@ -0,0 +1,189 @@
+"""
+Live-Dekodierung eines Eingabefelds, das sich beim Tippen oder Einfügen laufend ändert.
+
+LiveDecoder merkt sich Zeilen, deren Bytes und die Ergebnisse der letzten
+Eingabe. Bei update(text) werden nur die Token geänderter Zeilen neu geparst und
+nur die davon betroffenen Telegramme neu dekodiert:
+
+- "Einzeln": der erkannte Header und alle Telegramme, die nur Bytes vor der
+  ersten Änderung gelesen haben, bleiben stehen
+- "Je Zeile": unveränderte Zeilen vor und nach der Änderung behalten ihr Ergebnis
+- "Header-getrennt": Telegramme vor der Änderung bleiben, danach wird neu
+  zerlegt, bis die Telegrammgrenzen wieder mit den alten übereinstimmen
+
+    live = LiveDecoder("Je Zeile")
+    for quelle, ergebnis, extra in live.update(text):
+        ...
+
+extra(ergebnis) wird je neu dekodiertem Ergebnis einmal aufgerufen (z.B. für
+die Tabellenzeile der GUI) und mit dem Ergebnis wiederverwendet.
+"""
+from codec_cache import cached_decode_main
+from decode import (decode_sils, decode_telegramme_schritte, match_header, split_frames, strip_prefix,
+                    token_wert)
+from mapping_registry import get_compiled
+
+def _gleich(alt, neu, block=4096):
+    # Länge des gemeinsamen Anfangs und des (nicht überlappenden) gemeinsamen Endes.
+    # Erst blockweise über Slices vergleichen (in C), nur im letzten Block Element für Element.
+    n = min(len(alt), len(neu))
+    anfang = 0
+    while anfang + block <= n and alt[anfang:anfang+block] == neu[anfang:anfang+block]:
+        anfang += block
+    while anfang < n and alt[anfang] == neu[anfang]:
+        anfang += 1
+    rest = n - anfang
+    la, ln = len(alt), len(neu)
+    ende = 0
+    while ende + block <= rest and alt[la-ende-block:la-ende] == neu[ln-ende-block:ln-ende]:
+        ende += block
+    while ende < rest and alt[la-1-ende] == neu[ln-1-ende]:
+        ende += 1
+    return anfang, ende
+
+def _fehler(text):
+    return {"Element": None, "Fehler": text}
+
+class LiveDecoder:
+    def __init__(self, ansicht="Einzeln", typ=None, element=None, extra=None):
+        self.ansicht = ansicht
+        self.typ = typ
+        self.element = element
+        self.extra = extra
+        self.neu_dekodiert = 0  # Telegramme, die beim letzten update() dekodiert wurden
+        self.zeilen_text = []
+        # Je Zeile: [(zeile, ergebnis, extra)] je Eingabezeile
+        self.zeilen = []
+        # Einzeln/Header-getrennt: bytes je Eingabezeile, bei ungültigem Token das Token (str)
+        self.zeilen_daten = []
+        self.gueltig = False  # letzter Stand ohne ungültige Token
+        self.laenge = 0  # Bytes im letzten gültigen Stand
+        self.kopf = None  # Einzeln: Ergebnis von match_header
+        self.schritte = []  # Einzeln: aus decode_telegramme_schritte
+        self.frames = []  # Header-getrennt: [(offset, ende, erkannt, ergebnis, extra)]
+
+    def optionen(self):
+        return self.ansicht, self.typ, self.element
+
+    def update(self, text):
+        # Liefert [(quelle, ergebnis, extra)] für den neuen Stand des Eingabefelds
+        self.neu_dekodiert = 0
+        zeilen = text.splitlines()
+        anfang, ende = _gleich(self.zeilen_text, zeilen)
+        if self.ansicht == "Je Zeile":
+            return self._update_zeilen(zeilen, anfang, ende)
+        # Nur geänderte Zeilen neu in Bytes umwandeln; Token gibt es nur innerhalb von Zeilen
+        vorher = self.zeilen_daten
+        aenderung = gleiches_ende = 0
+        if self.gueltig:
+            aenderung = sum(len(d) for d in vorher[:anfang])
+            gleiches_ende = sum(len(d) for d in vorher[len(vorher) - ende:]) if ende else 0
+        vorher[anfang:len(vorher) - ende] = [self._zeile_bytes(z) for z in zeilen[anfang:len(zeilen) - ende]]
+        self.zeilen_text = zeilen
+        for nummer, daten in enumerate(vorher, 1):
+            if isinstance(daten, str):
+                self.gueltig, self.kopf, self.schritte, self.frames = False, None, [], []
+                return [("Eingabe", _fehler(f"Ungültiges Token in Zeile {nummer}: {daten}"), None)]
+        daten = b"".join(vorher)
+        verschiebung = len(daten) - self.laenge
+        self.gueltig, self.laenge = True, len(daten)
+        if self.ansicht == "Header-getrennt":
+            return self._update_frames(daten, aenderung, len(daten) - gleiches_ende, verschiebung)
+        if not daten:
+            self.kopf, self.schritte = None, []
+            return []
+        ergebnis = self._einzeln(daten, aenderung)
+        return [("Eingabe", ergebnis, self._extra(ergebnis))]
+
+    def _extra(self, ergebnis):
+        return self.extra(ergebnis) if self.extra else None
+
+    def _zeile_bytes(self, zeile):
+        # Wie to_bytes für eine Zeile; bei einem ungültigen Token dieses Token
+        if self.ansicht == "Header-getrennt":
+            zeile = strip_prefix(zeile.strip())
+        werte = bytearray()
+        for token in zeile.split():
+            try:
+                werte.append(token_wert(token))
+            except ValueError:
+                return token
+        return bytes(werte)
+
+    # --- Einzeln ---
+    def _einzeln(self, daten, aenderung):
+        # Gleiches Ergebnis wie decode_main(daten, typ, element), aber mit wiederverwendeten Teilen
+        self.neu_dekodiert = 1
+        if len(daten) > 2 and daten[2] == 0x30:
+            self.kopf, self.schritte = None, []
+            return decode_sils(daten)
+        if self.typ and self.element:
+            self.schritte = decode_telegramme_schritte(daten, self.element, self.typ, self.schritte, aenderung)
+            return {"Element": self.element, "Typ": self.typ,
+                    "Telegramme": {tg: params for tg, params, _, _ in self.schritte}}
+        # Der Header hängt nur von den ersten max_header Bytes ab
+        if self.kopf is None or aenderung < get_compiled("frame_index")["max_header"]:
+            kopf = match_header(daten)
+            if kopf != self.kopf:
+                self.schritte = []
+            self.kopf = kopf
+        if not self.kopf:
+            return _fehler("Kein passendes Element gefunden!")
+        element, _, pea_modus, header_len = self.kopf
+        self.schritte = decode_telegramme_schritte(daten[header_len:], element, "Meldung", self.schritte,
+                                                   aenderung - header_len)
+        return {"Element": element, "Modus": pea_modus,
+                "Telegramme": {tg: params for tg, params, _, _ in self.schritte}}
+
+    # --- Je Zeile ---
+    def _update_zeilen(self, zeilen, anfang, ende):
+        neu = []
+        for zeile in zeilen[anfang:len(zeilen) - ende]:
+            zeile = strip_prefix(zeile.strip())
+            if not zeile:
+                neu.append((zeile, None, None))
+                continue
+            try:
+                ergebnis = cached_decode_main(zeile, typ=self.typ, element_for_param=self.element)
+            except Exception as e:
+                ergebnis = _fehler(f"{type(e).__name__}: {e}")
+            self.neu_dekodiert += 1
+            neu.append((zeile, ergebnis, self._extra(ergebnis)))
+        self.zeilen[anfang:len(self.zeilen_text) - ende] = neu
+        self.zeilen_text = zeilen
+        return [(f"Zeile {nummer}", ergebnis, extra)
+                for nummer, (zeile, ergebnis, extra) in enumerate(self.zeilen, 1) if zeile]
+
+    # --- Header-getrennt ---
+    def _update_frames(self, daten, aenderung, gleich_ab, verschiebung):
+        # Bytes vor aenderung und ab gleich_ab (vorher um verschiebung früher) sind unverändert
+        frames_index = get_compiled("frame_index")
+        sils = frames_index["sils"]
+        # So weit schaut match_frame ab einem Telegrammanfang voraus. Das Ende eines Telegramms
+        # hängt auch vom Anfang des nächsten ab (frame_ende), also von Bytes bis ende + vorschau.
+        vorschau = max(frames_index["max_header"], sils["kopf"] if sils else 3)
+        alt = self.frames
+        behalten = 0
+        start = 0
+        for i, (offset, ende, erkannt, _, _) in enumerate(alt):
+            if ende + vorschau > aenderung:
+                break
+            if erkannt:
+                behalten, start = i + 1, ende
+        # Beginnt im gleichen Ende ein Telegramm an derselben Stelle wie vorher, ist der Rest wie vorher
+        alte_starts = {offset: i for i, (offset, _, erkannt, _, _) in enumerate(alt) if erkannt and offset >= aenderung}
+        frames = alt[:behalten]
+        for offset, stueck, erkannt in split_frames(daten, start):
+            if erkannt and offset >= gleich_ab:
+                j = alte_starts.get(offset - verschiebung)
+                if j is not None:
+                    frames += [(o + verschiebung, e + verschiebung, er, erg, ex) for o, e, er, erg, ex in alt[j:]]
+                    break
+            if erkannt:
+                ergebnis = cached_decode_main(stueck)
+            else:
+                ergebnis = _fehler(f"Nicht zugeordnet: {len(stueck)} Bytes")
+            self.neu_dekodiert += 1
+            frames.append((offset, offset + len(stueck), erkannt, ergebnis, self._extra(ergebnis)))
+        self.frames = frames
+        return [(f"Offset {offset}", ergebnis, extra) for offset, _, _, ergebnis, extra in frames]
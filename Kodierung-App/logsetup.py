@@ -0,0 +1,153 @@
+"""
+Logging ohne Schreibzugriffe im aufrufenden Thread.
+
+Die Log-Aufrufe legen nur einen Datensatz in eine Queue; ein QueueListener
+schreibt im Hintergrund als JSON-Zeilen in eine Datei mit Größenbegrenzung
+(RotatingFileHandler). Gleiche Fehler in schneller Folge (z.B. Massen-Kodierung
+mit fehlerhaften Eingaben) werden gedrosselt: je Meldung höchstens rate_limit
+Einträge pro rate_interval Sekunden, die Zahl der unterdrückten Einträge steht
+im nächsten durchgelassenen Eintrag.
+
+Die Datei liegt je Benutzer (Windows: %LOCALAPPDATA%\\Kodierung-App\\Logs,
+Linux: ~/.local/state/kodierung-app), KODIERUNG_LOG setzt einen anderen Pfad.
+
+    from logsetup import setup_logging
+    logger = setup_logging()            # einmal beim Start, Datei siehe LOG_DATEI
+    logger.error("Kodieren fehlgeschlagen", exc_info=True, extra={"daten": {...}})
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+LOGGER_NAME = "kodierung"
+
+def standard_log_verzeichnis():
+    # Log je Benutzer statt im aktuellen Arbeitsverzeichnis (dort landete es sonst im Repo)
+    if sys.platform == "win32":
+        basis = os.environ.get("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+        return os.path.join(basis, "Kodierung-App", "Logs")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Logs/Kodierung-App")
+    basis = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+    return os.path.join(basis, "kodierung-app")
+
+# KODIERUNG_LOG überschreibt den Pfad der Log-Datei
+LOG_DATEI = os.environ.get("KODIERUNG_LOG") or os.path.join(standard_log_verzeichnis(), "debug.log")
+
+# Attribute, die jeder LogRecord hat; alles andere kam über extra= und landet im JSON
+_STANDARD_ATTRIBUTE = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        eintrag = {
+            "zeit": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "meldung": record.getMessage(),
+        }
+        for key, wert in vars(record).items():
+            if key not in _STANDARD_ATTRIBUTE:
+                eintrag[key] = wert
+        if record.exc_info:
+            eintrag["traceback"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            eintrag["traceback"] = record.exc_text
+        return json.dumps(eintrag, ensure_ascii=False, default=str)
+
+class RateLimitFilter(logging.Filter):
+    # Höchstens rate_limit gleiche Meldungen (Text-Vorlage + Fehlertyp) je rate_interval Sekunden
+    def __init__(self, rate_limit=10, rate_interval=60.0):
+        super().__init__()
+        self.rate_limit = rate_limit
+        self.rate_interval = rate_interval
+        self._fenster = {}  # key -> [fensterstart, anzahl, unterdrueckt]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        exc_typ = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else None
+        key = (record.name, record.levelno, str(record.msg), exc_typ)
+        jetzt = time.monotonic()
+        with self._lock:
+            fenster = self._fenster.get(key)
+            if fenster is None or jetzt - fenster[0] >= self.rate_interval:
+                unterdrueckt = fenster[2] if fenster else 0
+                self._fenster[key] = [jetzt, 1, 0]
+                if len(self._fenster) > 10000:  # nicht unbegrenzt wachsen
+                    self._fenster = {key: self._fenster[key]}
+            elif fenster[1] < self.rate_limit:
+                fenster[1] += 1
+                unterdrueckt = fenster[2]
+                fenster[2] = 0
+            else:
+                fenster[2] += 1
+                return False
+        if unterdrueckt:
+            record.unterdrueckt = unterdrueckt
+        return True
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    # Wie QueueHandler, lässt aber Zusatzfelder stehen und legt den Traceback als Text ab
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_listener = None
+
+def setup_logging(path=None, level=logging.DEBUG, max_bytes=5 * 1024 * 1024, backup_count=3,
+                  rate_limit=10, rate_interval=60.0):
+    """
+    Richtet den Logger "kodierung" einmal je Prozess ein und liefert ihn.
+    Weitere Aufrufe geben nur den Logger zurück. rate_limit=0 schaltet die Drosselung ab.
+    """
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    if _listener is not None:
+        return logger
+    path = path or LOG_DATEI
+    verzeichnis = os.path.dirname(path)
+    if verzeichnis:
+        try:
+            os.makedirs(verzeichnis, exist_ok=True)
+        except OSError:
+            pass  # meldet dann der Handler beim ersten Schreiben, der Start soll nicht scheitern
+    datei_handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+    datei_handler.setFormatter(JsonFormatter())
+    for handler in list(logger.handlers):
+        if isinstance(handler, StructuredQueueHandler):  # von einem früheren setup_logging()
+            logger.removeHandler(handler)
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    if rate_limit:
+        queue_handler.addFilter(RateLimitFilter(rate_limit, rate_interval))
+    logger.setLevel(level)
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+    _listener = logging.handlers.QueueListener(log_queue, datei_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return logger
+
+def shutdown_logging():
+    # Restliche Einträge schreiben und den Hintergrund-Thread beenden
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,317 @@
+"""
+Zentrale Stelle für mapping.json.
+
+Das Mapping wird erst beim ersten Zugriff geladen und nur einmal pro Prozess
+geparst. Abgeleitete Strukturen (Decode-Index, Header-Index, ...) melden sich
+mit register() an und werden ebenfalls nur einmal gebaut. Ändert sich die
+Datei (mtime), wird beim nächsten Zugriff neu geladen.
+
+Geprüftes Mapping und alle gebauten Strukturen werden zusätzlich als
+vorkompilierter Cache (pickle) abgelegt. Er gilt nur, solange der Inhalt
+(SHA-256) von mapping.json, die Python-Version und die Builder-Module
+unverändert sind. Neue Prozesse laden dann nur noch diese Datei, statt JSON zu
+parsen und die Tabellen neu zu bauen.
+
+Weil pickle beim Laden Code ausführen kann, liegt der Cache nicht neben
+mapping.json (oft ein gemeinsames Netzlaufwerk), sondern im Cache-Verzeichnis
+des Benutzers (Windows: %LOCALAPPDATA%\\Kodierung-App\\Cache, Linux:
+~/.cache/kodierung-app, KODIERUNG_CACHE_DIR setzt ein anderes). Unter POSIX wird
+er nur geladen, wenn er dem Benutzer gehört und für andere nicht schreibbar ist.
+
+    python mapping_registry.py          # Mapping prüfen und Cache schreiben
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+mapping_path = os.path.join(script_dir, "mapping.json")
+
+# Wie oft (Sekunden) höchstens die mtime der Datei geprüft wird
+CHECK_INTERVAL = 2.0
+# Erhöhen, wenn sich das Format des Caches ändert
+CACHE_VERSION = 1
+USE_CACHE = os.environ.get("KODIERUNG_MAPPING_CACHE", "1") != "0"
+
+class MappingError(ValueError):
+    pass
+
+_lock = threading.RLock()
+_builders = {}
+_state = {
+    "path": mapping_path,
+    "daten": None,
+    "mtime": None,
+    "checked": 0.0,
+    "fest": False,  # True bei set_mapping(): keine Datei, kein Nachladen
+    "generation": 0,  # wird bei jedem (Neu-)Laden erhöht, z.B. für Caches
+    "kompiliert": {},
+    "hash": None,  # SHA-256 des geladenen Dateiinhalts
+    "cache_veraltet": False,  # Cache passt nicht, beim nächsten preload() neu schreiben
+}
+
+def register(name, builder):
+    # builder(alle_elemente) -> beliebige vorkompilierte Struktur
+    with _lock:
+        _builders[name] = builder
+        _state["kompiliert"].pop(name, None)
+
+def standard_cache_verzeichnis():
+    # Je Benutzer, wie das Log in logsetup: dort kann niemand sonst einen Cache unterschieben
+    if os.environ.get("KODIERUNG_CACHE_DIR"):
+        return os.environ["KODIERUNG_CACHE_DIR"]
+    if sys.platform == "win32":
+        basis = os.environ.get("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+        return os.path.join(basis, "Kodierung-App", "Cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/Kodierung-App")
+    basis = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(basis, "kodierung-app")
+
+def cache_path_for(path):
+    # Eigene Datei je Mapping-Pfad: <name>-<Kurzhash des absoluten Pfads>.cache
+    import hashlib
+    pfad = os.path.abspath(path)
+    kennung = hashlib.sha256(pfad.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(pfad))[0]
+    return os.path.join(standard_cache_verzeichnis(), f"{name}-{kennung}.cache")
+
+def _cache_vertrauenswuerdig(f):
+    # POSIX: nur eigene, für Gruppe/andere nicht schreibbare Dateien laden
+    if os.name != "posix":
+        return True
+    stat = os.fstat(f.fileno())
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+def _builder_signatur(builder):
+    # Ändert sich, wenn das Modul des Builders geändert wurde
+    modul = sys.modules.get(getattr(builder, "__module__", None))
+    datei = getattr(modul, "__file__", None)
+    try:
+        stat = os.stat(datei) if datei else None
+    except OSError:
+        stat = None
+    return (getattr(builder, "__module__", None), getattr(builder, "__qualname__", None),
+            stat.st_mtime_ns if stat else None, stat.st_size if stat else None)
+
+def _cache_kopf(inhalt_hash):
+    return {"version": CACHE_VERSION, "python": sys.version_info[:2], "hash": inhalt_hash}
+
+def _read_cache(path, inhalt_hash):
+    # Liefert (daten, kompiliert) oder None, wenn es keinen passenden Cache gibt
+    import pickle  # pickle/hashlib/tempfile erst beim Laden importieren, nicht beim Start der GUI
+    try:
+        with open(cache_path_for(path), "rb") as f:
+            if not _cache_vertrauenswuerdig(f):
+                return None
+            cache = pickle.load(f)
+    except Exception:
+        return None
+    if not isinstance(cache, dict) or cache.get("kopf") != _cache_kopf(inhalt_hash):
+        return None
+    # Nur Strukturen übernehmen, deren Builder unverändert ist; der Rest wird bei Bedarf gebaut
+    kompiliert = {
+        name: wert for name, (signatur, wert) in cache["kompiliert"].items()
+        if name in _builders and _builder_signatur(_builders[name]) == signatur
+    }
+    return cache["daten"], kompiliert
+
+def _write_cache():
+    import pickle
+    import tempfile
+    if _state["fest"] or not USE_CACHE:
+        return False
+    path = cache_path_for(_state["path"])
+    cache = {
+        "kopf": _cache_kopf(_state["hash"]),
+        "daten": _state["daten"],
+        "kompiliert": {name: (_builder_signatur(_builders[name]), wert)
+                       for name, wert in _state["kompiliert"].items() if name in _builders},
+    }
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        # Erst temporär schreiben, dann ersetzen: parallele Prozesse sehen nie eine halbe Datei.
+        # mkstemp legt die Datei mit 0600 an, so bleibt sie.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".cache.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        return False  # z.B. kein Schreibrecht: dann eben ohne Cache
+    _state["cache_veraltet"] = False
+    return True
+
+def _load():
+    import hashlib
+    path = _state["path"]
+    with open(path, "rb") as f:
+        mtime = os.fstat(f.fileno()).st_mtime_ns
+        inhalt = f.read()
+    inhalt_hash = hashlib.sha256(inhalt).hexdigest()
+    geladen = _read_cache(path, inhalt_hash) if USE_CACHE else None
+    if geladen:
+        daten, kompiliert = geladen
+    else:
+        daten = json.loads(inhalt.decode("utf-8"))
+        validate_mapping(daten)
+        kompiliert = {}
+    _state.update(daten=daten, mtime=mtime, checked=time.monotonic(), kompiliert=kompiliert,
+                  generation=_state["generation"] + 1, hash=inhalt_hash,
+                  cache_veraltet=USE_CACHE and (not geladen or len(kompiliert) < len(_builders)))
+
+_hex_token = re.compile(r"[0-9A-Fa-f]{1,2}[Hh]|0[xX][0-9A-Fa-f]{1,2}|[0-9A-Fa-f]{2}")
+
+def _check_bytes(wert, ort):
+    # Bytefolge als ["05H", ...] oder "05H 00H ..." (auch als einziges Listenelement)
+    tokens = wert.split() if isinstance(wert, str) else wert
+    if not isinstance(tokens, list) or not tokens:
+        raise MappingError(f"{ort}: Bytefolge erwartet, erhalten: {wert!r}")
+    for token in tokens:
+        for teil in (token.split() if isinstance(token, str) else [token]):
+            if not isinstance(teil, str) or not _hex_token.fullmatch(teil):
+                raise MappingError(f"{ort}: ungültiges Byte {teil!r}")
+
+def _check_dict(wert, ort):
+    if not isinstance(wert, dict):
+        raise MappingError(f"{ort}: Objekt erwartet, erhalten: {type(wert).__name__}")
+    return wert
+
+def validate_mapping(daten):
+    # Prüft den Aufbau von mapping.json und wirft MappingError mit Fundstelle
+    for element, eintrag in _check_dict(daten, "mapping").items():
+        _check_dict(eintrag, element)
+        if element == "SILS":
+            order = eintrag.get("byteorder")
+            if not isinstance(order, list):
+                raise MappingError("SILS: byteorder fehlt")
+            meldung = _check_dict(eintrag.get("Meldung"), "SILS/Meldung")
+            for name in ("Sender", "Empfänger", "DB"):
+                if name not in _check_dict(meldung.get("header"), "SILS/Meldung/header"):
+                    raise MappingError(f"SILS/Meldung/header: {name} fehlt")
+            for name, hval in meldung["header"].items():
+                _check_bytes(hval, f"SILS/Meldung/header/{name}")
+            felder = _check_dict(meldung.get("telegramme"), "SILS/Meldung/telegramme")
+            for feld in order:
+                if feld not in felder:
+                    raise MappingError(f"SILS/Meldung/telegramme: Feld {feld} aus byteorder fehlt")
+            for feld, werte in felder.items():
+                for label, seq in _check_dict(werte, f"SILS/{feld}").items():
+                    _check_bytes(seq, f"SILS/{feld}/{label}")
+            continue
+        for hkey, hval in _check_dict(eintrag.get("header", {}), f"{element}/header").items():
+            _check_bytes(hval, f"{element}/header/{hkey}")
+        for typ, typ_eintrag in eintrag.items():
+            if typ == "header":
+                continue
+            telegramme = _check_dict(_check_dict(typ_eintrag, f"{element}/{typ}").get("telegramme"),
+                                     f"{element}/{typ}/telegramme")
+            for tg, tg_map in telegramme.items():
+                for param, val_map in _check_dict(tg_map, f"{element}/{typ}/{tg}").items():
+                    ort = f"{element}/{typ}/{tg}/{param}"
+                    if not _check_dict(val_map, ort):
+                        raise MappingError(f"{ort}: keine Werte")
+                    for val, seq in val_map.items():
+                        if not str(val).isdigit():
+                            raise MappingError(f"{ort}: Wert {val!r} ist keine Dezimalzahl")
+                        _check_bytes(seq, f"{ort}/{val}")
+
+def reload_if_changed():
+    # Lädt neu, wenn sich die Datei seit dem letzten Laden geändert hat; True bei Neuladen
+    with _lock:
+        if _state["fest"]:
+            return False
+        _state["checked"] = time.monotonic()
+        try:
+            mtime = os.stat(_state["path"]).st_mtime_ns
+        except OSError:
+            return False
+        if _state["daten"] is not None and mtime == _state["mtime"]:
+            return False
+        _load()
+        return True
+
+def get_mapping():
+    daten = _state["daten"]
+    if daten is None or (not _state["fest"] and time.monotonic() - _state["checked"] > CHECK_INTERVAL):
+        with _lock:
+            if _state["daten"] is None:
+                _load()
+            else:
+                reload_if_changed()
+            daten = _state["daten"]
+    return daten
+
+def get_compiled(name):
+    get_mapping()
+    kompiliert = _state["kompiliert"]
+    wert = kompiliert.get(name)
+    if wert is None:
+        with _lock:
+            wert = _state["kompiliert"].get(name)
+            if wert is None:
+                wert = _builders[name](_state["daten"])
+                _state["kompiliert"][name] = wert
+    return wert
+
+def generation():
+    # Ändert sich, sobald ein anderes Mapping aktiv ist
+    get_mapping()
+    return _state["generation"]
+
+def is_loaded():
+    # Ohne Laden prüfen, ob das Mapping schon im Speicher ist (z.B. für Startzeit-Messungen)
+    return _state["daten"] is not None
+
+def preload():
+    # Lädt das Mapping und baut alle angemeldeten Strukturen (z.B. beim Start eines Workers)
+    for name in list(_builders):
+        get_compiled(name)
+    with _lock:
+        if _state["cache_veraltet"]:
+            _write_cache()
+
+def compile_cache():
+    # Mapping prüfen, alle Strukturen bauen und den Cache neu schreiben
+    with _lock:
+        _state.update(daten=None, kompiliert={})
+    preload()
+    with _lock:
+        return _write_cache()
+
+def set_path(path):
+    with _lock:
+        _state.update(path=path, daten=None, mtime=None, fest=False, kompiliert={},
+                      generation=_state["generation"] + 1, cache_veraltet=False)
+
+def set_mapping(daten):
+    # Feste Daten statt Datei verwenden (z.B. für Benchmarks mit skaliertem Mapping)
+    with _lock:
+        _state.update(daten=daten, mtime=None, fest=True, kompiliert={},
+                      generation=_state["generation"] + 1, cache_veraltet=False)
+
+def reset():
+    # Zurück auf mapping.json neben diesem Modul
+    set_path(mapping_path)
+
+if __name__ == "__main__":
+    # Über den Modulnamen importieren, sonst meldeten decode/encode ihre Builder
+    # bei einer zweiten Instanz dieses Moduls an
+    import mapping_registry as registry
+    import decode, encode  # melden ihre Builder an
+    if len(sys.argv) > 1:
+        registry.set_path(os.path.abspath(sys.argv[1]))
+    try:
+        geschrieben = registry.compile_cache()
+    except registry.MappingError as e:
+        print(f"Mapping fehlerhaft: {e}", file=sys.stderr)
+        sys.exit(1)
+    ziel = cache_path_for(registry._state["path"])
+    print(f"{ziel} geschrieben" if geschrieben else f"{ziel} konnte nicht geschrieben werden", file=sys.stderr)
+    sys.exit(0 if geschrieben else 2)
@@ -0,0 +1,211 @@
+"""
+Decoder als lokaler Dienst neben dem Simulator (asyncio, ein Thread für alle Verbindungen).
+
+Telegramme kommen per TCP (Strom, beliebig geschnitten) oder UDP (ein oder mehrere
+Telegramme je Datagramm) an, binär oder als Textzeilen "05H 00H ...". Jedes
+dekodierte Telegramm geht als JSON-Zeile an alle Clients, die sich auf dem
+Abo-Port verbunden haben.
+
+    python service.py --tcp-port 4000 --udp-port 4000 --subscribe-port 4001
+    nc localhost 4001          # Ergebnisse mitlesen
+
+Gegendruck: Jeder Abonnent hat eine Warteschlange fester Größe. Ist sie voll,
+wartet die Annahme (TCP-Flusskontrolle bremst dann den Sender), mit --drop wird
+stattdessen das älteste Ergebnis dieses Abonnenten verworfen. UDP lässt sich
+nicht bremsen, dort wird immer verworfen.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from codec_cache import cached_decode_main, FrozenDict
+from decode import strip_prefix
+from stream import FrameSync
+
+def to_jsonl(record):
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+async def read_zeile(reader):
+    """
+    Nächste Textzeile inkl. Zeilenende, b"" am Stromende. Zeilen über dem Limit des
+    StreamReaders (64 KiB) werden bis zum Zeilenende verworfen, dann kommt None.
+    """
+    zu_lang = False
+    while True:
+        try:
+            zeile = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            zeile = e.partial  # letzte Zeile ohne Zeilenende bzw. b"" am Ende
+        except asyncio.LimitOverrunError as e:
+            # Gelesenes verwerfen und weiter bis zum Zeilenende suchen
+            await reader.readexactly(e.consumed)
+            zu_lang = True
+            continue
+        if zu_lang:
+            return None
+        return zeile
+
+class Subscriber:
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def put_drop_oldest(self, zeile):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(zeile)
+
+class DecodeService:
+    def __init__(self, queue_size=1000, drop=False, text=False):
+        self.queue_size = queue_size
+        self.drop = drop
+        self.text = text
+        self.subscribers = set()
+        self.telegramme = 0
+
+    # --- Ergebnisse verteilen ---
+    def record_json(self, quelle, offset, frame, erkannt=True):
+        kopf = {"Quelle": quelle, "Offset": offset}
+        try:
+            ergebnis = cached_decode_main(frame) if erkannt else {
+                "Element": None, "Fehler": f"Nicht zugeordnet: {len(frame)} Bytes"}
+        except Exception as e:
+            ergebnis = {"Element": None, "Fehler": f"{type(e).__name__}: {e}"}
+        self.telegramme += 1
+        if isinstance(ergebnis, FrozenDict) and ergebnis:
+            # JSON des gecachten Ergebnisses wiederverwenden, nur Quelle/Offset voranstellen
+            return f"{json.dumps(kopf, ensure_ascii=False)[:-1]}, {ergebnis.to_json()[1:]}\n".encode("utf-8")
+        return to_jsonl({**kopf, **ergebnis}).encode("utf-8")
+
+    async def publish(self, zeile):
+        for sub in list(self.subscribers):
+            if self.drop:
+                sub.put_drop_oldest(zeile)
+            else:
+                await sub.queue.put(zeile)
+
+    # --- Annahme ---
+    async def handle_tcp(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        quelle = f"tcp:{peer[0]}:{peer[1]}" if peer else "tcp"
+        try:
+            if self.text:
+                nummer = 0
+                while (line := await read_zeile(reader)) != b"":
+                    nummer += 1
+                    if line is None:
+                        # Überlange Zeile (z.B. Müll ohne Zeilenumbruch) melden, Verbindung bleibt
+                        await self.publish(to_jsonl({"Quelle": quelle, "Offset": nummer, "Element": None,
+                                                     "Fehler": "Zeile zu lang, verworfen"}).encode("utf-8"))
+                        continue
+                    line = strip_prefix(line.decode("utf-8", "replace").strip())
+                    if line:
+                        await self.publish(self.record_json(quelle, nummer, line))
+            else:
+                sync = FrameSync()
+                while chunk := await reader.read(65536):
+                    for offset, frame, erkannt in sync.feed(chunk):
+                        await self.publish(self.record_json(quelle, offset, frame, erkannt))
+                for offset, frame, erkannt in sync.flush():
+                    await self.publish(self.record_json(quelle, offset, frame, erkannt))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def handle_datagram(self, data, addr):
+        quelle = f"udp:{addr[0]}:{addr[1]}"
+        if self.text:
+            zeilen = [strip_prefix(z.strip()) for z in data.decode("utf-8", "replace").splitlines()]
+            ergebnisse = [self.record_json(quelle, i, z) for i, z in enumerate(zeilen) if z]
+        else:
+            sync = FrameSync()
+            frames = sync.feed(data) + sync.flush()
+            ergebnisse = [self.record_json(quelle, o, f, e) for o, f, e in frames]
+        for zeile in ergebnisse:
+            # Synchron aufgerufen, daher nie warten: volle Warteschlangen verwerfen
+            for sub in list(self.subscribers):
+                sub.put_drop_oldest(zeile)
+
+    # --- Abonnenten ---
+    async def handle_subscriber(self, reader, writer):
+        sub = Subscriber(writer, self.queue_size)
+        self.subscribers.add(sub)
+        abbruch = asyncio.ensure_future(reader.read())  # Client hat geschlossen
+        naechste = None
+        try:
+            while True:
+                naechste = asyncio.ensure_future(sub.queue.get())
+                await asyncio.wait({naechste, abbruch}, return_when=asyncio.FIRST_COMPLETED)
+                if not naechste.done():
+                    break
+                # Alles, was schon wartet, in einem Rutsch schreiben
+                zeilen = [naechste.result()]
+                while not sub.queue.empty() and len(zeilen) < 1000:
+                    zeilen.append(sub.queue.get_nowait())
+                writer.writelines(zeilen)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.subscribers.discard(sub)
+            abbruch.cancel()
+            if naechste:
+                naechste.cancel()
+            writer.close()
+
+    async def start(self, host="127.0.0.1", tcp_port=None, udp_port=None, subscribe_port=4001):
+        # Startet alle Server und liefert sie (bzw. die UDP-Transports) zum späteren Schließen
+        loop = asyncio.get_running_loop()
+        server = []
+        server.append(await asyncio.start_server(self.handle_subscriber, host, subscribe_port))
+        if tcp_port is not None:
+            server.append(await asyncio.start_server(self.handle_tcp, host, tcp_port))
+        if udp_port is not None:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _DatagramProtocol(self), local_addr=(host, udp_port))
+            server.append(transport)
+        return server
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, service):
+        self.service = service
+
+    def datagram_received(self, data, addr):
+        self.service.handle_datagram(data, addr)
+
+async def serve(args):
+    service = DecodeService(queue_size=args.queue_size, drop=args.drop, text=args.text)
+    server = await service.start(args.host, args.tcp_port, args.udp_port, args.subscribe_port)
+    print(f"Decode-Dienst läuft auf {args.host}: TCP {args.tcp_port}, UDP {args.udp_port}, "
+          f"Abo {args.subscribe_port}", file=sys.stderr)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for s in server:
+            s.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Decode-Dienst für Simulator-Telegramme")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--tcp-port", type=int, help="Port für Telegramme per TCP")
+    parser.add_argument("--udp-port", type=int, help="Port für Telegramme per UDP")
+    parser.add_argument("--subscribe-port", type=int, default=4001, help="Port für Abonnenten (Standard: 4001)")
+    parser.add_argument("--text", action="store_true", help="Textzeilen (05H 00H ...) statt Binärdaten annehmen")
+    parser.add_argument("--queue-size", type=int, default=1000, help="Warteschlange je Abonnent (Standard: 1000)")
+    parser.add_argument("--drop", action="store_true",
+                        help="Bei vollen Warteschlangen älteste Ergebnisse verwerfen statt den Sender zu bremsen")
+    args = parser.parse_args(argv)
+    if args.tcp_port is None and args.udp_port is None:
+        parser.error("mindestens --tcp-port oder --udp-port angeben")
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
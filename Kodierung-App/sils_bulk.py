@@ -0,0 +1,72 @@
+"""
+Vektorisierte Dekodierung vieler SILS-Telegramme auf einmal (benötigt numpy).
+
+Die SILS-Nutzdaten liegen immer an Index 45..53, deshalb lassen sich ganze
+Mitschnitte als N×54-Array (oder breiter, z.B. 63 Bytes mit DB-Teil) verarbeiten.
+Pro Feld wird über eine 256er-Tabelle nachgeschlagen statt Telegramm für Telegramm.
+
+    records = load_records("signal_log.bin", record_len=63)
+    spalten = decode_sils_bulk(records)
+    spalten["Labels"]["Hauptbegriff"]   # array(["Ks1", "HP0", ...], dtype=object)
+"""
+try:
+    import numpy as np
+except ImportError:  # numpy ist optional, nur für diese Massenverarbeitung nötig
+    np = None
+
+import decode  # meldet die SILS-Tabellen in der Registry an
+from mapping_registry import get_mapping, get_compiled
+
+SILS_NUTZDATEN_START = 45
+SILS_MIN_LAENGE = 54
+
+_np_luts = {}
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Für die SILS-Massendekodierung wird numpy benötigt (pip install numpy)")
+
+def _numpy_luts():
+    # Die 256er-Tabellen aus decode als numpy-Arrays, einmal je kompiliertem Mapping
+    luts = get_compiled("sils_luts")
+    cached = _np_luts.get("luts")
+    if cached is None or cached[0] is not luts:
+        labels = {name: np.array([eintrag[0] for eintrag in lut], dtype=object) for name, lut in luts.items()}
+        bekannt = {name: np.array([eintrag[1] for eintrag in lut], dtype=bool) for name, lut in luts.items()}
+        cached = (luts, labels, bekannt)
+        _np_luts["luts"] = cached
+    return cached[1], cached[2]
+
+def load_records(path, record_len=SILS_MIN_LAENGE, offset=0):
+    # Datei mit Telegrammen fester Länge als schreibgeschütztes N×record_len-Memmap
+    _require_numpy()
+    if record_len < SILS_MIN_LAENGE:
+        raise ValueError(f"Datensatzlänge {record_len} zu kurz, mindestens {SILS_MIN_LAENGE} Bytes erforderlich")
+    daten = np.memmap(path, dtype=np.uint8, mode="r", offset=offset)
+    anzahl = len(daten) // record_len
+    return daten[:anzahl * record_len].reshape(anzahl, record_len)
+
+def decode_sils_bulk(records):
+    """
+    Dekodiert alle Zeilen eines N×M-uint8-Arrays (M >= 54) auf einmal.
+    Liefert spaltenweise Codes (N×9), Labels und Bekannt-Masken je Feld.
+    """
+    _require_numpy()
+    records = np.asarray(records, dtype=np.uint8)
+    if records.ndim != 2 or records.shape[1] < SILS_MIN_LAENGE:
+        raise ValueError(f"Erwartet N×{SILS_MIN_LAENGE} (oder breiter) uint8-Array, erhalten: {records.shape}")
+    order = get_mapping()["SILS"]["byteorder"]
+    labels_lut, bekannt_lut = _numpy_luts()
+    codes = records[:, SILS_NUTZDATEN_START:SILS_NUTZDATEN_START + len(order)]
+    labels = {}
+    bekannt = np.empty(codes.shape, dtype=bool)
+    for i, name in enumerate(order):
+        spalte = codes[:, i]
+        labels[name] = labels_lut[name][spalte]
+        bekannt[:, i] = bekannt_lut[name][spalte]
+    return {
+        "Felder": list(order),
+        "Codes": codes,
+        "Labels": labels,
+        "Bekannt": bekannt,
+    }
@@ -0,0 +1,91 @@
+"""
+Dekodierung fortlaufender Byteströme (Socket, serielle Schnittstelle, Datei-Ausschnitte).
+
+Die Daten kommen in beliebig geschnittenen Stücken an. FrameSync sucht die
+Telegrammgrenzen über die Header aus dem Mapping bzw. die SILS-Kennung (30H an
+Index 2) und liefert jedes Telegramm, sobald sein Ende feststeht: nach der
+Höchstlänge oder, bei Telegrammen ohne alle Parameter, am Anfang des nächsten
+Telegramms (wie decode.split_frames). Bytes, die zu
+keinem Telegramm passen, werden übersprungen und als nicht erkannt gemeldet,
+danach synchronisiert sich der Leser auf den nächsten Header. Gepuffert wird
+höchstens ein Telegramm plus ein Stück, der Speicherbedarf bleibt konstant.
+
+    for offset, ergebnis in decode_stream(iter_chunks_from(sock.recv)):
+        ...
+"""
+from decode import decode_main, frame_status, split_frames
+
+class FrameSync:
+    def __init__(self, max_rest=4096):
+        self.puffer = b""
+        self.offset = 0  # Stream-Offset von puffer[0]
+        self.scan = 0  # ab hier im Puffer weitersuchen
+        self.im_rest = False  # puffer beginnt mit nicht erkannten Bytes
+        self.max_rest = max_rest
+
+    def feed(self, chunk):
+        """
+        Nimmt das nächste Stück entgegen und liefert die damit vollständigen
+        Telegramme als Liste von (offset, frame, erkannt).
+        """
+        daten = self.puffer + bytes(chunk)
+        fertig = []
+        pos = self.scan
+        rest_start = 0 if self.im_rest else None
+        while pos < len(daten):
+            laenge = frame_status(daten, pos)
+            if laenge is None:
+                # Kein Telegrammanfang: Byte überspringen, Müll am Stück melden
+                if rest_start is None:
+                    rest_start = pos
+                pos += 1
+                if pos - rest_start >= self.max_rest:
+                    fertig.append((self.offset + rest_start, daten[rest_start:pos], False))
+                    rest_start = None
+                continue
+            if laenge == 0 or pos + laenge > len(daten):
+                break  # Telegramm noch unvollständig
+            if rest_start is not None:
+                fertig.append((self.offset + rest_start, daten[rest_start:pos], False))
+                rest_start = None
+            fertig.append((self.offset + pos, daten[pos:pos+laenge], True))
+            pos += laenge
+        behalten = rest_start if rest_start is not None else pos
+        self.puffer = daten[behalten:]
+        self.offset += behalten
+        self.scan = pos - behalten
+        self.im_rest = rest_start is not None
+        return fertig
+
+    def flush(self):
+        # Am Stromende kommen keine Bytes mehr: den Rest wie split_frames zerlegen
+        # (ein letztes Telegramm ohne alle Parameter ist damit vollständig)
+        fertig = [(self.offset + pos, stueck, erkannt) for pos, stueck, erkannt in split_frames(self.puffer)]
+        self.offset += len(self.puffer)
+        self.puffer = b""
+        self.scan = 0
+        self.im_rest = False
+        return fertig
+
+def iter_frames(chunks, max_rest=4096):
+    # Liefert (offset, frame, erkannt) für einen Iterator von Byte-Stücken
+    sync = FrameSync(max_rest=max_rest)
+    for chunk in chunks:
+        yield from sync.feed(chunk)
+    yield from sync.flush()
+
+def decode_stream(chunks, max_rest=4096):
+    # Liefert (offset, ergebnis) je Telegramm, sobald es vollständig angekommen ist
+    for offset, frame, erkannt in iter_frames(chunks, max_rest=max_rest):
+        if erkannt:
+            yield offset, decode_main(frame)
+        else:
+            yield offset, {"Element": None, "Fehler": f"Nicht zugeordnet: {len(frame)} Bytes"}
+
+def iter_chunks_from(read, size=65536):
+    # read(size) -> bytes, z.B. sock.recv, f.read, serial.read; Ende bei leerem Ergebnis
+    while True:
+        chunk = read(size)
+        if not chunk:
+            return
+        yield chunk
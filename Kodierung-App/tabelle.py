@@ -0,0 +1,287 @@
+"""
+Massen-Encode aus Parametertabellen (CSV oder Excel), eine Zeile je Telegramm.
+
+    python tabelle.py parameter.csv -o bitleisten.jsonl -j 8
+    python tabelle.py parameter.xlsx --blatt Meldungen --hex-format 0xNN -o bitleisten.jsonl
+    python tabelle.py parameter.csv --format text -o bitleisten.txt
+
+Erkannte Spalten (Groß-/Kleinschreibung, Leerzeichen und Umlaute egal):
+    element, typ, header_key, pea_modus, telegramm, X0..X9 bzw. W0..W9,
+    die SILS-Felder aus der byteorder (Hauptbegriff, ZS3, ...), name_4char,
+    is_stoerung, stoerung_art, sender_byte, only_param, sils_full
+
+Beispiel (CSV mit ; wie aus Excel gespeichert):
+    element;typ;header_key;pea_modus;telegramm;X0;X1;name_4char;Hauptbegriff;ZS3
+    BLLE;Meldung;05;;X05;0AH;0BH;;;
+    PEA;Meldung;07;R;X05;0AH;00H;;;
+    SILS;;;;;;;N91;Ks1;60
+
+Leere Zellen werden ausgelassen. Parameterwerte ohne Eintrag im Mapping und
+unbekannte SILS-Begriffe sind ein Fehler der Zeile (statt stillschweigend
+weggelassen bzw. als FFH kodiert zu werden). Ohne typ gilt "Kommando" für
+W-Telegramme, sonst "Meldung". SILS mit name_4char ergibt das Gesamttelegramm (encode_sils_full),
+ohne nur die Nutzdaten. Jede Zeile wird zu einem Datensatz wie bei "cli.py encode"
+und in Chunks parallel kodiert; Fehler werden je Zeile (Zeilennummer der Tabelle,
+Kopfzeile = 1) gemeldet, die übrigen Zeilen laufen weiter.
+CSV wird gestreamt, xlsx über openpyxl im read-only-Modus (optional).
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from functools import partial
+
+try:
+    import openpyxl
+except ImportError:  # openpyxl ist optional, nur für .xlsx nötig
+    openpyxl = None
+
+from batch import iter_chunks, parallel_map_ordered
+from cli import encode_record, init_worker
+from decode import parse_input_hex
+from encode import sils_eingabe_bekannt
+from mapping_registry import get_mapping
+
+# Normierter Spaltenname -> Feld im Datensatz
+SPALTEN = {
+    "element": "element",
+    "typ": "typ",
+    "header_key": "header_key",
+    "header": "header_key",
+    "headerkey": "header_key",
+    "pea_modus": "pea_modus",
+    "pea_mode": "pea_modus",
+    "pea": "pea_modus",
+    "telegramm": "telegramm",
+    "telegram": "telegramm",
+    "name_4char": "name_4char",
+    "name": "name_4char",
+    "is_stoerung": "is_stoerung",
+    "stoerung": "is_stoerung",
+    "stoerung_art": "stoerung_art",
+    "stoerungsart": "stoerung_art",
+    "sender_byte": "sender_byte",
+    "sender": "sender_byte",
+    "only_param": "only_param",
+    "nur_parameter": "only_param",
+    "sils_full": "sils_full",
+}
+WAHR = {"1", "x", "ja", "j", "true", "wahr", "yes", "y"}
+
+_param_spalte = re.compile(r"[XW]\d+")
+
+def normiere(spalte):
+    name = str(spalte or "").strip().lower()
+    for alt, neu in (("ä", "ae"), ("ö", "oe"), ("ü", "ue"), ("ß", "ss")):
+        name = name.replace(alt, neu)
+    return re.sub(r"[\s\-]+", "_", name)
+
+def spalten_zuordnen(kopf, sils_felder):
+    """
+    Kopfzeile -> [(feld, art)] je Spalte: art ist "option", "param" (X0/W0...),
+    "sils" oder None für unbekannte Spalten. Liefert zusätzlich die unbekannten Namen.
+    """
+    sils = {normiere(feld): feld for feld in sils_felder}
+    zuordnung, unbekannt = [], []
+    for spalte in kopf:
+        name = normiere(spalte)
+        roh = str(spalte or "").strip()
+        if name in SPALTEN:
+            zuordnung.append((SPALTEN[name], "option"))
+        elif _param_spalte.fullmatch(roh.upper()):
+            zuordnung.append((roh.upper(), "param"))
+        elif name in sils:
+            zuordnung.append((sils[name], "sils"))
+        else:
+            zuordnung.append((None, None))
+            if roh:
+                unbekannt.append(roh)
+    return zuordnung, unbekannt
+
+def zellen_text(wert):
+    # Excel liefert Zahlen als int/float; 10 in einer Zelle soll wie "10" im CSV wirken,
+    # einstellige Werte werden bei den Parametern auf zwei Stellen aufgefüllt
+    if wert is None:
+        return ""
+    if isinstance(wert, bool):
+        return "1" if wert else ""
+    if isinstance(wert, float) and wert.is_integer():
+        wert = int(wert)
+    return str(wert).strip()
+
+def _byte_text(wert):
+    # "5" -> "05" für Parameter, Header-Schlüssel, Sender und Störungsart
+    return wert.zfill(2) if len(wert) == 1 else wert
+
+def zeile_zu_record(zuordnung, werte):
+    # Eine Tabellenzeile als Datensatz für cli.encode_record
+    optionen, params, sils = {}, {}, {}
+    for (feld, art), wert in zip(zuordnung, werte):
+        wert = zellen_text(wert)
+        if not wert or art is None:
+            continue
+        if art == "option":
+            optionen[feld] = wert
+        elif art == "param":
+            wert = _byte_text(wert)  # Zahlenzelle 5 -> "05", sonst kein gültiges Hex-Format
+            try:
+                params[feld] = (wert, parse_input_hex(wert))
+            except ValueError:
+                raise ValueError(f"Spalte {feld}: ungültiger Hex-Wert {wert!r}")
+        else:
+            sils[feld] = wert
+    element = optionen.get("element")
+    if not element:
+        raise ValueError("Spalte element fehlt oder ist leer")
+    record = {"element": element}
+    if element == "SILS":
+        if params:
+            raise ValueError(f"SILS hat keine Parameter {', '.join(params)}")
+        sils_full = optionen.get("sils_full")
+        record["sils_full"] = sils_full.lower() in WAHR if sils_full else bool(optionen.get("name_4char"))
+        record["typ"] = optionen.get("typ", "Meldung")
+        for feld, wert in sils.items():
+            # Unbekannte Begriffe ließe encode stillschweigend als FFH durch
+            if not sils_eingabe_bekannt(feld, wert):
+                raise ValueError(f"Wert {wert!r} gibt es für SILS/{feld} nicht")
+        record["params"] = sils
+        if record["sils_full"]:
+            record["name_4char"] = optionen.get("name_4char", "")
+            record["is_stoerung"] = optionen.get("is_stoerung", "").lower() in WAHR
+            if "stoerung_art" in optionen:
+                record["stoerung_art"] = _byte_text(optionen["stoerung_art"])
+            if "sender_byte" in optionen:
+                record["sender_byte"] = _byte_text(optionen["sender_byte"])
+        return record
+    if sils:
+        raise ValueError(f"SILS-Felder {', '.join(sils)} bei Element {element}")
+    telegramm = optionen.get("telegramm", "").upper()
+    if not telegramm:
+        raise ValueError("Spalte telegramm fehlt oder ist leer")
+    typ = optionen.get("typ") or ("Kommando" if telegramm.startswith("W") else "Meldung")
+    tgrams = get_mapping().get(element, {}).get(typ, {}).get("telegramme", {})
+    if telegramm not in tgrams:
+        raise ValueError(f"Telegramm {telegramm} gibt es in {element}/{typ} nicht")
+    for param, (wert, zahl) in params.items():
+        if param not in tgrams[telegramm]:
+            raise ValueError(f"Parameter {param} gibt es in {element}/{typ}/{telegramm} nicht")
+        # Werte ohne Mapping-Eintrag ließe encode stillschweigend weg
+        if str(zahl) not in tgrams[telegramm][param]:
+            raise ValueError(f"Wert {wert} gibt es für {element}/{typ}/{telegramm}/{param} nicht")
+    record.update(typ=typ, params={telegramm: {param: wert for param, (wert, _) in params.items()}},
+                  header_key=_byte_text(optionen.get("header_key", "05")),
+                  pea_modus=optionen.get("pea_modus", "G").upper(),
+                  only_param=optionen.get("only_param", "").lower() in WAHR)
+    return record
+
+def _require_openpyxl():
+    if openpyxl is None:
+        raise ImportError("Für .xlsx-Tabellen wird openpyxl benötigt (pip install openpyxl), "
+                          "alternativ die Tabelle als CSV speichern")
+
+def iter_csv(path, encoding="utf-8-sig", delimiter=None):
+    # Zeilen als Listen; Trennzeichen (, ; Tab) aus dem Dateianfang erkennen
+    with open(path, newline="", encoding=encoding) as f:
+        if delimiter is None:
+            probe = f.read(8192)
+            f.seek(0)
+            try:
+                delimiter = csv.Sniffer().sniff(probe, delimiters=",;\t").delimiter
+            except csv.Error:
+                delimiter = ","
+        yield from csv.reader(f, delimiter=delimiter)
+
+def iter_xlsx(path, blatt=None):
+    mappe = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = mappe[blatt] if blatt else mappe.active
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        mappe.close()
+
+def iter_tabelle(path, blatt=None, encoding="utf-8-sig", delimiter=None):
+    if os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm"):
+        _require_openpyxl()  # hier schon prüfen, nicht erst beim ersten Lesen
+        return iter_xlsx(path, blatt)
+    return iter_csv(path, encoding=encoding, delimiter=delimiter)
+
+def iter_zeilen(zeilen):
+    # (Zeilennummer, Werte) ohne Kopfzeile und ohne leere Zeilen
+    for nummer, werte in enumerate(zeilen, 2):
+        if any(zellen_text(w) for w in werte):
+            yield nummer, list(werte)
+
+def encode_chunk(chunk, zuordnung, hex_format="NNH", ausgabe="jsonl"):
+    # Läuft im Worker: [(nummer, werte)] -> (Text, Anzahl, Fehler)
+    zeilen = []
+    fehler = 0
+    for nummer, werte in chunk:
+        try:
+            bitleiste = " ".join(encode_record(zeile_zu_record(zuordnung, werte), hex_format=hex_format))
+            ergebnis = {"Zeile": nummer, "Bitleiste": bitleiste}
+        except Exception as e:
+            ergebnis = {"Zeile": nummer, "Fehler": f"{type(e).__name__}: {e}"}
+            fehler += 1
+        if ausgabe == "text":
+            # Eine Bitleiste je Zeile; Fehler als Kommentar mit Zeilennummer
+            zeilen.append(f"{ergebnis['Bitleiste']}\n" if "Bitleiste" in ergebnis
+                          else f"# Zeile {nummer}: {ergebnis['Fehler']}\n")
+        else:
+            zeilen.append(json.dumps(ergebnis, ensure_ascii=False) + "\n")
+    return "".join(zeilen), len(chunk), fehler
+
+def encode_tabelle(zeilen, out, jobs=None, chunk_size=2000, hex_format="NNH", ausgabe="jsonl", warnung=None):
+    # Kodiert alle Tabellenzeilen nach out und liefert (Anzahl, Fehler)
+    zeilen = iter(zeilen)
+    kopf = next(zeilen, None)
+    if kopf is None:
+        return 0, 0
+    zuordnung, unbekannt = spalten_zuordnen(kopf, get_mapping()["SILS"]["byteorder"])
+    if unbekannt and warnung:
+        warnung(f"Unbekannte Spalten werden ignoriert: {', '.join(unbekannt)}")
+    func = partial(encode_chunk, zuordnung=zuordnung, hex_format=hex_format, ausgabe=ausgabe)
+    chunks = iter_chunks(iter_zeilen(zeilen), chunk_size)
+    if jobs == 1:
+        ergebnisse = map(func, chunks)
+    else:
+        ergebnisse = parallel_map_ordered(func, chunks, jobs=jobs, initializer=init_worker)
+    anzahl = fehler = 0
+    for text, n, f in ergebnisse:
+        out.write(text)
+        anzahl += n
+        fehler += f
+    return anzahl, fehler
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bitleisten aus einer CSV-/Excel-Parametertabelle kodieren")
+    parser.add_argument("tabelle", help="CSV- oder .xlsx-Datei, erste Zeile mit Spaltennamen")
+    parser.add_argument("-o", "--output", help="Zieldatei (Standard: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "text"], default="jsonl",
+                        help="jsonl: {Zeile, Bitleiste|Fehler}; text: eine Bitleiste je Zeile")
+    parser.add_argument("--hex-format", choices=["NNH", "0xNN"], default="NNH")
+    parser.add_argument("--blatt", help="Tabellenblatt bei .xlsx (Standard: aktives Blatt)")
+    parser.add_argument("--encoding", default="utf-8-sig", help="Zeichensatz der CSV-Datei")
+    parser.add_argument("--delimiter", help="Trennzeichen der CSV-Datei (Standard: erkennen)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker-Prozesse (0 = alle Kerne)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Zeilen je Arbeitspaket")
+    args = parser.parse_args(argv)
+
+    try:
+        zeilen = iter_tabelle(args.tabelle, blatt=args.blatt, encoding=args.encoding, delimiter=args.delimiter)
+    except ImportError as e:
+        parser.error(str(e))
+    warnung = partial(print, file=sys.stderr)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        anzahl, fehler = encode_tabelle(zeilen, out, jobs=args.jobs or None, chunk_size=args.chunk_size,
+                                        hex_format=args.hex_format, ausgabe=args.format, warnung=warnung)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{anzahl} Zeilen kodiert, {fehler} Fehler", file=sys.stderr)
+    return 1 if fehler else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+Startzeit-Vorgaben der GUI als Test (wie "python bench.py --startup").
+
+    python -m pytest test_startup.py
+
+Gemessen wird in frischen Prozessen. Ohne Display entfällt die Prüfung des
+ersten Zeichnens, Importzeit und verzögertes Laden werden immer geprüft.
+"""
+import pytest
+
+from bench import IMPORT_BUDGET_MS, PAINT_BUDGET_MS, check_startup, measure_startup
+
+@pytest.fixture(scope="module")
+def startup():
+    return measure_startup(runs=3)
+
+def test_mapping_nicht_beim_import(startup):
+    assert startup["mapping_beim_import"] is False
+
+def test_keine_schweren_module_beim_import(startup):
+    assert startup["module_beim_import"] == []
+
+def test_import_budget(startup):
+    assert startup["import_ms"] <= IMPORT_BUDGET_MS, f"Import {startup['import_ms']:.1f} ms"
+
+def test_erstes_zeichnen(startup):
+    if "paint_ms" not in startup:
+        pytest.skip("Kein Display: Zeit bis zum ersten Zeichnen nicht messbar")
+    assert startup["mapping_beim_paint"] is False
+    assert startup["paint_ms"] <= PAINT_BUDGET_MS, f"Erstes Zeichnen {startup['paint_ms']:.1f} ms"
+
+def test_check_startup_ohne_fehler(startup):
+    assert check_startup(startup) == []
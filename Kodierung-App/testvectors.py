@@ -0,0 +1,208 @@
+"""
+Testvektoren für die Stellwerks-Abnahme: alle (oder zufällig ausgewählte) gültigen
+Parameterkombinationen je Element/Typ/Telegramm aus mapping.json, kodiert und als
+JSONL gespeichert.
+
+    python testvectors.py -o vektoren/ --count              # nur Anzahl je Gruppe
+    python testvectors.py -o vektoren/ -j 8                 # vollständig
+    python testvectors.py -o vektoren/ --sample 10000 -k PEA
+
+Je Gruppe (z.B. BLLE_Meldung_X05) werden die Parameter dieses Telegramms über
+ihren ganzen Wertebereich kombiniert. Die übrigen Telegramme des Elements
+(BLLE/ALE/PEA) stehen dabei fest auf ihrem ersten Wert, es werden also nicht
+die Telegramme untereinander kombiniert. Bei Meldungen kommen Header-Schlüssel
+und PEA-Modus als weitere Achsen dazu. SILS ist eine Gruppe (SILS_Meldung), die
+alle Felder der byteorder miteinander kombiniert, inklusive der Sonderbereiche
+ZS2 A–Z, ZS3 10–150 km/h und Fahrweginformation 1–253. Das sind sehr viele
+Kombinationen; mit --sample wird daraus eine handhabbare Stichprobe, --chunk-size
+bestimmt die Größe der Arbeitspakete.
+
+Die Kombinationen werden nie als Ganzes erzeugt: Arbeitspakete sind nur
+(Gruppe, Indexbereich), die Worker rechnen den Index in Parameterwerte um.
+Jede Ausgabezeile hat das Format von "cli.py encode" plus das Feld "bitleiste",
+sodass die Vektoren direkt wieder eingespielt werden können.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from functools import partial
+
+import mapping_registry
+from mapping_registry import get_mapping
+from batch import iter_chunks, parallel_map_ordered
+from encode import encode_main, encode_sils_full
+
+SILS_NAME = "N91"
+
+# Felder mit eigenem Encoder: Eingaben statt Mapping-Einträgen
+SILS_SONDERWERTE = {
+    "ZS2": ["Aus"] + [f"Kennbuchstabe {chr(c)}" for c in range(ord("A"), ord("Z") + 1)],
+    "ZS2V": ["Aus"] + [f"Kennbuchstabe {chr(c)}" for c in range(ord("A"), ord("Z") + 1)],
+    "ZS3": ["Aus"] + [str(kmh) for kmh in range(10, 151, 10)],
+    "ZS3V": ["Aus"] + [str(kmh) for kmh in range(10, 151, 10)],
+    "Fahrweginformation": ["Aus", "Keine Information"] + [f"Fahrweginformation {n}" for n in range(1, 254)],
+}
+
+def build_gruppen(elemente, header_keys=None, pea_modi=("G", "R")):
+    """
+    {name: {"element", "typ", "basis", "achsen": [(achse, [werte])]}}. Eine Achse ist
+    ("param", telegramm, parameter), ("header_key",), ("pea_modus",) oder ("sils", feld).
+    """
+    gruppen = {}
+    for element, eintrag in elemente.items():
+        if element == "SILS":
+            # Ein SILS-Telegramm enthält alle Felder: eine Gruppe mit einer Achse je Feld
+            telegramme = eintrag["Meldung"]["telegramme"]
+            achsen = []
+            for feld in eintrag["byteorder"]:
+                werte = SILS_SONDERWERTE.get(feld) or [label for label in telegramme.get(feld, {}) if label]
+                achsen.append((("sils", feld), werte))
+            gruppen["SILS_Meldung"] = {"element": "SILS", "typ": "Meldung", "basis": {}, "achsen": achsen}
+            continue
+        for typ, typ_eintrag in eintrag.items():
+            if typ == "header":
+                continue
+            tg_maps = typ_eintrag["telegramme"]
+            basis = {tg: {p: f"{int(next(iter(vals))):02X}H" for p, vals in tg_map.items()}
+                     for tg, tg_map in tg_maps.items()}
+            extra = []
+            if typ == "Meldung":
+                extra.append((("header_key",), [k for k in eintrag["header"] if not header_keys or k in header_keys]))
+                if element == "PEA":
+                    extra.append((("pea_modus",), list(pea_modi)))
+            for tg, tg_map in tg_maps.items():
+                achsen = [(("param", tg, p), [f"{int(v):02X}H" for v in vals]) for p, vals in tg_map.items()]
+                gruppen[f"{element}_{typ}_{tg}"] = {"element": element, "typ": typ, "basis": basis,
+                                                    "achsen": achsen + extra}
+    return gruppen
+
+def anzahl(gruppe):
+    return math.prod(len(werte) for _, werte in gruppe["achsen"])
+
+def kombination(gruppe, index):
+    # Index -> ein Wert je Achse (gemischtes Stellenwertsystem, letzte Achse läuft am schnellsten)
+    werte = []
+    for _, achse_werte in reversed(gruppe["achsen"]):
+        index, rest = divmod(index, len(achse_werte))
+        werte.append(achse_werte[rest])
+    return list(zip((a for a, _ in gruppe["achsen"]), reversed(werte)))
+
+def build_record(gruppe, index):
+    record = {"element": gruppe["element"], "typ": gruppe["typ"]}
+    if gruppe["element"] == "SILS":
+        record.update(sils_full=True, name_4char=SILS_NAME, params={})
+    else:
+        record.update(header_key="05", pea_modus="G",
+                      params={tg: dict(params) for tg, params in gruppe["basis"].items()})
+    for achse, wert in kombination(gruppe, index):
+        if achse[0] == "param":
+            record["params"][achse[1]][achse[2]] = wert
+        elif achse[0] == "sils":
+            record["params"][achse[1]] = wert
+        else:
+            record[achse[0]] = wert
+    return record
+
+def encode_vector(record, hex_format="NNH"):
+    if record.get("sils_full"):
+        return encode_sils_full(record["params"], record["name_4char"], hex_format=hex_format)
+    return encode_main(record["element"], record["typ"], record["pea_modus"], record["params"],
+                       header_key=record.get("header_key", "05"), hex_format=hex_format)
+
+_worker_gruppen = {}
+
+def init_worker(header_keys, pea_modi):
+    mapping_registry.preload()
+    _worker_gruppen.clear()
+    _worker_gruppen.update(build_gruppen(get_mapping(), header_keys, pea_modi))
+
+def encode_aufgabe(aufgabe, hex_format="NNH"):
+    # Läuft im Worker: (gruppe, indizes) -> (gruppe, JSONL-Text, fehler)
+    name, indizes = aufgabe
+    gruppe = _worker_gruppen[name]
+    zeilen = []
+    fehler = 0
+    for index in indizes:
+        record = build_record(gruppe, index)
+        try:
+            record["bitleiste"] = " ".join(encode_vector(record, hex_format))
+        except Exception as e:
+            record["fehler"] = f"{type(e).__name__}: {e}"
+            fehler += 1
+        zeilen.append(json.dumps(record, ensure_ascii=False) + "\n")
+    return name, "".join(zeilen), fehler
+
+def iter_aufgaben(gruppen, sample=None, seed=0, chunk_size=5000):
+    # (gruppe, range/Liste von Indizes) je Arbeitspaket, Gruppe für Gruppe
+    for name, gruppe in gruppen.items():
+        gesamt = anzahl(gruppe)
+        if sample and sample < gesamt:
+            indizes = sorted(random.Random(f"{seed}-{name}").sample(range(gesamt), sample))
+            for chunk in iter_chunks(indizes, chunk_size):
+                yield name, chunk
+        else:
+            for start in range(0, gesamt, chunk_size):
+                yield name, range(start, min(start + chunk_size, gesamt))
+
+def write_vectors(out_dir, gruppen, sample=None, seed=0, jobs=None, chunk_size=5000, hex_format="NNH",
+                  header_keys=None, pea_modi=("G", "R")):
+    # Schreibt je Gruppe <out_dir>/<gruppe>.jsonl und liefert {gruppe: (anzahl, fehler)}
+    os.makedirs(out_dir, exist_ok=True)
+    statistik = {}
+    aktuell = None
+    datei = None
+    func = partial(encode_aufgabe, hex_format=hex_format)
+    try:
+        for name, text, fehler in parallel_map_ordered(func, iter_aufgaben(gruppen, sample, seed, chunk_size),
+                                                       jobs=jobs, initializer=init_worker,
+                                                       initargs=(header_keys, pea_modi)):
+            if name != aktuell:
+                if datei:
+                    datei.close()
+                datei = open(os.path.join(out_dir, f"{name}.jsonl"), "w", encoding="utf-8")
+                aktuell = name
+            datei.write(text)
+            n, f = statistik.get(name, (0, 0))
+            statistik[name] = (n + text.count("\n"), f + fehler)
+    finally:
+        if datei:
+            datei.close()
+    return statistik
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Testvektoren aus mapping.json erzeugen")
+    parser.add_argument("-o", "--output", required=True, help="Zielverzeichnis (eine JSONL-Datei je Gruppe)")
+    parser.add_argument("--sample", type=int, help="Höchstens so viele zufällige Kombinationen je Gruppe")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-k", "--filter", help="Nur Gruppen, deren Name diesen Text enthält")
+    parser.add_argument("--header-keys", help="Nur diese Header-Schlüssel, z.B. 05 (Standard: alle)")
+    parser.add_argument("--pea-modi", default="G,R", help="PEA-Modi (Standard: G,R)")
+    parser.add_argument("--hex-format", choices=["NNH", "0xNN"], default="NNH")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker-Prozesse (0 = alle Kerne)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Kombinationen je Arbeitspaket")
+    parser.add_argument("--count", action="store_true", help="Nur die Anzahl je Gruppe ausgeben")
+    args = parser.parse_args(argv)
+
+    header_keys = args.header_keys.split(",") if args.header_keys else None
+    pea_modi = tuple(m.strip() for m in args.pea_modi.split(",") if m.strip())
+    gruppen = build_gruppen(get_mapping(), header_keys, pea_modi)
+    if args.filter:
+        gruppen = {name: g for name, g in gruppen.items() if args.filter in name}
+
+    if args.count:
+        for name, gruppe in gruppen.items():
+            gesamt = anzahl(gruppe)
+            print(f"{name:35} {min(gesamt, args.sample) if args.sample else gesamt:>14}")
+        return 0
+    statistik = write_vectors(args.output, gruppen, sample=args.sample, seed=args.seed, jobs=args.jobs or None,
+                              chunk_size=args.chunk_size, hex_format=args.hex_format,
+                              header_keys=header_keys, pea_modi=pea_modi)
+    for name, (n, fehler) in statistik.items():
+        print(f"{name:35} {n:>14} Vektoren, {fehler} Fehler", file=sys.stderr)
+    return 1 if any(f for _, f in statistik.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())